@@ -0,0 +1,124 @@
+"""Сравнение накладных расходов на запрос у PG (SQLAlchemy) и NativePG (asyncpg).
+
+Запуск против базы из конфига сервиса:
+
+    python -m infrastructure.pg.benchmark --iterations 5000 --concurrency 8
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from opentelemetry import metrics, trace
+
+from infrastructure.pg.native import NativePG
+from infrastructure.pg.pg import PG
+from internal import interface
+from internal.config.config import Config
+from internal.repo.vacancy.sql_query import get_vacancy_by_id_query
+
+# Запрос без обращения к таблицам: время почти целиком уходит на драйвер и протокол
+TRIVIAL_QUERY = "SELECT CAST(:value AS INTEGER) AS value;"
+
+
+class BenchmarkLogger:
+    """Логи бенчмарка, например о медленных запросах, печатаются в консоль"""
+
+    def debug(self, message: str, fields: dict = None) -> None:
+        pass
+
+    def info(self, message: str, fields: dict = None) -> None:
+        print(message, fields or {})
+
+    def warning(self, message: str, fields: dict = None) -> None:
+        print(message, fields or {})
+
+    def error(self, message: str, fields: dict = None) -> None:
+        print(message, fields or {})
+
+
+class BenchmarkTelemetry:
+    """Телеметрия без экспортера: спаны создаются, но никуда не отправляются"""
+
+    def tracer(self):
+        return trace.get_tracer("pg-benchmark")
+
+    def meter(self):
+        return metrics.get_meter("pg-benchmark")
+
+    def logger(self):
+        return BenchmarkLogger()
+
+
+async def run_case(
+        db: interface.IDB,
+        query: str,
+        query_params: dict,
+        iterations: int,
+        concurrency: int
+) -> list[float]:
+    # Прогрев: пул соединений и prepared statements на каждом соединении
+    await asyncio.gather(*[db.select(query, query_params) for _ in range(concurrency * 2)])
+
+    latencies: list[float] = []
+
+    async def worker(count: int):
+        for _ in range(count):
+            started_at = time.perf_counter()
+            await db.select(query, query_params)
+            latencies.append(time.perf_counter() - started_at)
+
+    per_worker = iterations // concurrency
+    await asyncio.gather(*[worker(per_worker) for _ in range(concurrency)])
+    return latencies
+
+
+def report(name: str, latencies: list[float], elapsed: float) -> None:
+    latencies = sorted(latencies)
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{name:<28} "
+        f"{len(latencies) / elapsed:>10.0f} q/s "
+        f"{statistics.mean(latencies) * 1e6:>10.0f} us mean "
+        f"{p50 * 1e6:>10.0f} us p50 "
+        f"{p99 * 1e6:>10.0f} us p99"
+    )
+
+
+async def main(iterations: int, concurrency: int) -> None:
+    cfg = Config()
+    tel = BenchmarkTelemetry()
+
+    backends = {
+        "sqlalchemy": PG(tel, cfg.db_user, cfg.db_pass, cfg.db_host, cfg.db_port, cfg.db_name),
+        "asyncpg": NativePG(
+            tel,
+            cfg.db_user,
+            cfg.db_pass,
+            cfg.db_host,
+            cfg.db_port,
+            cfg.db_name,
+            statement_cache_size=cfg.db_statement_cache_size
+        ),
+    }
+    cases = {
+        "trivial": (TRIVIAL_QUERY, {"value": 1}),
+        "vacancy_by_id": (get_vacancy_by_id_query, {"vacancy_id": 1}),
+    }
+
+    print(f"iterations={iterations} concurrency={concurrency}")
+    for case_name, (query, query_params) in cases.items():
+        for backend_name, db in backends.items():
+            started_at = time.perf_counter()
+            latencies = await run_case(db, query, query_params, iterations, concurrency)
+            report(f"{case_name}/{backend_name}", latencies, time.perf_counter() - started_at)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.iterations, args.concurrency))
@@ -0,0 +1,64 @@
+import re
+
+# Те же правила, что у sqlalchemy.text(): ::type и \: параметрами не считаются
+BIND_PARAM_PATTERN = re.compile(r"(?<![:\w\\]):(\w+)(?!:)")
+# Строка VALUES (...) однострочного INSERT, вложенные скобки вроде CAST(... AS TEXT[]) допускаются
+VALUES_ROW_PATTERN = re.compile(r"\bVALUES\s*(\((?:[^()]|\([^()]*\))*\))", re.IGNORECASE)
+
+# Протокол Postgres ограничивает число параметров одного запроса 32767
+MAX_BIND_PARAMS = 32767
+MAX_ROWS_PER_STATEMENT = 1000
+
+
+class MultiRowInsert:
+    """Разворачивает однострочный INSERT ... VALUES (:a, :b) RETURNING ... в многострочный.
+
+    Запросы из repo/*/sql_query.py остаются однострочными, а insert_many подставляет
+    VALUES (:a_0, :b_0), (:a_1, :b_1), ... пачками, которые укладываются в лимит параметров.
+    """
+
+    def __init__(self):
+        # Текст запроса -> (до строки VALUES, строка VALUES, после нее, имена параметров строки)
+        self._templates: dict[str, tuple[str, str, str, tuple[str, ...]]] = {}
+        # (текст запроса, число строк) -> развернутый запрос
+        self._statements: dict[tuple[str, int], str] = {}
+
+    def statements(self, query: str, rows: list[dict]) -> list[tuple[str, dict]]:
+        _, _, _, names = self._template(query)
+        chunk_size = max(1, min(MAX_ROWS_PER_STATEMENT, MAX_BIND_PARAMS // max(1, len(names))))
+
+        statements = []
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            params = {
+                f"{name}_{i}": row[name]
+                for i, row in enumerate(chunk)
+                for name in names
+            }
+            statements.append((self._statement(query, len(chunk)), params))
+        return statements
+
+    def _statement(self, query: str, rows_count: int) -> str:
+        statement = self._statements.get((query, rows_count))
+        if statement is None:
+            head, values_row, tail, _ = self._template(query)
+            values = ",\n".join(
+                BIND_PARAM_PATTERN.sub(lambda match: f":{match.group(1)}_{i}", values_row)
+                for i in range(rows_count)
+            )
+            statement = f"{head}{values}{tail}"
+            self._statements[(query, rows_count)] = statement
+        return statement
+
+    def _template(self, query: str) -> tuple[str, str, str, tuple[str, ...]]:
+        template = self._templates.get(query)
+        if template is None:
+            match = VALUES_ROW_PATTERN.search(query)
+            if match is None:
+                raise Exception("insert_many expects a single-row INSERT ... VALUES (...) query")
+
+            values_row = match.group(1)
+            names = tuple(dict.fromkeys(BIND_PARAM_PATTERN.findall(values_row)))
+            template = (query[:match.start(1)], values_row, query[match.end(1):], names)
+            self._templates[query] = template
+        return template
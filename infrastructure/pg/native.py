@@ -0,0 +1,420 @@
+import asyncio
+import contextvars
+import re
+import time
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Sequence
+
+import asyncpg
+from opentelemetry.trace import Status, StatusCode, SpanKind
+
+from infrastructure.pg.bulk import BIND_PARAM_PATTERN, MultiRowInsert
+from infrastructure.pg.pool_metrics import PRIMARY_POOL, REPLICA_POOL, PoolMetrics, PoolStats
+from infrastructure.pg.query_stats import QueryStats
+from infrastructure.pg.replica import ReplicaRouter, replica_lag_query
+from infrastructure.pg.transaction import Transaction
+from internal import interface
+
+
+class NativePG(interface.IDB):
+    """IDB поверх голого asyncpg пула без SQLAlchemy сессий.
+
+    Запросы из repo/*/sql_query.py переводятся из :name в $n один раз и дальше идут через
+    кэш prepared statements asyncpg: на каждом соединении запрос парсится и планируется
+    только при первом выполнении.
+    """
+
+    def __init__(
+            self,
+            tel: interface.ITelemetry,
+            db_user,
+            db_pass,
+            db_host,
+            db_port,
+            db_name,
+            pool_size: int = 15,
+            max_overflow: int = 15,
+            statement_cache_size: int = 1024,
+            replica_host: str = "",
+            replica_port=None,
+            max_replica_lag: float = 5.0,
+            pool_recycle: int = 300,
+            pool_timeout: float = 30,
+            slow_query_threshold: float = 0.5,
+            slow_query_log_interval: float = 60,
+            explain_slow_queries: bool = True
+    ):
+        self.tracer = tel.tracer()
+        self.dsn = f"postgresql://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}"
+        self.replica_dsn = f"postgresql://{db_user}:{db_pass}@{replica_host}:{replica_port or db_port}/{db_name}" \
+            if replica_host else None
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_recycle = pool_recycle
+        self.pool_timeout = pool_timeout
+        self.statement_cache_size = statement_cache_size
+
+        self.pool: asyncpg.Pool | None = None
+        self.replica_pool: asyncpg.Pool | None = None
+        self._pool_lock = asyncio.Lock()
+        self.router = ReplicaRouter(max_replica_lag)
+        self.multi_row_insert = MultiRowInsert()
+        self.query_stats = QueryStats(tel, slow_query_threshold, slow_query_log_interval, explain_slow_queries)
+
+        self.pool_metrics = PoolMetrics(tel.meter())
+        self.pool_metrics.watch(PRIMARY_POOL, lambda: self._pool_stats(self.pool))
+        self.pool_metrics.watch(REPLICA_POOL, lambda: self._pool_stats(self.replica_pool))
+        # PID серверного процесса -> когда открыли соединение. У asyncpg нет своего времени создания
+        self._connected_at: dict[int, float] = {}
+        self._transaction: contextvars.ContextVar[Transaction | None] = contextvars.ContextVar(
+            "native_pg_transaction", default=None
+        )
+
+        # Текст запроса -> (запрос с $n, имена параметров по порядку)
+        self._compiled_queries: dict[str, tuple[str, tuple[str, ...]]] = {}
+        # Набор колонок -> тип строки, чтобы не создавать namedtuple на каждый запрос
+        self._row_types: dict[tuple[str, ...], type] = {}
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        # Вложенный transaction() присоединяется к внешнему: коммитит тот, кто открыл
+        current = self._transaction.get()
+        if current is not None and not current.closed:
+            yield
+            return
+
+        pool = await self._get_pool()
+        async with self._acquire(pool, PRIMARY_POOL) as conn:
+            transaction = Transaction(conn)
+            token = self._transaction.set(transaction)
+            try:
+                async with conn.transaction():
+                    yield
+                self.router.mark_write()
+            finally:
+                transaction.closed = True
+                self._transaction.reset(token)
+
+    async def insert(self, query: str, query_params: dict) -> int:
+        with self.tracer.start_as_current_span(
+                "NativePG.insert",
+                kind=SpanKind.CLIENT,
+        ) as span:
+            try:
+                sql, args = self._compile(query, query_params)
+                with self.query_stats.measure(span, "insert", query, lambda: self._explain(sql, args)):
+                    async with self._connection() as conn:
+                        result = await conn.fetchval(sql, *args)
+
+                span.set_status(Status(StatusCode.OK))
+                return result
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def delete(self, query: str, query_params: dict) -> None:
+        with self.tracer.start_as_current_span(
+                "NativePG.delete",
+                kind=SpanKind.CLIENT,
+        ) as span:
+            try:
+                sql, args = self._compile(query, query_params)
+                with self.query_stats.measure(span, "delete", query, lambda: self._explain(sql, args)):
+                    async with self._connection() as conn:
+                        await conn.execute(sql, *args)
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def update(self, query: str, query_params: dict) -> None:
+        with self.tracer.start_as_current_span(
+                "NativePG.update",
+                kind=SpanKind.CLIENT,
+        ) as span:
+            try:
+                sql, args = self._compile(query, query_params)
+                with self.query_stats.measure(span, "update", query, lambda: self._explain(sql, args)):
+                    async with self._connection() as conn:
+                        await conn.execute(sql, *args)
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def select(self, query: str, query_params: dict) -> Sequence[Any]:
+        with self.tracer.start_as_current_span(
+                "NativePG.select",
+                kind=SpanKind.CLIENT,
+        ) as span:
+            try:
+                sql, args = self._compile(query, query_params)
+                with self.query_stats.measure(span, "select", query, lambda: self._explain(sql, args)):
+                    if self.router.is_read_only(query):
+                        records = await self._read(sql, args, span)
+                    else:
+                        async with self._connection() as conn:
+                            records = await conn.fetch(sql, *args)
+
+                span.set_status(Status(StatusCode.OK))
+                return self._rows(records)
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def insert_many(self, query: str, query_params: list[dict]) -> list[int]:
+        with self.tracer.start_as_current_span(
+                "NativePG.insert_many",
+                kind=SpanKind.CLIENT,
+                attributes={"rows_count": len(query_params)}
+        ) as span:
+            try:
+                if not query_params:
+                    span.set_status(Status(StatusCode.OK))
+                    return []
+
+                # Все пачки в одной транзакции: либо вставились все строки, либо ни одной.
+                # Postgres возвращает RETURNING многострочного VALUES в порядке строк
+                ids = []
+                with self.query_stats.measure(span, "insert_many", query):
+                    async with self._connection() as conn:
+                        async with conn.transaction():
+                            for statement, params in self.multi_row_insert.statements(query, query_params):
+                                sql, args = self._compile(statement, params)
+                                records = await conn.fetch(sql, *args)
+                                ids.extend(record[0] for record in records)
+
+                span.set_status(Status(StatusCode.OK))
+                return ids
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def copy_records(self, table: str, columns: list[str], records: list[tuple]) -> int:
+        with self.tracer.start_as_current_span(
+                "NativePG.copy_records",
+                kind=SpanKind.CLIENT,
+                attributes={
+                    "table": table,
+                    "rows_count": len(records)
+                }
+        ) as span:
+            try:
+                if not records:
+                    span.set_status(Status(StatusCode.OK))
+                    return 0
+
+                with self.query_stats.measure(span, "copy_records", table):
+                    async with self._connection() as conn:
+                        await conn.copy_records_to_table(table, records=records, columns=columns)
+
+                span.set_status(Status(StatusCode.OK))
+                return len(records)
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def multi_query(
+            self,
+            queries: list[str]
+    ) -> None:
+        async with self._connection() as conn:
+            async with conn.transaction():
+                for query in queries:
+                    await conn.execute(query)
+        return None
+
+    async def autocommit_query(self, query: str) -> None:
+        with self.tracer.start_as_current_span(
+                "NativePG.autocommit_query",
+                kind=SpanKind.CLIENT,
+        ) as span:
+            try:
+                # Вне conn.transaction() asyncpg не открывает транзакцию, запрос идет как есть
+                with self.query_stats.measure(span, "autocommit_query", query):
+                    pool = await self._get_pool()
+                    async with self._acquire(pool, PRIMARY_POOL) as conn:
+                        await conn.execute(query)
+
+                self.router.mark_write()
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    def start_write_scope(self) -> None:
+        self.router.start_write_scope()
+
+    @asynccontextmanager
+    async def advisory_lock(self, key: int) -> AsyncIterator[None]:
+        # Сессионная блокировка на отдельном соединении: держится, пока идет блок, и не зависит
+        # от транзакций внутри него. Если соединение оборвется, Postgres снимет блокировку сам
+        pool = await self._get_pool()
+        async with self._acquire(pool, PRIMARY_POOL) as conn:
+            await conn.execute("SELECT pg_advisory_lock($1)", key)
+            try:
+                yield
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock($1)", key)
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[asyncpg.Connection]:
+        # Внутри transaction() asyncpg сам превращает вложенные conn.transaction() в SAVEPOINT
+        transaction = self._transaction.get()
+        if transaction is not None and not transaction.closed:
+            async with transaction.lock:
+                yield transaction.connection
+            return
+
+        pool = await self._get_pool()
+        async with self._acquire(pool, PRIMARY_POOL) as conn:
+            yield conn
+        self.router.mark_write()
+
+    async def _read(self, sql: str, args: list, span) -> list[asyncpg.Record]:
+        # Внутри transaction() читаем в том же соединении, чтобы видеть свои незакоммиченные изменения
+        transaction = self._transaction.get()
+        if transaction is not None and not transaction.closed:
+            span.set_attribute("db.replica", False)
+            async with transaction.lock:
+                return await transaction.connection.fetch(sql, *args)
+
+        # Сразу после своей записи читаем с первичного сервера: реплика могла ее еще не получить
+        if self.replica_dsn is not None and not self.router.wrote_recently() and await self._replica_available():
+            try:
+                replica_pool = await self._get_replica_pool()
+                async with self._acquire(replica_pool, REPLICA_POOL) as conn:
+                    records = await conn.fetch(sql, *args)
+                span.set_attribute("db.replica", True)
+                return records
+            except Exception as err:
+                # Реплика недоступна - до следующей проверки отставания читаем с первичного сервера
+                span.add_event("replica_failed", {"error": str(err)})
+                self.router.record_lag(None)
+
+        # Одиночный запрос вне транзакции и так ничего не держит: BEGIN READ ONLY добавил бы два round-trip
+        span.set_attribute("db.replica", False)
+        pool = await self._get_pool()
+        async with self._acquire(pool, PRIMARY_POOL) as conn:
+            return await conn.fetch(sql, *args)
+
+    async def _explain(self, sql: str, args: list) -> list[str]:
+        # EXPLAIN без ANALYZE запрос не выполняет, а read-only транзакция это гарантирует и для INSERT/UPDATE
+        pool = await self._get_pool()
+        async with self._acquire(pool, PRIMARY_POOL) as conn:
+            async with conn.transaction(readonly=True):
+                records = await conn.fetch(f"EXPLAIN {sql}", *args)
+        return [record[0] for record in records]
+
+    async def _replica_available(self) -> bool:
+        if self.router.lag_check_due():
+            try:
+                replica_pool = await self._get_replica_pool()
+                async with self._acquire(replica_pool, REPLICA_POOL) as conn:
+                    self.router.record_lag(float(await conn.fetchval(replica_lag_query)))
+            except Exception:
+                self.router.record_lag(None)
+
+        return self.router.replica_usable()
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        # Пул создаем лениво: asyncpg нужен работающий event loop, а NativePG создается при импорте main.py
+        if self.pool is not None:
+            return self.pool
+
+        async with self._pool_lock:
+            if self.pool is None:
+                self.pool = await self._create_pool(self.dsn)
+        return self.pool
+
+    async def _get_replica_pool(self) -> asyncpg.Pool:
+        if self.replica_pool is not None:
+            return self.replica_pool
+
+        async with self._pool_lock:
+            if self.replica_pool is None:
+                self.replica_pool = await self._create_pool(self.replica_dsn)
+        return self.replica_pool
+
+    async def _create_pool(self, dsn: str) -> asyncpg.Pool:
+        return await asyncpg.create_pool(
+            dsn=dsn,
+            min_size=1,
+            max_size=self.pool_size + self.max_overflow,
+            max_inactive_connection_lifetime=self.pool_recycle,
+            statement_cache_size=self.statement_cache_size,
+            init=self._on_connect
+        )
+
+    async def _on_connect(self, conn: asyncpg.Connection) -> None:
+        # PID переиспользуются, поэтому старые записи просто перезаписываются, а словарь не растет бесконечно
+        if len(self._connected_at) > 4 * (self.pool_size + self.max_overflow):
+            oldest = sorted(self._connected_at, key=self._connected_at.get)[:len(self._connected_at) // 2]
+            for pid in oldest:
+                del self._connected_at[pid]
+        self._connected_at[conn.get_server_pid()] = time.monotonic()
+
+    @asynccontextmanager
+    async def _acquire(self, pool: asyncpg.Pool, pool_name: str) -> AsyncIterator[asyncpg.Connection]:
+        started_at = time.perf_counter()
+        async with pool.acquire(timeout=self.pool_timeout) as conn:
+            self.pool_metrics.record_checkout(pool_name, time.perf_counter() - started_at)
+            connected_at = self._connected_at.get(conn.get_server_pid())
+            if connected_at is not None:
+                self.pool_metrics.record_connection_age(pool_name, time.monotonic() - connected_at)
+            yield conn
+
+    def _pool_stats(self, pool: asyncpg.Pool | None) -> PoolStats | None:
+        if pool is None:
+            return None
+
+        checked_out = pool.get_size() - pool.get_idle_size()
+        return PoolStats(
+            checked_out=checked_out,
+            overflow=max(0, checked_out - self.pool_size),
+            idle=pool.get_idle_size(),
+        )
+
+    def _compile(self, query: str, query_params: dict) -> tuple[str, list]:
+        compiled = self._compiled_queries.get(query)
+        if compiled is None:
+            names: list[str] = []
+
+            def to_positional(match: re.Match) -> str:
+                name = match.group(1)
+                if name not in names:
+                    names.append(name)
+                return f"${names.index(name) + 1}"
+
+            compiled = (BIND_PARAM_PATTERN.sub(to_positional, query), tuple(names))
+            self._compiled_queries[query] = compiled
+
+        sql, names = compiled
+        return sql, [query_params[name] for name in names]
+
+    def _rows(self, records: list[asyncpg.Record]) -> list[tuple]:
+        if not records:
+            return []
+
+        # Репозитории обращаются к строкам и как row.id, и как row[0], как к строкам SQLAlchemy
+        columns = tuple(records[0].keys())
+        row_type = self._row_types.get(columns)
+        if row_type is None:
+            row_type = namedtuple("Row", columns, rename=True)
+            self._row_types[columns] = row_type
+
+        return [row_type._make(record.values()) for record in records]
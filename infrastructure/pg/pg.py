@@ -1,9 +1,17 @@
-from typing import Any, Sequence
+import contextvars
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Sequence
 
 from opentelemetry.trace import Status, StatusCode, SpanKind
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
+from infrastructure.pg.bulk import MultiRowInsert
+from infrastructure.pg.pool_metrics import PRIMARY_POOL, REPLICA_POOL, PoolMetrics, PoolStats
+from infrastructure.pg.query_stats import QueryStats
+from infrastructure.pg.replica import ReplicaRouter, replica_lag_query
+from infrastructure.pg.transaction import Transaction
 from internal import interface
 
 
@@ -12,15 +20,22 @@ def NewPool(
         db_pass,
         db_host
         , db_port,
-        db_name
+        db_name,
+        pool_size: int = 15,
+        max_overflow: int = 15,
+        pool_recycle: int = 300,
+        pool_timeout: float = 30,
+        pool_pre_ping: bool = False
 ):
     async_engine = create_async_engine(
         f"postgresql+asyncpg://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}",
         echo=False,
         future=True,
-        pool_size=15,
-        max_overflow=15,
-        pool_recycle=300
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout,
+        pool_pre_ping=pool_pre_ping
     )
 
     pool = async_sessionmaker(
@@ -34,22 +49,85 @@ def NewPool(
 
 class PG(interface.IDB):
 
-    def __init__(self, tel: interface.ITelemetry, db_user, db_pass, db_host, db_port, db_name):
-        self.pool = NewPool(db_user, db_pass, db_host, db_port, db_name)
+    def __init__(
+            self,
+            tel: interface.ITelemetry,
+            db_user,
+            db_pass,
+            db_host,
+            db_port,
+            db_name,
+            replica_host: str = "",
+            replica_port=None,
+            max_replica_lag: float = 5.0,
+            pool_size: int = 15,
+            max_overflow: int = 15,
+            pool_recycle: int = 300,
+            pool_timeout: float = 30,
+            pool_pre_ping: bool = False,
+            slow_query_threshold: float = 0.5,
+            slow_query_log_interval: float = 60,
+            explain_slow_queries: bool = True
+    ):
+        pool_options = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_recycle": pool_recycle,
+            "pool_timeout": pool_timeout,
+            "pool_pre_ping": pool_pre_ping,
+        }
+        self.pool = NewPool(db_user, db_pass, db_host, db_port, db_name, **pool_options)
+        # Без реплики все чтения идут на первичный сервер, но по-прежнему в read-only транзакции
+        self.replica_pool = NewPool(
+            db_user, db_pass, replica_host, replica_port or db_port, db_name, **pool_options
+        ) if replica_host else None
+
+        self.pool_metrics = PoolMetrics(tel.meter())
+        self._instrument_pool(self.pool.kw["bind"], PRIMARY_POOL)
+        if self.replica_pool is not None:
+            self._instrument_pool(self.replica_pool.kw["bind"], REPLICA_POOL)
+        self.router = ReplicaRouter(max_replica_lag)
+        self.multi_row_insert = MultiRowInsert()
+        self.query_stats = QueryStats(tel, slow_query_threshold, slow_query_log_interval, explain_slow_queries)
+        self._transaction: contextvars.ContextVar[Transaction | None] = contextvars.ContextVar(
+            "pg_transaction", default=None
+        )
         self.tracer = tel.tracer()
 
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        # Вложенный transaction() присоединяется к внешнему: коммитит тот, кто открыл
+        current = self._transaction.get()
+        if current is not None and not current.closed:
+            yield
+            return
+
+        async with self.pool() as session:
+            await self._checkout(session, PRIMARY_POOL)
+            transaction = Transaction(session)
+            token = self._transaction.set(transaction)
+            try:
+                yield
+                await session.commit()
+                self.router.mark_write()
+            finally:
+                # При исключении сессия откатывается на выходе из async with
+                transaction.closed = True
+                self._transaction.reset(token)
+
     async def insert(self, query: str, query_params: dict) -> int:
         with self.tracer.start_as_current_span(
                 "PG.insert",
                 kind=SpanKind.CLIENT,
         ) as span:
             try:
-                async with self.pool() as session:
-                    result = await session.execute(text(query), query_params)
-                    rows = result.all()
-                    await session.commit()
-                    span.set_status(Status(StatusCode.OK))
-                    return rows[0][0]
+                with self.query_stats.measure(span, "insert", query, lambda: self._explain(query, query_params)):
+                    async with self._session() as session:
+                        result = await session.execute(text(query), query_params)
+                        rows = result.all()
+
+                span.set_status(Status(StatusCode.OK))
+                return rows[0][0]
 
             except Exception as err:
                 span.record_exception(err)
@@ -62,10 +140,11 @@ class PG(interface.IDB):
                 kind=SpanKind.CLIENT,
         ) as span:
             try:
-                async with self.pool() as session:
-                    await session.execute(text(query), query_params)
-                    await session.commit()
-                    span.set_status(Status(StatusCode.OK))
+                with self.query_stats.measure(span, "delete", query, lambda: self._explain(query, query_params)):
+                    async with self._session() as session:
+                        await session.execute(text(query), query_params)
+
+                span.set_status(Status(StatusCode.OK))
             except Exception as err:
                 span.record_exception(err)
                 span.set_status(Status(StatusCode.ERROR, str(err)))
@@ -77,10 +156,11 @@ class PG(interface.IDB):
                 kind=SpanKind.CLIENT,
         ) as span:
             try:
-                async with self.pool() as session:
-                    await session.execute(text(query), query_params)
-                    await session.commit()
-                    span.set_status(Status(StatusCode.OK))
+                with self.query_stats.measure(span, "update", query, lambda: self._explain(query, query_params)):
+                    async with self._session() as session:
+                        await session.execute(text(query), query_params)
+
+                span.set_status(Status(StatusCode.OK))
             except Exception as err:
                 span.record_exception(err)
                 span.set_status(Status(StatusCode.ERROR, str(err)))
@@ -92,12 +172,79 @@ class PG(interface.IDB):
                 kind=SpanKind.CLIENT,
         ) as span:
             try:
-                async with self.pool() as session:
-                    result = await session.execute(text(query), query_params)
-                    await session.commit()
-                    rows = result.all()
+                with self.query_stats.measure(span, "select", query, lambda: self._explain(query, query_params)):
+                    if self.router.is_read_only(query):
+                        rows = await self._read(query, query_params, span)
+                    else:
+                        # INSERT/UPDATE ... RETURNING и SELECT ... FOR UPDATE остаются на первичном сервере с коммитом
+                        async with self._session() as session:
+                            result = await session.execute(text(query), query_params)
+                            rows = result.all()
+
+                span.set_status(Status(StatusCode.OK))
+                return rows
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def insert_many(self, query: str, query_params: list[dict]) -> list[int]:
+        with self.tracer.start_as_current_span(
+                "PG.insert_many",
+                kind=SpanKind.CLIENT,
+                attributes={"rows_count": len(query_params)}
+        ) as span:
+            try:
+                if not query_params:
                     span.set_status(Status(StatusCode.OK))
-                    return rows
+                    return []
+
+                # Все пачки в одной транзакции: либо вставились все строки, либо ни одной.
+                # Postgres возвращает RETURNING многострочного VALUES в порядке строк
+                ids = []
+                with self.query_stats.measure(span, "insert_many", query):
+                    async with self._session() as session:
+                        for statement, params in self.multi_row_insert.statements(query, query_params):
+                            result = await session.execute(text(statement), params)
+                            if result.returns_rows:
+                                ids.extend(row[0] for row in result.all())
+
+                span.set_status(Status(StatusCode.OK))
+                return ids
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def copy_records(self, table: str, columns: list[str], records: list[tuple]) -> int:
+        with self.tracer.start_as_current_span(
+                "PG.copy_records",
+                kind=SpanKind.CLIENT,
+                attributes={
+                    "table": table,
+                    "rows_count": len(records)
+                }
+        ) as span:
+            try:
+                if not records:
+                    span.set_status(Status(StatusCode.OK))
+                    return 0
+
+                with self.query_stats.measure(span, "copy_records", table):
+                    async with self._session() as session:
+                        # Binary COPY есть только у самого asyncpg, берем его соединение из-под сессии
+                        conn = await session.connection()
+                        raw_conn = await conn.get_raw_connection()
+                        await raw_conn.driver_connection.copy_records_to_table(
+                            table,
+                            records=records,
+                            columns=columns
+                        )
+
+                span.set_status(Status(StatusCode.OK))
+                return len(records)
+
             except Exception as err:
                 span.record_exception(err)
                 span.set_status(Status(StatusCode.ERROR, str(err)))
@@ -107,8 +254,141 @@ class PG(interface.IDB):
             self,
             queries: list[str]
     ) -> None:
-        async with self.pool() as session:
+        async with self._session() as session:
             for query in queries:
                 await session.execute(text(query))
-            await session.commit()
         return None
+
+    async def autocommit_query(self, query: str) -> None:
+        with self.tracer.start_as_current_span(
+                "PG.autocommit_query",
+                kind=SpanKind.CLIENT,
+        ) as span:
+            try:
+                # Для запросов, которые нельзя выполнять в транзакции, например CREATE INDEX CONCURRENTLY
+                with self.query_stats.measure(span, "autocommit_query", query):
+                    async with self.pool() as session:
+                        conn = await self._checkout(session, PRIMARY_POOL, {"isolation_level": "AUTOCOMMIT"})
+                        await conn.execute(text(query))
+
+                self.router.mark_write()
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    def start_write_scope(self) -> None:
+        self.router.start_write_scope()
+
+    @asynccontextmanager
+    async def advisory_lock(self, key: int) -> AsyncIterator[None]:
+        # Сессионная блокировка на отдельном соединении: держится, пока идет блок, и не зависит
+        # от транзакций внутри него. В AUTOCOMMIT, чтобы соединение не висело idle in transaction.
+        # Если соединение оборвется, Postgres снимет блокировку сам
+        async with self.pool() as session:
+            conn = await self._checkout(session, PRIMARY_POOL, {"isolation_level": "AUTOCOMMIT"})
+            await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+            try:
+                yield
+            finally:
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        transaction = self._transaction.get()
+        if transaction is not None and not transaction.closed:
+            async with transaction.lock:
+                yield transaction.connection
+            return
+
+        async with self.pool() as session:
+            await self._checkout(session, PRIMARY_POOL)
+            yield session
+            await session.commit()
+        self.router.mark_write()
+
+    async def _read(self, query: str, query_params: dict, span) -> Sequence[Any]:
+        # Внутри transaction() читаем в той же сессии, чтобы видеть свои незакоммиченные изменения
+        transaction = self._transaction.get()
+        if transaction is not None and not transaction.closed:
+            span.set_attribute("db.replica", False)
+            async with transaction.lock:
+                result = await transaction.connection.execute(text(query), query_params)
+                return result.all()
+
+        # Сразу после своей записи читаем с первичного сервера: реплика могла ее еще не получить
+        if self.replica_pool is not None and not self.router.wrote_recently() and await self._replica_available():
+            try:
+                rows = await self._read_only_select(self.replica_pool, REPLICA_POOL, query, query_params)
+                span.set_attribute("db.replica", True)
+                return rows
+            except Exception as err:
+                # Реплика недоступна - до следующей проверки отставания читаем с первичного сервера
+                span.add_event("replica_failed", {"error": str(err)})
+                self.router.record_lag(None)
+
+        span.set_attribute("db.replica", False)
+        return await self._read_only_select(self.pool, PRIMARY_POOL, query, query_params)
+
+    async def _read_only_select(
+            self,
+            pool: async_sessionmaker,
+            pool_name: str,
+            query: str,
+            query_params: dict
+    ) -> Sequence[Any]:
+        async with pool() as session:
+            # BEGIN READ ONLY: Postgres не выделяет транзакции xid, а коммит не нужен - сессия просто откатывается
+            conn = await self._checkout(session, pool_name, {"postgresql_readonly": True})
+            result = await conn.execute(text(query), query_params)
+            return result.all()
+
+    async def _explain(self, query: str, query_params: dict) -> list[str]:
+        # EXPLAIN без ANALYZE запрос не выполняет, а read-only транзакция это гарантирует и для INSERT/UPDATE
+        async with self.pool() as session:
+            conn = await self._checkout(session, PRIMARY_POOL, {"postgresql_readonly": True})
+            result = await conn.execute(text(f"EXPLAIN {query}"), query_params)
+            return [row[0] for row in result.all()]
+
+    async def _replica_available(self) -> bool:
+        if self.router.lag_check_due():
+            try:
+                rows = await self._read_only_select(self.replica_pool, REPLICA_POOL, replica_lag_query, {})
+                self.router.record_lag(float(rows[0][0]))
+            except Exception:
+                self.router.record_lag(None)
+
+        return self.router.replica_usable()
+
+    async def _checkout(
+            self,
+            session: AsyncSession,
+            pool_name: str,
+            execution_options: dict | None = None
+    ) -> AsyncConnection:
+        # Сессия берет соединение из пула лениво, поэтому берем его явно и меряем ожидание
+        started_at = time.perf_counter()
+        conn = await session.connection(execution_options=execution_options)
+        self.pool_metrics.record_checkout(pool_name, time.perf_counter() - started_at)
+        return conn
+
+    def _instrument_pool(self, engine: AsyncEngine, pool_name: str) -> None:
+        sync_engine = engine.sync_engine
+
+        # engine.dispose() подменяет пул, поэтому каждый раз берем текущий
+        self.pool_metrics.watch(pool_name, lambda: PoolStats(
+            checked_out=sync_engine.pool.checkedout(),
+            overflow=max(0, sync_engine.pool.overflow()),
+            idle=sync_engine.pool.checkedin(),
+        ))
+
+        @event.listens_for(sync_engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            connection_record.info["connected_at"] = time.monotonic()
+
+        @event.listens_for(sync_engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            connected_at = connection_record.info.get("connected_at")
+            if connected_at is not None:
+                self.pool_metrics.record_connection_age(pool_name, time.monotonic() - connected_at)
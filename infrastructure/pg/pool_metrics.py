@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from opentelemetry.metrics import CallbackOptions, Observation
+
+from internal import common
+
+PRIMARY_POOL = "primary"
+REPLICA_POOL = "replica"
+
+
+@dataclass
+class PoolStats:
+    checked_out: int
+    overflow: int
+    idle: int
+
+
+class PoolMetrics:
+    """Метрики пулов соединений: занятые и простаивающие соединения, overflow сверх pool_size,
+    ожидание соединения и возраст выданного соединения.
+
+    Гейджи опрашиваются экспортером, поэтому пулы регистрируются функцией, которая отдает
+    текущее состояние, а не пушат его сами.
+    """
+
+    def __init__(self, meter):
+        # Имя пула -> функция состояния, None пока пул не создан
+        self._pools: dict[str, Callable[[], PoolStats | None]] = {}
+
+        meter.create_observable_gauge(
+            name=common.DB_POOL_CHECKED_OUT_METRIC,
+            callbacks=[self._observe(lambda stats: stats.checked_out)],
+            description="Connections currently checked out of the pool",
+            unit="1"
+        )
+        meter.create_observable_gauge(
+            name=common.DB_POOL_OVERFLOW_METRIC,
+            callbacks=[self._observe(lambda stats: stats.overflow)],
+            description="Connections open beyond pool_size",
+            unit="1"
+        )
+        meter.create_observable_gauge(
+            name=common.DB_POOL_IDLE_METRIC,
+            callbacks=[self._observe(lambda stats: stats.idle)],
+            description="Open connections waiting in the pool",
+            unit="1"
+        )
+        self.checkout_duration = meter.create_histogram(
+            name=common.DB_POOL_CHECKOUT_DURATION_METRIC,
+            description="Time spent waiting for a pool connection, including connecting",
+            unit="s"
+        )
+        self.connection_age = meter.create_histogram(
+            name=common.DB_POOL_CONNECTION_AGE_METRIC,
+            description="Age of a connection when it is checked out",
+            unit="s"
+        )
+
+    def watch(self, pool_name: str, stats: Callable[[], PoolStats | None]) -> None:
+        self._pools[pool_name] = stats
+
+    def record_checkout(self, pool_name: str, duration: float) -> None:
+        self.checkout_duration.record(duration, {common.DB_POOL_NAME_KEY: pool_name})
+
+    def record_connection_age(self, pool_name: str, age: float) -> None:
+        self.connection_age.record(age, {common.DB_POOL_NAME_KEY: pool_name})
+
+    def _observe(self, value: Callable[[PoolStats], int]) -> Callable[[CallbackOptions], Iterable[Observation]]:
+        def callback(options: CallbackOptions) -> Iterable[Observation]:
+            for pool_name, stats_func in list(self._pools.items()):
+                stats = stats_func()
+                if stats is not None:
+                    yield Observation(value(stats), {common.DB_POOL_NAME_KEY: pool_name})
+
+        return callback
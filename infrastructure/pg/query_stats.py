@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import importlib
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterator
+
+from internal import common, interface
+
+# Пакет, в каждом подпакете которого лежит sql_query.py с запросами репозитория
+SQL_QUERY_PACKAGE = "internal.repo"
+
+STRING_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL_PATTERN = re.compile(r"(?<![\w$])\d+(?:\.\d+)?\b")
+COMMENT_PATTERN = re.compile(r"--[^\n]*")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+TABLE_PATTERN = re.compile(r"\b(?:UPDATE|INTO|FROM)\s+(\w+)", re.IGNORECASE)
+
+
+def normalize_query(query: str) -> str:
+    query = COMMENT_PATTERN.sub(" ", query)
+    query = STRING_LITERAL_PATTERN.sub("?", query)
+    query = NUMBER_LITERAL_PATTERN.sub("?", query)
+    return WHITESPACE_PATTERN.sub(" ", query).strip().rstrip(";").strip().lower()
+
+
+def load_query_names(package: str = SQL_QUERY_PACKAGE) -> dict[str, str]:
+    # Нормализованный текст запроса -> "<репозиторий>.<имя константы>"
+    names: dict[str, str] = {}
+    root = importlib.import_module(package)
+    # Репозитории - namespace-пакеты без __init__.py, pkgutil.iter_modules их не видит
+    for path in root.__path__:
+        for repo_name in sorted(os.listdir(path)):
+            if not os.path.isfile(os.path.join(path, repo_name, "sql_query.py")):
+                continue
+
+            module = importlib.import_module(f"{package}.{repo_name}.sql_query")
+            for name, value in vars(module).items():
+                if isinstance(value, str) and not name.startswith("_"):
+                    names.setdefault(normalize_query(value), f"{repo_name}.{name}")
+    return names
+
+
+class QueryStats:
+    """Отпечатки запросов, латентность по отпечатку и лог медленных запросов.
+
+    Отпечаток - имя константы из repo/*/sql_query.py. Запросы, которые собираются на лету
+    (UPDATE только по переданным полям), получают хэш нормализованного текста: один и тот же
+    набор полей дает один и тот же отпечаток.
+
+    Медленный запрос пишется в лог не чаще раза в slow_query_log_interval секунд на отпечаток,
+    вместе с EXPLAIN. EXPLAIN выполняется в фоне, ответ на запрос его не ждет.
+    """
+
+    def __init__(
+            self,
+            tel: interface.ITelemetry,
+            slow_query_threshold: float,
+            slow_query_log_interval: float,
+            explain_slow_queries: bool
+    ):
+        self.logger = tel.logger()
+        self.slow_query_threshold = slow_query_threshold
+        self.slow_query_log_interval = slow_query_log_interval
+        self.explain_slow_queries = explain_slow_queries
+
+        self.duration = tel.meter().create_histogram(
+            name=common.DB_QUERY_DURATION_METRIC,
+            description="Duration of database queries by fingerprint",
+            unit="s"
+        )
+
+        # Загружаются при первом запросе: к этому моменту все репозитории уже импортированы
+        self._query_names: dict[str, str] | None = None
+        # Текст запроса -> отпечаток
+        self._fingerprints: dict[str, str] = {}
+        # Отпечаток -> когда последний раз писали его в лог медленных запросов
+        self._slow_logged_at: dict[str, float] = {}
+        # Ссылки на фоновые EXPLAIN, чтобы их не собрал сборщик мусора
+        self._explain_tasks: set[asyncio.Task] = set()
+
+    def fingerprint(self, query: str) -> str:
+        fingerprint = self._fingerprints.get(query)
+        if fingerprint is None:
+            if self._query_names is None:
+                self._query_names = load_query_names()
+
+            normalized = normalize_query(query)
+            fingerprint = self._query_names.get(normalized)
+            if fingerprint is None:
+                verb = normalized.split(" ", 1)[0]
+                table = TABLE_PATTERN.search(normalized)
+                prefix = f"{verb}_{table.group(1)}" if table else verb
+                fingerprint = f"{prefix}:{hashlib.sha1(normalized.encode()).hexdigest()[:8]}"
+            self._fingerprints[query] = fingerprint
+        return fingerprint
+
+    @contextmanager
+    def measure(
+            self,
+            span,
+            operation: str,
+            query: str,
+            explain: Callable[[], Awaitable[list[str]]] | None = None
+    ) -> Iterator[None]:
+        # Пишем только успешные запросы: ошибки и так видны в спанах
+        fingerprint = self.fingerprint(query)
+        span.set_attribute(common.DB_QUERY_FINGERPRINT_KEY, fingerprint)
+
+        started_at = time.perf_counter()
+        yield
+        duration = time.perf_counter() - started_at
+
+        self.duration.record(duration, {
+            common.DB_QUERY_FINGERPRINT_KEY: fingerprint,
+            common.DB_OPERATION_NAME_KEY: operation,
+        })
+
+        if duration >= self.slow_query_threshold and self._sample(fingerprint):
+            span.add_event("slow_query", {"duration": duration})
+            task = asyncio.create_task(self._log_slow_query(fingerprint, operation, duration, explain))
+            self._explain_tasks.add(task)
+            task.add_done_callback(self._explain_tasks.discard)
+
+    def _sample(self, fingerprint: str) -> bool:
+        now = time.monotonic()
+        logged_at = self._slow_logged_at.get(fingerprint)
+        if logged_at is not None and now - logged_at < self.slow_query_log_interval:
+            return False
+
+        self._slow_logged_at[fingerprint] = now
+        return True
+
+    async def _log_slow_query(
+            self,
+            fingerprint: str,
+            operation: str,
+            duration: float,
+            explain: Callable[[], Awaitable[list[str]]] | None
+    ) -> None:
+        plan = None
+        if explain is not None and self.explain_slow_queries:
+            try:
+                plan = "\n".join(await explain())
+            except Exception as err:
+                plan = f"EXPLAIN failed: {err}"
+
+        # Значения параметров не пишем: в них ФИО, почты и телефоны кандидатов
+        self.logger.warning("Медленный запрос к БД", {
+            common.DB_QUERY_FINGERPRINT_KEY: fingerprint,
+            common.DB_OPERATION_NAME_KEY: operation,
+            "duration": duration,
+            "plan": plan,
+        })
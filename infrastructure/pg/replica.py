@@ -0,0 +1,80 @@
+import contextvars
+import re
+import time
+
+# Как часто перепроверяем отставание реплики, в секундах
+REPLICA_LAG_CHECK_INTERVAL = 5.0
+
+# select() используется и для INSERT/UPDATE ... RETURNING, поэтому на реплику идут только запросы,
+# которые начинаются с SELECT/WITH и не содержат ничего пишущего или блокирующего строки
+READ_STATEMENT_PATTERN = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+WRITE_STATEMENT_PATTERN = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|NEXTVAL|SETVAL|PG_ADVISORY_\w+)\b|\bFOR\s+(NO\s+KEY\s+)?(UPDATE|SHARE)\b",
+    re.IGNORECASE
+)
+
+# На первичном сервере отставание 0. На реплике, которая проиграла весь полученный WAL, тоже 0,
+# иначе время с момента последней проигранной транзакции
+replica_lag_query = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END AS lag;
+"""
+
+# Когда текущий запрос (или задача, от которой он запущен) последний раз писал в базу.
+# Список, а не число: дочерние задачи из asyncio.gather пишут в тот же объект, что и родитель.
+# Список создается один раз на входе в запрос (start_write_scope), а не в задаче, которая
+# пишет первой: иначе запись из дочерней задачи не увидит родитель
+_last_write_at: contextvars.ContextVar[list[float] | None] = contextvars.ContextVar("pg_last_write_at", default=None)
+
+
+class ReplicaRouter:
+    """Решает, можно ли отправить чтение на реплику"""
+
+    def __init__(self, max_replica_lag: float):
+        self.max_replica_lag = max_replica_lag
+
+        self._read_only_queries: dict[str, bool] = {}
+        self._replica_lag: float | None = None
+        self._lag_checked_at: float | None = None
+
+    def is_read_only(self, query: str) -> bool:
+        read_only = self._read_only_queries.get(query)
+        if read_only is None:
+            read_only = bool(READ_STATEMENT_PATTERN.match(query)) and not WRITE_STATEMENT_PATTERN.search(query)
+            self._read_only_queries[query] = read_only
+        return read_only
+
+    def start_write_scope(self) -> None:
+        _last_write_at.set([float("-inf")])
+
+    def mark_write(self) -> None:
+        holder = _last_write_at.get()
+        if holder is not None:
+            holder[0] = time.monotonic()
+
+    def wrote_recently(self) -> bool:
+        holder = _last_write_at.get()
+        # Вне запроса свои записи отследить негде, поэтому читаем с первичного
+        if holder is None:
+            return True
+
+        # Запись старше допустимого отставания реплика уже гарантированно видит
+        return time.monotonic() - holder[0] <= self.max_replica_lag
+
+    def lag_check_due(self) -> bool:
+        now = time.monotonic()
+        if self._lag_checked_at is not None and now - self._lag_checked_at < REPLICA_LAG_CHECK_INTERVAL:
+            return False
+
+        # Отмечаем сразу, чтобы параллельные чтения не проверяли отставание одновременно
+        self._lag_checked_at = now
+        return True
+
+    def record_lag(self, lag: float | None) -> None:
+        self._replica_lag = lag
+
+    def replica_usable(self) -> bool:
+        return self._replica_lag is not None and self._replica_lag <= self.max_replica_lag
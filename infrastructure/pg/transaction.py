@@ -0,0 +1,17 @@
+import asyncio
+from typing import Any
+
+
+class Transaction:
+    """Открытая транзакция db.transaction(), к которой присоединяются запросы репозиториев.
+
+    Живет в contextvar, поэтому ее видят и задачи, запущенные внутри блока. Соединение одно,
+    параллельные запросы по нему выполняются по очереди.
+    """
+
+    def __init__(self, connection: Any):
+        # AsyncSession у PG, соединение asyncpg у NativePG
+        self.connection = connection
+        self.lock = asyncio.Lock()
+        # Фоновая задача, созданная внутри блока, может пережить транзакцию и должна идти мимо нее
+        self.closed = False
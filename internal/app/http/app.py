@@ -8,6 +8,7 @@ from starlette.responses import StreamingResponse
 from internal import model, interface
 from internal.controller.http.handler.interview.model import *
 from internal.controller.http.handler.vacancy.model import *
+from internal.controller.http.handler.resume_job.model import *
 
 
 def NewHTTP(
@@ -15,7 +16,12 @@ def NewHTTP(
         vacancy_controller: interface.IVacancyController,
         interview_controller: interface.IInterviewController,
         telegram_controller: interface.ITelegramHTTPController,
+        resume_job_controller: interface.IResumeJobController,
         telegram_client: interface.ITelegramClient,
+        telegram_dispatcher: interface.ITelegramDispatcher,
+        email_client: interface.IEmailClient,
+        resume_job_service: interface.IResumeJobService,
+        migration_service: interface.IMigrationService,
         http_middleware: interface.IHttpMiddleware,
         prefix: str
 ):
@@ -23,23 +29,40 @@ def NewHTTP(
         openapi_url=prefix + "/openapi.json",
         docs_url=prefix + "/docs",
         redoc_url=prefix + "/redoc",
-        lifespan=on_startup(telegram_client)
+        lifespan=on_startup(telegram_client, telegram_dispatcher, email_client, resume_job_service, migration_service)
     )
     include_middleware(app, http_middleware)
-    include_db_handler(app, db, prefix)
+    include_db_handler(app, db, migration_service, prefix)
 
     include_vacancy_handlers(app, vacancy_controller, prefix)
     include_interview_handlers(app, interview_controller, prefix)
     include_telegram_handlers(app, telegram_controller, prefix)
+    include_resume_job_handlers(app, resume_job_controller, prefix)
 
     return app
 
 
-def on_startup(telegram_client: interface.ITelegramClient):
+def on_startup(
+        telegram_client: interface.ITelegramClient,
+        telegram_dispatcher: interface.ITelegramDispatcher,
+        email_client: interface.IEmailClient,
+        resume_job_service: interface.IResumeJobService,
+        migration_service: interface.IMigrationService
+):
     @asynccontextmanager
     async def lifespan(app: FastAPI):
+        # Схема и индексы должны быть на месте до того, как фоновые задачи пойдут в базу
+        await migration_service.migrate()
         await telegram_client.start()
+        # Досылаем приглашения, оставшиеся в outbox с прошлого запуска
+        telegram_dispatcher.start()
+        # Продолжаем задачи оценки резюме, прерванные рестартом, и брошенные другими экземплярами
+        resume_job_service.start()
         yield
+        await resume_job_service.stop()
+        await telegram_dispatcher.stop()
+        # Корректно закрываем SMTP сессии из пула
+        await email_client.close()
 
     return lifespan
 
@@ -48,6 +71,7 @@ def include_middleware(
         app: FastAPI,
         http_middleware: interface.IHttpMiddleware
 ):
+    http_middleware.db_middleware04(app)
     http_middleware.logger_middleware03(app)
     http_middleware.metrics_middleware02(app)
     http_middleware.trace_middleware01(app)
@@ -66,6 +90,16 @@ def include_vacancy_handlers(
         methods=["POST"],
     )
 
+    # Создание вакансии вместе с весами и вопросами одной транзакцией
+    app.add_api_route(
+        prefix + "/create-bundle",
+        vacancy_controller.create_vacancy_bundle,
+        tags=["Vacancy"],
+        methods=["POST"],
+        response_model=CreateVacancyBundleResponse,
+        status_code=201,
+    )
+
     # Удаление вакансии
     app.add_api_route(
         prefix + "/delete/{vacancy_id}",
@@ -90,6 +124,15 @@ def include_vacancy_handlers(
         methods=["POST"],
     )
 
+    # Добавление нескольких вопросов к вакансии одним запросом, например сгенерированных
+    app.add_api_route(
+        prefix + "/question/add-many",
+        vacancy_controller.add_questions,
+        tags=["Question"],
+        methods=["POST"],
+        response_model=AddQuestionsResponse,
+    )
+
     # Редактирование вопроса
     app.add_api_route(
         prefix + "/question/edit",
@@ -165,6 +208,15 @@ def include_vacancy_handlers(
         response_model=EvaluateResumeResponse,
     )
 
+    # Подбор подходящих вакансий по резюме без вызова LLM
+    app.add_api_route(
+        prefix + "/match-resume",
+        vacancy_controller.match_vacancies,
+        methods=["POST"],
+        tags=["Resume"],
+        response_model=MatchVacanciesResponse,
+    )
+
     # Отклик на вакансию (одиночное резюме)
     app.add_api_route(
         prefix + "/respond",
@@ -183,6 +235,15 @@ def include_vacancy_handlers(
         response_model=list[model.Vacancy],
     )
 
+    # Получение вакансий постранично (только поля для списка)
+    app.add_api_route(
+        prefix + "/all/page",
+        vacancy_controller.get_vacancies_page,
+        methods=["GET"],
+        tags=["Vacancy"],
+        response_model=GetVacanciesPageResponse,
+    )
+
     # Получение всех вопросов вакансии
     app.add_api_route(
         prefix + "/question/all/{vacancy_id}",
@@ -252,6 +313,33 @@ def include_interview_handlers(
         response_model=list[model.Interview],
     )
 
+    # Получение интервью для вакансии постранично (только поля для списка)
+    app.add_api_route(
+        prefix + "/interview/vacancy/{vacancy_id}/page",
+        interview_controller.get_interviews_page,
+        methods=["GET"],
+        tags=["Interview"],
+        response_model=GetInterviewsPageResponse,
+    )
+
+    # Поиск кандидатов по навыкам и выводам интервью (до /interview/{interview_id}, иначе маршрут перехватится)
+    app.add_api_route(
+        prefix + "/interview/search",
+        interview_controller.search_interviews,
+        methods=["GET"],
+        tags=["Interview"],
+        response_model=SearchInterviewsResponse,
+    )
+
+    # Полнотекстовый поиск по расшифровкам интервью
+    app.add_api_route(
+        prefix + "/interview/transcripts/search",
+        interview_controller.search_transcripts,
+        methods=["GET"],
+        tags=["Interview"],
+        response_model=SearchTranscriptsResponse,
+    )
+
     # Получить интервью по ID
     app.add_api_route(
         prefix + "/interview/{interview_id}",
@@ -270,6 +358,15 @@ def include_interview_handlers(
         response_model=GetCandidateAnswersResponse,
     )
 
+    # Получение деталей интервью постранично (ответы вместе с сообщениями)
+    app.add_api_route(
+        prefix + "/interview/{interview_id}/details/page",
+        interview_controller.get_interview_details_page,
+        methods=["GET"],
+        tags=["Interview"],
+        response_model=GetInterviewDetailsPageResponse,
+    )
+
     # Скачать аудио файл
     app.add_api_route(
         prefix + "/interview/audio/{audio_fid}/{audio_filename}",
@@ -319,16 +416,83 @@ def include_telegram_handlers(
         tags=["Telegram"],
     )
 
+    # Статус доставки приглашения на интервью
+    app.add_api_route(
+        prefix + "/telegram/invitation/{interview_id}",
+        telegram_controller.get_invitation_status,
+        methods=["GET"],
+        tags=["Telegram"],
+    )
+
+
+def include_resume_job_handlers(
+        app: FastAPI,
+        resume_job_controller: interface.IResumeJobController,
+        prefix: str
+):
+    # Создание фоновой задачи оценки резюме
+    app.add_api_route(
+        prefix + "/evaluate-resumes/jobs",
+        resume_job_controller.create_job,
+        methods=["POST"],
+        tags=["Resume"],
+        response_model=CreateResumeJobResponse,
+        status_code=202,
+    )
+
+    # Статус задачи оценки резюме с результатами по файлам
+    app.add_api_route(
+        prefix + "/evaluate-resumes/jobs/{job_id}",
+        resume_job_controller.get_job,
+        methods=["GET"],
+        tags=["Resume"],
+        response_model=GetResumeJobResponse,
+    )
+
+    # Прогресс задачи оценки резюме (Server-Sent Events)
+    app.add_api_route(
+        prefix + "/evaluate-resumes/jobs/{job_id}/stream",
+        resume_job_controller.stream_job,
+        methods=["GET"],
+        tags=["Resume"],
+        response_class=StreamingResponse,
+    )
+
+    # Быстрый отклик: резюме сохраняется и оценивается в фоне, сразу возвращаем id отклика
+    app.add_api_route(
+        prefix + "/respond/async",
+        resume_job_controller.respond_async,
+        methods=["POST"],
+        tags=["Resume"],
+        response_model=RespondAsyncResponse,
+        status_code=202,
+    )
 
-def include_db_handler(app: FastAPI, db: interface.IDB, prefix: str):
-    app.add_api_route(prefix + "/table/create", create_table_handler(db), methods=["GET"])
+    # Статус и результат быстрого отклика
+    app.add_api_route(
+        prefix + "/respond/async/{application_id}",
+        resume_job_controller.get_application,
+        methods=["GET"],
+        tags=["Resume"],
+        response_model=GetApplicationResponse,
+    )
+
+
+def include_db_handler(
+        app: FastAPI,
+        db: interface.IDB,
+        migration_service: interface.IMigrationService,
+        prefix: str
+):
+    app.add_api_route(prefix + "/table/create", create_table_handler(migration_service), methods=["GET"])
     app.add_api_route(prefix + "/table/drop", drop_table_handler(db), methods=["GET"])
 
 
-def create_table_handler(db: interface.IDB):
+def create_table_handler(migration_service: interface.IMigrationService):
     async def create_table():
         try:
-            await db.multi_query(model.create_all_tables_queries)
+            # После /table/drop версии миграций тоже удалены, поэтому схема накатывается заново целиком
+            await migration_service.migrate()
         except Exception as err:
             raise err
 
@@ -21,6 +21,10 @@ TELEGRAM_MESSAGE_DURATION_KEY = "telegram.message.duration"
 TELEGRAM_MESSAGE_DIRECTION_KEY = "telegram.message.direction"
 TELEGRAM_CHAT_TYPE_KEY = "telegram.chat.type"
 
+DB_POOL_NAME_KEY = "db.client.connection.pool.name"
+DB_QUERY_FINGERPRINT_KEY = "db.query.fingerprint"
+DB_OPERATION_NAME_KEY = "db.operation.name"
+
 REQUEST_DURATION_METRIC = "http.server.request.duration"
 ACTIVE_REQUESTS_METRIC = "http.server.active_requests"
 REQUEST_BODY_SIZE_METRIC = "http.server.request.body.size"
@@ -35,5 +39,21 @@ ERROR_JOIN_CHAT_TOTAL_METRIC = "telegram.server.error.join_chat.total"
 MESSAGE_DURATION_METRIC = "telegram.server.message.duration"
 ACTIVE_MESSAGES_METRIC = "telegram.server.active_messages"
 
+OK_EMAIL_TOTAL_METRIC = "email.client.ok.message.total"
+ERROR_EMAIL_TOTAL_METRIC = "email.client.error.message.total"
+EMAIL_BATCH_DURATION_METRIC = "email.client.batch.duration"
+EMAIL_BATCH_THROUGHPUT_METRIC = "email.client.batch.throughput"
+SMTP_CONNECTIONS_OPENED_TOTAL_METRIC = "email.client.smtp.connections.opened.total"
+
+DB_POOL_CHECKED_OUT_METRIC = "db.client.connection.pool.checked_out"
+DB_POOL_OVERFLOW_METRIC = "db.client.connection.pool.overflow"
+DB_POOL_IDLE_METRIC = "db.client.connection.pool.idle"
+DB_POOL_CHECKOUT_DURATION_METRIC = "db.client.connection.wait_time"
+DB_POOL_CONNECTION_AGE_METRIC = "db.client.connection.age"
+DB_QUERY_DURATION_METRIC = "db.client.operation.duration"
+
+# С каким разрешением страницы PDF-резюме рендерятся в картинки для vision-моделей
+RESUME_RENDER_DPI = 200
+
 TRACE_ID_HEADER = "X-Trace-ID"
 SPAN_ID_HEADER = "X-Span-ID"
\ No newline at end of file
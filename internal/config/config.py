@@ -20,6 +20,26 @@ class Config:
         self.db_user = os.getenv("VTBAIHR_VACANCY_POSTGRES_USER", "vacancy-user")
         self.db_pass = os.getenv("VTBAIHR_VACANCY_POSTGRES_PASSWORD", "password")
         self.db_name = os.getenv("VTBAIHR_VACANCY_POSTGRES_DB_NAME", "vacancy")
+        # sqlalchemy - запросы через text() и AsyncSession, asyncpg - голый пул с prepared statements
+        self.db_driver = os.getenv("VTBAIHR_VACANCY_POSTGRES_DRIVER", "sqlalchemy")
+        # 0 отключает prepared statements, нужно за pgbouncer в transaction mode
+        self.db_statement_cache_size = int(os.getenv("VTBAIHR_VACANCY_POSTGRES_STATEMENT_CACHE_SIZE", "1024"))
+        # Пул соединений: pool_size постоянных, до max_overflow сверх них под пиковую нагрузку
+        self.db_pool_size = int(os.getenv("VTBAIHR_VACANCY_POSTGRES_POOL_SIZE", "15"))
+        self.db_max_overflow = int(os.getenv("VTBAIHR_VACANCY_POSTGRES_MAX_OVERFLOW", "15"))
+        self.db_pool_recycle = int(os.getenv("VTBAIHR_VACANCY_POSTGRES_POOL_RECYCLE", "300"))
+        self.db_pool_timeout = float(os.getenv("VTBAIHR_VACANCY_POSTGRES_POOL_TIMEOUT", "30"))
+        # Проверять соединение SELECT 1 перед выдачей из пула, нужно если база или прокси рвут простаивающие
+        self.db_pool_pre_ping = os.getenv("VTBAIHR_VACANCY_POSTGRES_POOL_PRE_PING", "false").lower() == "true"
+        # Реплика для чтения: пустой хост - все чтения идут на первичный сервер
+        self.db_replica_host = os.getenv("VTBAIHR_VACANCY_POSTGRES_REPLICA_HOST", "")
+        self.db_replica_port = os.getenv("VTBAIHR_VACANCY_POSTGRES_REPLICA_PORT", self.db_port)
+        # При большем отставании, в секундах, и столько же после собственной записи читаем с первичного сервера
+        self.db_max_replica_lag = float(os.getenv("VTBAIHR_VACANCY_POSTGRES_MAX_REPLICA_LAG", "5.0"))
+        # Запросы дольше порога, в секундах, пишутся в лог с EXPLAIN, не чаще раза в интервал на отпечаток
+        self.db_slow_query_threshold = float(os.getenv("VTBAIHR_VACANCY_POSTGRES_SLOW_QUERY_THRESHOLD", "0.5"))
+        self.db_slow_query_log_interval = float(os.getenv("VTBAIHR_VACANCY_POSTGRES_SLOW_QUERY_LOG_INTERVAL", "60"))
+        self.db_explain_slow_queries = os.getenv("VTBAIHR_VACANCY_POSTGRES_EXPLAIN_SLOW_QUERIES", "true").lower() == "true"
 
         # Redis configuration for monitoring
         self.monitoring_redis_host = os.getenv("VTBAIHR_MONITORING_REDIS_HOST", "localhost")
@@ -50,8 +70,21 @@ class Config:
         self.smtp_user = os.getenv("VTBAIHR_SMTP_USER", "")
         self.smtp_password = os.getenv("VTBAIHR_SMTP_PASSWORD", "")
         self.smtp_use_tls = os.getenv("VTBAIHR_SMTP_USE_TLS", "true").lower() == "true"
+        self.smtp_pool_size = int(os.getenv("VTBAIHR_SMTP_POOL_SIZE", "4"))
+
+        # Resume screening pipeline
+        self.resume_eval_concurrency = int(os.getenv("VTBAIHR_RESUME_EVAL_CONCURRENCY", "4"))
+        self.resume_eval_memory_limit_mb = int(os.getenv("VTBAIHR_RESUME_EVAL_MEMORY_LIMIT_MB", "256"))
+        self.resume_eval_max_files = int(os.getenv("VTBAIHR_RESUME_EVAL_MAX_FILES", "10"))
+        self.resume_job_max_files = int(os.getenv("VTBAIHR_RESUME_JOB_MAX_FILES", "100"))
+        self.resume_prefilter_min_score = float(os.getenv("VTBAIHR_RESUME_PREFILTER_MIN_SCORE", "0.1"))
+        self.resume_prefilter_mode = os.getenv("VTBAIHR_RESUME_PREFILTER_MODE", "reject")
+        self.resume_matching_llm_model = os.getenv("VTBAIHR_RESUME_MATCHING_LLM_MODEL", "gpt-5-mini")
 
         # Telegram
         self.tg_api_id = int(os.getenv("VTBAIHR_TG_API_ID", "0"))
         self.tg_api_hash = os.getenv("VTBAIHR_TG_API_HASH", "")
-        self.tg_session_string = os.getenv("VTBAIHR_TG_SESSION_STRING", None)
\ No newline at end of file
+        self.tg_session_string = os.getenv("VTBAIHR_TG_SESSION_STRING", None)
+        self.tg_send_interval = float(os.getenv("VTBAIHR_TG_SEND_INTERVAL", "3.0"))
+        self.tg_outbox_batch_size = int(os.getenv("VTBAIHR_TG_OUTBOX_BATCH_SIZE", "20"))
+        self.tg_outbox_max_attempts = int(os.getenv("VTBAIHR_TG_OUTBOX_MAX_ATTEMPTS", "5"))
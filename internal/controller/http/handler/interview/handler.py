@@ -130,6 +130,160 @@ class InterviewController(interface.IInterviewController):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    async def get_interviews_page(
+            self,
+            vacancy_id: int = Path(...),
+            limit: int = 20,
+            cursor: str | None = None
+    ) -> JSONResponse:
+        with self.tracer.start_as_current_span(
+                "InterviewController.get_interviews_page",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy_id,
+                    "limit": limit
+                }
+        ) as span:
+            try:
+                if limit < 1 or limit > 100:
+                    raise Exception("Limit must be between 1 and 100")
+
+                self.logger.info("Начали получение страницы интервью", {
+                    "vacancy_id": vacancy_id,
+                    "limit": limit
+                })
+
+                interviews, next_cursor = await self.interview_service.get_interviews_page(vacancy_id, limit, cursor)
+
+                self.logger.info("Получили страницу интервью", {
+                    "vacancy_id": vacancy_id,
+                    "interviews_count": len(interviews)
+                })
+
+                span.set_status(Status(StatusCode.OK))
+                return JSONResponse(
+                    status_code=200,
+                    content={
+                        "interviews": [interview.to_dict() for interview in interviews],
+                        "next_cursor": next_cursor
+                    }
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def search_interviews(
+            self,
+            query: str,
+            vacancy_id: int | None = None,
+            limit: int = 20,
+            offset: int = 0
+    ) -> JSONResponse:
+        with self.tracer.start_as_current_span(
+                "InterviewController.search_interviews",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "query": query,
+                    "limit": limit,
+                    "offset": offset
+                }
+        ) as span:
+            try:
+                if limit < 1 or limit > 100:
+                    raise Exception("Limit must be between 1 and 100")
+                if offset < 0:
+                    raise Exception("Offset must not be negative")
+
+                self.logger.info("Начали поиск по интервью", {
+                    "query": query,
+                    "vacancy_id": vacancy_id,
+                    "limit": limit,
+                    "offset": offset
+                })
+
+                total, hits, next_offset = await self.interview_service.search_interviews(
+                    query,
+                    vacancy_id,
+                    limit,
+                    offset
+                )
+
+                self.logger.info("Нашли интервью", {
+                    "query": query,
+                    "total": total,
+                    "hits_count": len(hits)
+                })
+
+                span.set_status(Status(StatusCode.OK))
+                return JSONResponse(
+                    status_code=200,
+                    content={
+                        "total": total,
+                        "hits": [hit.to_dict() for hit in hits],
+                        "next_offset": next_offset
+                    }
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def search_transcripts(
+            self,
+            query: str,
+            vacancy_id: int | None = None,
+            interview_id: int | None = None,
+            limit: int = 20,
+            offset: int = 0
+    ) -> JSONResponse:
+        with self.tracer.start_as_current_span(
+                "InterviewController.search_transcripts",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "query": query,
+                    "limit": limit,
+                    "offset": offset
+                }
+        ) as span:
+            try:
+                self.logger.info("Начали поиск по расшифровкам интервью", {
+                    "query": query,
+                    "vacancy_id": vacancy_id,
+                    "interview_id": interview_id,
+                    "limit": limit,
+                    "offset": offset
+                })
+
+                matches, next_offset = await self.interview_service.search_transcripts(
+                    query,
+                    vacancy_id,
+                    interview_id,
+                    limit,
+                    offset
+                )
+
+                self.logger.info("Нашли сообщения в расшифровках интервью", {
+                    "query": query,
+                    "matches_count": len(matches)
+                })
+
+                span.set_status(Status(StatusCode.OK))
+                return JSONResponse(
+                    status_code=200,
+                    content={
+                        "matches": [match.to_dict() for match in matches],
+                        "next_offset": next_offset
+                    }
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
     async def get_interview_by_id(self, interview_id: int = Path(...)) -> JSONResponse:
         with self.tracer.start_as_current_span(
                 "InterviewController.get_interview_by_id",
@@ -193,6 +347,59 @@ class InterviewController(interface.IInterviewController):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    async def get_interview_details_page(
+            self,
+            interview_id: int = Path(...),
+            after_question_id: int = 0,
+            limit: int = 20
+    ) -> JSONResponse:
+        with self.tracer.start_as_current_span(
+                "InterviewController.get_interview_details_page",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "interview_id": interview_id,
+                    "after_question_id": after_question_id,
+                    "limit": limit
+                }
+        ) as span:
+            try:
+                if limit < 1 or limit > 100:
+                    raise Exception("Limit must be between 1 and 100")
+
+                self.logger.info("Начали получение страницы деталей интервью", {
+                    "interview_id": interview_id,
+                    "after_question_id": after_question_id,
+                    "limit": limit
+                })
+
+                candidate_answers = await self.interview_service.get_interview_details_page(
+                    interview_id=interview_id,
+                    after_question_id=after_question_id,
+                    limit=limit
+                )
+                candidate_answers_dict = [answer.to_dict() for answer in candidate_answers]
+                next_after_question_id = candidate_answers[-1].question_id if len(candidate_answers) == limit else None
+
+                self.logger.info("Получили страницу деталей интервью", {
+                    "interview_id": interview_id,
+                    "candidate_answers_count": len(candidate_answers),
+                    "next_after_question_id": next_after_question_id
+                })
+
+                span.set_status(Status(StatusCode.OK))
+                return JSONResponse(
+                    status_code=200,
+                    content={
+                        "candidate_answers": candidate_answers_dict,
+                        "next_after_question_id": next_after_question_id
+                    }
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
     async def download_audio(
             self,
             audio_fid: str = Path(...),
@@ -21,3 +21,24 @@ class SendAnswerResponse(BaseModel):
 class GetCandidateAnswersResponse(BaseModel):
     candidate_answers: list[model.CandidateAnswer]
     interview_messages: list[model.InterviewMessage]
+
+
+class GetInterviewDetailsPageResponse(BaseModel):
+    candidate_answers: list[model.CandidateAnswerDetails]
+    next_after_question_id: int | None
+
+
+class GetInterviewsPageResponse(BaseModel):
+    interviews: list[model.InterviewSummary]
+    next_cursor: str | None
+
+
+class SearchInterviewsResponse(BaseModel):
+    total: int
+    hits: list[model.InterviewSearchHit]
+    next_offset: int | None
+
+
+class SearchTranscriptsResponse(BaseModel):
+    matches: list[model.TranscriptMatch]
+    next_offset: int | None
@@ -0,0 +1,205 @@
+import json
+
+from opentelemetry.trace import Status, StatusCode, SpanKind
+from fastapi import UploadFile, Form, Path
+from fastapi.responses import JSONResponse
+from starlette.responses import StreamingResponse
+
+from .model import *
+from internal import interface, model
+
+
+class ResumeJobController(interface.IResumeJobController):
+    def __init__(
+            self,
+            tel: interface.ITelemetry,
+            resume_job_service: interface.IResumeJobService,
+            max_resume_files: int = 100,
+    ):
+        self.tracer = tel.tracer()
+        self.logger = tel.logger()
+        self.resume_job_service = resume_job_service
+        self.max_resume_files = max_resume_files
+
+    async def create_job(
+            self,
+            vacancy_id: int = Form(...),
+            candidate_resume_files: list[UploadFile] = Form(...)
+    ) -> JSONResponse:
+        with self.tracer.start_as_current_span(
+                "ResumeJobController.create_job",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy_id,
+                    "resumes_count": len(candidate_resume_files)
+                }
+        ) as span:
+            try:
+                if len(candidate_resume_files) > self.max_resume_files:
+                    raise Exception("Too many files")
+
+                self.logger.info("Начали создание задачи оценки резюме", {
+                    "vacancy_id": vacancy_id,
+                    "resumes_count": len(candidate_resume_files),
+                })
+
+                job_id = await self.resume_job_service.create_job(
+                    vacancy_id=vacancy_id,
+                    candidate_resume_files=candidate_resume_files
+                )
+
+                self.logger.info("Создали задачу оценки резюме", {
+                    "vacancy_id": vacancy_id,
+                    "job_id": job_id,
+                })
+
+                span.set_status(Status(StatusCode.OK))
+                return JSONResponse(
+                    status_code=202,
+                    content={"job_id": job_id}
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def get_job(self, job_id: int = Path(...)) -> JSONResponse:
+        with self.tracer.start_as_current_span(
+                "ResumeJobController.get_job",
+                kind=SpanKind.INTERNAL,
+                attributes={"job_id": job_id}
+        ) as span:
+            try:
+                job, job_files = await self.resume_job_service.get_job(job_id)
+
+                span.set_status(Status(StatusCode.OK))
+                return JSONResponse(
+                    status_code=200,
+                    content={
+                        "job": job.to_dict(),
+                        "files": [job_file.to_dict() for job_file in job_files]
+                    }
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def stream_job(self, job_id: int = Path(...)) -> StreamingResponse:
+        with self.tracer.start_as_current_span(
+                "ResumeJobController.stream_job",
+                kind=SpanKind.INTERNAL,
+                attributes={"job_id": job_id}
+        ) as span:
+            try:
+                # Проверяем существование задачи до открытия стрима
+                await self.resume_job_service.get_job(job_id)
+
+                async def event_stream():
+                    try:
+                        async for job in self.resume_job_service.watch_job(job_id):
+                            yield f"event: progress\ndata: {json.dumps(job.to_dict())}\n\n"
+
+                        job, job_files = await self.resume_job_service.get_job(job_id)
+                        result = {
+                            "job": job.to_dict(),
+                            "files": [job_file.to_dict() for job_file in job_files]
+                        }
+                        yield f"event: done\ndata: {json.dumps(result)}\n\n"
+                    except Exception as err:
+                        self.logger.error("Ошибка в стриме прогресса задачи оценки резюме", {
+                            "job_id": job_id,
+                            "error": str(err),
+                        })
+                        yield f"event: error\ndata: {json.dumps({'error': str(err)})}\n\n"
+
+                span.set_status(Status(StatusCode.OK))
+                return StreamingResponse(
+                    event_stream(),
+                    media_type="text/event-stream",
+                    headers={
+                        "Cache-Control": "no-cache",
+                        "X-Accel-Buffering": "no"
+                    }
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def respond_async(
+            self,
+            vacancy_id: int = Form(...),
+            candidate_email: str = Form(...),
+            candidate_resume_file: UploadFile = Form(...)
+    ) -> JSONResponse:
+        with self.tracer.start_as_current_span(
+                "ResumeJobController.respond_async",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy_id,
+                    "candidate_email": candidate_email
+                }
+        ) as span:
+            try:
+                self.logger.info("Приняли отклик кандидата на фоновую оценку", {
+                    "vacancy_id": vacancy_id,
+                    "candidate_email": candidate_email,
+                    "resume_filename": candidate_resume_file.filename,
+                })
+
+                application_id = await self.resume_job_service.create_application(
+                    vacancy_id=vacancy_id,
+                    candidate_resume_file=candidate_resume_file
+                )
+
+                span.set_status(Status(StatusCode.OK))
+                return JSONResponse(
+                    status_code=202,
+                    content={"application_id": application_id}
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def get_application(self, application_id: int = Path(...)) -> JSONResponse:
+        with self.tracer.start_as_current_span(
+                "ResumeJobController.get_application",
+                kind=SpanKind.INTERNAL,
+                attributes={"application_id": application_id}
+        ) as span:
+            try:
+                job, job_file = await self.resume_job_service.get_application(application_id)
+
+                # Пока файл в очереди или оценивается, кандидату отдаем processing
+                if job_file.status == model.ResumeJobFileStatus.PENDING:
+                    status = "processing"
+                else:
+                    status = job_file.status.value
+
+                interview_link = ""
+                if job_file.status == model.ResumeJobFileStatus.PASSED and job_file.interview_id:
+                    interview_link = f"/interview/start/{job_file.interview_id}"
+
+                span.set_status(Status(StatusCode.OK))
+                return JSONResponse(
+                    status_code=200,
+                    content={
+                        "application_id": job.id,
+                        "status": status,
+                        "interview_link": interview_link,
+                        "accordance_xp_vacancy_score": job_file.accordance_xp_vacancy_score,
+                        "accordance_skill_vacancy_score": job_file.accordance_skill_vacancy_score,
+                        "message_to_candidate": job_file.message_to_candidate
+                    }
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
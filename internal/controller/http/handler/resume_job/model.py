@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from internal import model
+
+
+class CreateResumeJobResponse(BaseModel):
+    job_id: int
+
+
+class GetResumeJobResponse(BaseModel):
+    job: model.ResumeEvaluationJob
+    files: list[model.ResumeEvaluationJobFile]
+
+
+class RespondAsyncResponse(BaseModel):
+    application_id: int
+
+
+class GetApplicationResponse(BaseModel):
+    application_id: int
+    status: str
+    interview_link: str
+    accordance_xp_vacancy_score: int
+    accordance_skill_vacancy_score: int
+    message_to_candidate: str
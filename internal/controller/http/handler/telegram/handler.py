@@ -9,10 +9,12 @@ class TelegramHTTPController(interface.ITelegramHTTPController):
             self,
             tel: interface.ITelemetry,
             telegram_client: interface.ITelegramClient,
+            telegram_dispatcher: interface.ITelegramDispatcher,
     ):
         self.tracer = tel.tracer()
         self.logger = tel.logger()
         self.telegram_client = telegram_client
+        self.telegram_dispatcher = telegram_dispatcher
 
     async def generate_qr_code(self) -> StreamingResponse:
         with self.tracer.start_as_current_span(
@@ -104,4 +106,24 @@ class TelegramHTTPController(interface.ITelegramHTTPController):
             except Exception as err:
                 span.record_exception(err)
                 span.set_status(Status(StatusCode.ERROR, str(err)))
-                raise err
\ No newline at end of file
+                raise err
+
+    async def get_invitation_status(self, interview_id: int) -> JSONResponse:
+        with self.tracer.start_as_current_span(
+                "TelegramHTTPController.get_invitation_status",
+                kind=SpanKind.INTERNAL,
+                attributes={"interview_id": interview_id}
+        ) as span:
+            try:
+                message = await self.telegram_dispatcher.get_delivery_status(interview_id)
+
+                span.set_status(Status(StatusCode.OK))
+                return JSONResponse(
+                    status_code=200,
+                    content=message.to_dict()
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
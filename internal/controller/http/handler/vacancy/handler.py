@@ -3,7 +3,7 @@ from fastapi import UploadFile, Form
 from fastapi.responses import JSONResponse
 
 from .model import *
-from internal import interface
+from internal import interface, model
 
 
 class VacancyController(interface.IVacancyController):
@@ -11,10 +11,12 @@ class VacancyController(interface.IVacancyController):
             self,
             tel: interface.ITelemetry,
             vacancy_service: interface.IVacancyService,
+            max_resume_files: int = 10,
     ):
         self.tracer = tel.tracer()
         self.logger = tel.logger()
         self.vacancy_service = vacancy_service
+        self.max_resume_files = max_resume_files
 
     async def create_vacancy(self, body: CreateVacancyBody) -> JSONResponse:
         with self.tracer.start_as_current_span(
@@ -59,6 +61,50 @@ class VacancyController(interface.IVacancyController):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    async def create_vacancy_bundle(self, body: CreateVacancyBundleBody) -> JSONResponse:
+        with self.tracer.start_as_current_span(
+                "VacancyController.create_vacancy_bundle",
+                kind=SpanKind.INTERNAL,
+        ) as span:
+            try:
+                self.logger.info("Начали создание вакансии вместе с весами и вопросами", {
+                    "vacancy_name": body.name,
+                    "skill_level": body.skill_lvl.value,
+                    "tags_count": len(body.tags),
+                    "questions_count": len(body.questions)
+                })
+
+                vacancy_id, question_ids = await self.vacancy_service.create_vacancy_bundle(
+                    name=body.name,
+                    tags=body.tags,
+                    description=body.description,
+                    red_flags=body.red_flags,
+                    skill_lvl=body.skill_lvl,
+                    interview_weights=model.NewInterviewWeights(**body.interview_weights.model_dump()),
+                    resume_weights=model.NewResumeWeights(**body.resume_weights.model_dump()),
+                    questions=[model.NewVacancyQuestion(**question.model_dump()) for question in body.questions]
+                )
+
+                self.logger.info("Создали вакансию вместе с весами и вопросами", {
+                    "vacancy_id": vacancy_id,
+                    "vacancy_name": body.name,
+                    "questions_count": len(question_ids)
+                })
+
+                span.set_status(Status(StatusCode.OK))
+                return JSONResponse(
+                    status_code=201,
+                    content={
+                        "vacancy_id": vacancy_id,
+                        "question_ids": question_ids
+                    }
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
     async def delete_vacancy(self, vacancy_id: int) -> JSONResponse:
         with self.tracer.start_as_current_span(
                 "VacancyController.delete_vacancy",
@@ -180,6 +226,42 @@ class VacancyController(interface.IVacancyController):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    async def add_questions(self, body: AddQuestionsBody) -> JSONResponse:
+        with self.tracer.start_as_current_span(
+                "VacancyController.add_questions",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": body.vacancy_id,
+                    "questions_count": len(body.questions)
+                }
+        ) as span:
+            try:
+                self.logger.info("Начали добавление вопросов", {
+                    "vacancy_id": body.vacancy_id,
+                    "questions_count": len(body.questions)
+                })
+
+                question_ids = await self.vacancy_service.add_questions(
+                    vacancy_id=body.vacancy_id,
+                    questions=[model.NewVacancyQuestion(**question.model_dump()) for question in body.questions]
+                )
+
+                self.logger.info("Добавили вопросы", {
+                    "vacancy_id": body.vacancy_id,
+                    "questions_count": len(question_ids)
+                })
+
+                span.set_status(Status(StatusCode.OK))
+                return JSONResponse(
+                    status_code=201,
+                    content={"question_ids": question_ids}
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
     async def edit_question(self, body: EditQuestionBody) -> JSONResponse:
         with self.tracer.start_as_current_span(
                 "VacancyController.edit_question",
@@ -440,7 +522,8 @@ class VacancyController(interface.IVacancyController):
                 attributes={
                     "vacancy_id": body.vacancy_id,
                     "questions_type": body.questions_type.value,
-                    "count_questions": body.count_questions
+                    "count_questions": body.count_questions,
+                    "sharded": body.sharded
                 }
         ) as span:
             try:
@@ -450,13 +533,15 @@ class VacancyController(interface.IVacancyController):
                 self.logger.info("Начали генерацию вопросов", {
                     "vacancy_id": body.vacancy_id,
                     "questions_type": body.questions_type.value,
-                    "count_questions": body.count_questions
+                    "count_questions": body.count_questions,
+                    "sharded": body.sharded
                 })
 
                 questions = await self.vacancy_service.generate_question(
                     vacancy_id=body.vacancy_id,
                     questions_type=body.questions_type,
-                    count_questions=body.count_questions
+                    count_questions=body.count_questions,
+                    sharded=body.sharded
                 )
 
                 # Конвертируем в словари для JSON ответа
@@ -494,7 +579,7 @@ class VacancyController(interface.IVacancyController):
                 }
         ) as span:
             try:
-                if len(candidate_resume_files) > 10:
+                if len(candidate_resume_files) > self.max_resume_files:
                     raise Exception("Too many files")
 
                 file_info = [
@@ -512,14 +597,14 @@ class VacancyController(interface.IVacancyController):
                     "files_info": file_info
                 })
 
-                created_interviews = await self.vacancy_service.evaluate_resume(
+                batch_result = await self.vacancy_service.evaluate_resume(
                     vacancy_id=vacancy_id,
                     candidate_resume_files=candidate_resume_files
                 )
 
                 # Формируем ответ согласно EvaluateResumeResponse
                 evaluation_resumes = []
-                for interview in created_interviews:
+                for interview in batch_result.interviews:
                     evaluation_resumes.append({
                         "candidate_email": interview.candidate_email,
                         "candidate_name": interview.candidate_name,
@@ -532,13 +617,19 @@ class VacancyController(interface.IVacancyController):
                     "vacancy_id": vacancy_id,
                     "total_resumes": len(candidate_resume_files),
                     "approved_resumes": len(evaluation_resumes),
+                    "duplicate_resumes": len(batch_result.duplicates),
+                    "prefilter": batch_result.prefilter.to_dict(),
                     "approval_rate": len(evaluation_resumes) / len(candidate_resume_files) if candidate_resume_files else 0
                 })
 
                 span.set_status(Status(StatusCode.OK))
                 return JSONResponse(
                     status_code=200,
-                    content={"evaluation_resumes": evaluation_resumes}
+                    content={
+                        "evaluation_resumes": evaluation_resumes,
+                        "duplicates": [duplicate.to_dict() for duplicate in batch_result.duplicates],
+                        "prefilter": batch_result.prefilter.to_dict()
+                    }
                 )
 
             except Exception as err:
@@ -612,6 +703,52 @@ class VacancyController(interface.IVacancyController):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    async def match_vacancies(
+            self,
+            candidate_resume_file: UploadFile = Form(...),
+            top_k: int = Form(5),
+            exclude_vacancy_id: int | None = Form(None)
+    ) -> JSONResponse:
+        with self.tracer.start_as_current_span(
+                "VacancyController.match_vacancies",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "top_k": top_k,
+                    "resume_filename": candidate_resume_file.filename
+                }
+        ) as span:
+            try:
+                if top_k < 1 or top_k > 100:
+                    raise Exception("top_k must be between 1 and 100")
+
+                self.logger.info("Начали подбор вакансий по резюме", {
+                    "resume_filename": candidate_resume_file.filename,
+                    "top_k": top_k,
+                    "exclude_vacancy_id": exclude_vacancy_id
+                })
+
+                matches = await self.vacancy_service.match_vacancies(
+                    candidate_resume_file=candidate_resume_file,
+                    top_k=top_k,
+                    exclude_vacancy_id=exclude_vacancy_id
+                )
+
+                self.logger.info("Подобрали вакансии по резюме", {
+                    "resume_filename": candidate_resume_file.filename,
+                    "matches_count": len(matches)
+                })
+
+                span.set_status(Status(StatusCode.OK))
+                return JSONResponse(
+                    status_code=200,
+                    content={"matches": [match.to_dict() for match in matches]}
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
     async def get_all_vacancy(self) -> JSONResponse:
         with self.tracer.start_as_current_span(
                 "VacancyController.get_all_vacancy",
@@ -638,6 +775,38 @@ class VacancyController(interface.IVacancyController):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    async def get_vacancies_page(self, limit: int = 20, cursor: str | None = None) -> JSONResponse:
+        with self.tracer.start_as_current_span(
+                "VacancyController.get_vacancies_page",
+                kind=SpanKind.INTERNAL,
+                attributes={"limit": limit}
+        ) as span:
+            try:
+                if limit < 1 or limit > 100:
+                    raise Exception("Limit must be between 1 and 100")
+
+                self.logger.info("Начали получение страницы вакансий", {"limit": limit})
+
+                vacancies, next_cursor = await self.vacancy_service.get_vacancies_page(limit, cursor)
+
+                self.logger.info("Получили страницу вакансий", {
+                    "vacancies_count": len(vacancies)
+                })
+
+                span.set_status(Status(StatusCode.OK))
+                return JSONResponse(
+                    status_code=200,
+                    content={
+                        "vacancies": [vacancy.to_dict() for vacancy in vacancies],
+                        "next_cursor": next_cursor
+                    }
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
     async def get_all_question(self, vacancy_id: int) -> JSONResponse:
         with self.tracer.start_as_current_span(
                 "VacancyController.get_all_question",
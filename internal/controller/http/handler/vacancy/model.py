@@ -10,6 +10,43 @@ class CreateVacancyBody(BaseModel):
     skill_lvl: model.SkillLevel
 
 
+class CreateVacancyBundleBody(BaseModel):
+    class InterviewWeights(BaseModel):
+        logic_structure_score_weight: int
+        soft_skill_score_weight: int
+        hard_skill_score_weight: int
+        accordance_xp_resume_score_weight: int
+        accordance_skill_resume_score_weight: int
+        red_flag_score_weight: int
+
+    class ResumeWeights(BaseModel):
+        accordance_xp_vacancy_score_threshold: int
+        accordance_skill_vacancy_score_threshold: int
+        recommendation_weight: int
+        portfolio_weight: int
+
+    class Question(BaseModel):
+        question: str
+        hint_for_evaluation: str
+        weight: int
+        question_type: model.QuestionsType
+        response_time: int
+
+    name: str
+    tags: list[str]
+    description: str
+    red_flags: str
+    skill_lvl: model.SkillLevel
+    interview_weights: InterviewWeights
+    resume_weights: ResumeWeights
+    questions: list[Question] = []
+
+
+class CreateVacancyBundleResponse(BaseModel):
+    vacancy_id: int
+    question_ids: list[int]
+
+
 class EditVacancyBody(BaseModel):
     vacancy_id: int
     name: str | None
@@ -28,6 +65,22 @@ class AddQuestionBody(BaseModel):
     response_time: int
 
 
+class AddQuestionsBody(BaseModel):
+    class Question(BaseModel):
+        question: str
+        hint_for_evaluation: str
+        weight: int
+        question_type: model.QuestionsType
+        response_time: int
+
+    vacancy_id: int
+    questions: list[Question]
+
+
+class AddQuestionsResponse(BaseModel):
+    question_ids: list[int]
+
+
 class EditQuestionBody(BaseModel):
     question_id: int
     vacancy_id: int
@@ -75,6 +128,7 @@ class GenerateQuestionBody(BaseModel):
     vacancy_id: int
     questions_type: model.QuestionsType
     count_questions: int
+    sharded: bool = False
 
 
 class GenerateQuestionResponse(BaseModel):
@@ -94,7 +148,30 @@ class EvaluateResumeResponse(BaseModel):
         accordance_xp_vacancy_score: int
         accordance_skill_vacancy_score: int
 
+    class DuplicateResume(BaseModel):
+        resume_filename: str
+        resume_hash: str
+        interview_id: int | None
+
+    class PrefilterStats(BaseModel):
+        checked: int
+        passed: int
+        rejected: int
+        deferred: int
+        pass_rate: float
+        llm_calls_saved: int
+
     evaluation_resumes: list[EvaluationResume]
+    duplicates: list[DuplicateResume]
+    prefilter: PrefilterStats
+
+class MatchVacanciesResponse(BaseModel):
+    class VacancyMatch(BaseModel):
+        vacancy_id: int
+        vacancy_name: str
+        score: float
+
+    matches: list[VacancyMatch]
 
 class RespondResponse(BaseModel):
     interview_link: str
@@ -102,6 +179,6 @@ class RespondResponse(BaseModel):
     accordance_skill_vacancy_score: int
     message_to_candidate: str
 
-
-
-
+class GetVacanciesPageResponse(BaseModel):
+    vacancies: list[model.VacancySummary]
+    next_cursor: str | None
@@ -15,11 +15,13 @@ class HttpMiddleware(interface.IHttpMiddleware):
     def __init__(
             self,
             tel: interface.ITelemetry,
+            db: interface.IDB,
             prefix: str,
     ):
         self.tracer = tel.tracer()
         self.meter = tel.meter()
         self.logger = tel.logger()
+        self.db = db
         self.prefix = prefix
 
     def trace_middleware01(self, app: FastAPI):
@@ -229,3 +231,13 @@ class HttpMiddleware(interface.IHttpMiddleware):
                 raise
 
         return _logger_middleware03
+
+    def db_middleware04(self, app: FastAPI):
+        @app.middleware("http")
+        async def _db_middleware04(request: Request, call_next: Callable):
+            # Свои записи запрос отслеживает с самого входа: обработчик и все запущенные им задачи,
+            # в том числе дочерние из asyncio.gather, отмечают запись в одном и том же месте
+            self.db.start_write_scope()
+            return await call_next(request)
+
+        return _db_middleware04
@@ -1,3 +1,7 @@
 from internal.interface.general import *
 from internal.interface.vacancy import *
-from internal.interface.interview import *
\ No newline at end of file
+from internal.interface.interview import *
+from internal.interface.resume import *
+from internal.interface.resume_job import *
+from internal.interface.telegram import *
+from internal.interface.migration import *
\ No newline at end of file
@@ -1,5 +1,6 @@
 import io
 from abc import abstractmethod
+from contextlib import AbstractAsyncContextManager
 from typing import Protocol, Sequence, Any
 
 from fastapi import FastAPI
@@ -53,6 +54,9 @@ class IHttpMiddleware(Protocol):
     @abstractmethod
     def logger_middleware03(self, app: FastAPI): pass
 
+    @abstractmethod
+    def db_middleware04(self, app: FastAPI): pass
+
 
 class IRedis(Protocol):
     @abstractmethod
@@ -86,6 +90,12 @@ class IEmailClient(Protocol):
             attachments: list[tuple] = None
     ) -> bool: pass
 
+    @abstractmethod
+    async def send_emails(self, emails: list[model.EmailMessage]) -> list[bool]: pass
+
+    @abstractmethod
+    async def close(self) -> None: pass
+
 class IDB(Protocol):
 
     @abstractmethod
@@ -103,6 +113,24 @@ class IDB(Protocol):
     @abstractmethod
     async def multi_query(self, queries: list[str]) -> None: pass
 
+    @abstractmethod
+    def transaction(self) -> AbstractAsyncContextManager[None]: pass
+
+    @abstractmethod
+    async def insert_many(self, query: str, query_params: list[dict]) -> list[int]: pass
+
+    @abstractmethod
+    async def copy_records(self, table: str, columns: list[str], records: list[tuple]) -> int: pass
+
+    @abstractmethod
+    async def autocommit_query(self, query: str) -> None: pass
+
+    @abstractmethod
+    def advisory_lock(self, key: int) -> AbstractAsyncContextManager[None]: pass
+
+    @abstractmethod
+    def start_write_scope(self) -> None: pass
+
 
 class ILLMClient(Protocol):
     @abstractmethod
@@ -157,6 +185,9 @@ class ITelegramClient(Protocol):
             text: str
     ): pass
 
+    @abstractmethod
+    async def import_phone_contacts(self, phones: list[str]) -> int: pass
+
 class ITelegramHTTPController(Protocol):
     @abstractmethod
     async def generate_qr_code(self) -> StreamingResponse:
@@ -170,3 +201,7 @@ class ITelegramHTTPController(Protocol):
     async def start_telegram_client(self) -> JSONResponse:
         pass
 
+    @abstractmethod
+    async def get_invitation_status(self, interview_id: int) -> JSONResponse:
+        pass
+
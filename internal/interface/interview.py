@@ -26,6 +26,34 @@ class IInterviewController(Protocol):
     @abstractmethod
     async def get_all_interview(self, vacancy_id: int) -> JSONResponse: pass
 
+    @abstractmethod
+    async def get_interviews_page(
+            self,
+            vacancy_id: int,
+            limit: int = 20,
+            cursor: str | None = None
+    ) -> JSONResponse:
+        pass
+
+    @abstractmethod
+    async def search_interviews(
+            self,
+            query: str,
+            vacancy_id: int | None = None,
+            limit: int = 20,
+            offset: int = 0
+    ) -> JSONResponse: pass
+
+    @abstractmethod
+    async def search_transcripts(
+            self,
+            query: str,
+            vacancy_id: int | None = None,
+            interview_id: int | None = None,
+            limit: int = 20,
+            offset: int = 0
+    ) -> JSONResponse: pass
+
     @abstractmethod
     async def get_interview_by_id(self, interview_id: int) -> JSONResponse:
         pass
@@ -33,6 +61,14 @@ class IInterviewController(Protocol):
     @abstractmethod
     async def get_interview_details(self, interview_id: int) -> JSONResponse: pass
 
+    @abstractmethod
+    async def get_interview_details_page(
+            self,
+            interview_id: int = Path(...),
+            after_question_id: int = 0,
+            limit: int = 20
+    ) -> JSONResponse: pass
+
     @abstractmethod
     async def download_audio(
             self,
@@ -63,6 +99,34 @@ class IInterviewService(Protocol):
 
     async def get_all_interview(self, vacancy_id: int) -> list[model.Interview]: pass
 
+    @abstractmethod
+    async def get_interviews_page(
+            self,
+            vacancy_id: int,
+            limit: int,
+            cursor: str | None = None
+    ) -> tuple[list[model.InterviewSummary], str | None]:
+        pass
+
+    @abstractmethod
+    async def search_interviews(
+            self,
+            query: str,
+            vacancy_id: int | None,
+            limit: int,
+            offset: int
+    ) -> tuple[int, list[model.InterviewSearchHit], int | None]: pass
+
+    @abstractmethod
+    async def search_transcripts(
+            self,
+            query: str,
+            vacancy_id: int | None,
+            interview_id: int | None,
+            limit: int,
+            offset: int
+    ) -> tuple[list[model.TranscriptMatch], int | None]: pass
+
     @abstractmethod
     async def get_interview_by_id(self, interview_id: int) -> model.Interview:
         pass
@@ -73,6 +137,14 @@ class IInterviewService(Protocol):
             interview_id: int
     ) -> tuple[list[model.CandidateAnswer], list[model.InterviewMessage]]: pass
 
+    @abstractmethod
+    async def get_interview_details_page(
+            self,
+            interview_id: int,
+            after_question_id: int,
+            limit: int
+    ) -> list[model.CandidateAnswerDetails]: pass
+
     @abstractmethod
     async def download_audio(self, audio_fid: str, audio_filename: str) -> tuple[io.BytesIO, str]: pass
 
@@ -166,6 +238,23 @@ class IInterviewRepo(Protocol):
     async def get_all_interview(self, vacancy_id: int) -> list[model.Interview]:
         pass
 
+    @abstractmethod
+    async def get_interviews_page(
+            self,
+            vacancy_id: int,
+            limit: int,
+            cursor: model.PageCursor | None = None
+    ) -> list[model.InterviewSummary]:
+        pass
+
+    @abstractmethod
+    async def get_evaluated_interviews_batch(self, after_interview_id: int, limit: int) -> list[model.Interview]:
+        pass
+
+    @abstractmethod
+    async def get_interviews_by_ids(self, interview_ids: list[int]) -> list[model.Interview]:
+        pass
+
     @abstractmethod
     async def get_all_candidate_answer(self, interview_id: int) -> list[model.CandidateAnswer]:
         pass
@@ -174,6 +263,46 @@ class IInterviewRepo(Protocol):
     async def get_interview_messages(self, interview_id: int) -> list[model.InterviewMessage]:
         pass
 
+    @abstractmethod
+    async def get_interview_details_page(
+            self,
+            interview_id: int,
+            after_question_id: int,
+            limit: int
+    ) -> list[model.CandidateAnswerDetails]:
+        pass
+
+    @abstractmethod
+    async def search_interview_messages(
+            self,
+            query: str,
+            vacancy_id: int | None,
+            interview_id: int | None,
+            limit: int,
+            offset: int
+    ) -> list[model.TranscriptMatch]:
+        pass
+
+
+class IInterviewSearchIndex(Protocol):
+    @abstractmethod
+    def is_stale(self, ttl: float) -> bool: pass
+
+    @abstractmethod
+    def build(self, interviews: list[model.Interview], started_at: float) -> None: pass
+
+    @abstractmethod
+    def upsert(self, interview: model.Interview) -> None: pass
+
+    @abstractmethod
+    def search(
+            self,
+            query: str,
+            vacancy_id: int | None,
+            limit: int,
+            offset: int
+    ) -> tuple[int, list[tuple[int, float]]]: pass
+
 
 class IInterviewPromptGenerator(Protocol):
     @abstractmethod
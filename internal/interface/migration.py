@@ -0,0 +1,24 @@
+from abc import abstractmethod
+from contextlib import AbstractAsyncContextManager
+from typing import Protocol
+
+from internal import model
+
+
+class IMigrationService(Protocol):
+    @abstractmethod
+    async def migrate(self) -> None: pass
+
+
+class IMigrationRepo(Protocol):
+    @abstractmethod
+    def lock(self) -> AbstractAsyncContextManager[None]: pass
+
+    @abstractmethod
+    async def create_version_table(self) -> None: pass
+
+    @abstractmethod
+    async def get_applied_versions(self) -> set[int]: pass
+
+    @abstractmethod
+    async def apply_migration(self, migration: model.Migration) -> None: pass
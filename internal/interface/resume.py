@@ -0,0 +1,53 @@
+from abc import abstractmethod
+from typing import Protocol
+
+from internal import model
+
+
+class IResumePrefilter(Protocol):
+    min_score: float
+    mode: model.ResumePrefilterMode
+
+    @abstractmethod
+    async def check(self, resume_content: bytes, vacancy: model.Vacancy) -> model.ResumePrefilterResult: pass
+
+
+class IResumeRepo(Protocol):
+    @abstractmethod
+    async def claim_resume_hash(self, vacancy_id: int, resume_hash: str) -> model.ResumeScreeningClaim | None: pass
+
+    @abstractmethod
+    async def complete_resume_screening(
+            self,
+            vacancy_id: int,
+            resume_hash: str,
+            passed: bool,
+            interview_id: int | None
+    ) -> None: pass
+
+    @abstractmethod
+    async def release_resume_hash(self, claim: model.ResumeScreeningClaim) -> None: pass
+
+    @abstractmethod
+    async def get_resume_screening_entry(
+            self,
+            vacancy_id: int,
+            resume_hash: str
+    ) -> list[model.ResumeScreeningIndexEntry]: pass
+
+    @abstractmethod
+    async def create_candidate_profile(
+            self,
+            resume_hash: str,
+            candidate_name: str,
+            candidate_email: str,
+            candidate_phone: str,
+            candidate_telegram_login: str,
+            skills: list[str],
+            experience_years: float,
+            summary: str,
+            profile: dict
+    ) -> int: pass
+
+    @abstractmethod
+    async def get_candidate_profile(self, resume_hash: str) -> list[model.CandidateProfile]: pass
@@ -0,0 +1,124 @@
+from abc import abstractmethod
+from typing import Protocol, AsyncIterator
+
+from fastapi import UploadFile, Form, Path
+from fastapi.responses import JSONResponse
+from starlette.responses import StreamingResponse
+
+from internal import model
+
+
+class IResumeJobController(Protocol):
+    @abstractmethod
+    async def create_job(
+            self,
+            vacancy_id: int = Form(...),
+            candidate_resume_files: list[UploadFile] = Form(...)
+    ) -> JSONResponse: pass
+
+    @abstractmethod
+    async def get_job(self, job_id: int = Path(...)) -> JSONResponse: pass
+
+    @abstractmethod
+    async def stream_job(self, job_id: int = Path(...)) -> StreamingResponse: pass
+
+    @abstractmethod
+    async def respond_async(
+            self,
+            vacancy_id: int = Form(...),
+            candidate_email: str = Form(...),
+            candidate_resume_file: UploadFile = Form(...)
+    ) -> JSONResponse: pass
+
+    @abstractmethod
+    async def get_application(self, application_id: int = Path(...)) -> JSONResponse: pass
+
+
+class IResumeJobService(Protocol):
+    @abstractmethod
+    async def create_job(self, vacancy_id: int, candidate_resume_files: list[UploadFile]) -> int: pass
+
+    @abstractmethod
+    async def get_job(self, job_id: int) -> tuple[model.ResumeEvaluationJob, list[model.ResumeEvaluationJobFile]]: pass
+
+    @abstractmethod
+    def watch_job(self, job_id: int) -> AsyncIterator[model.ResumeEvaluationJob]: pass
+
+    @abstractmethod
+    async def resume_unfinished_jobs(self) -> None: pass
+
+    @abstractmethod
+    def start(self) -> None: pass
+
+    @abstractmethod
+    async def stop(self) -> None: pass
+
+    @abstractmethod
+    async def create_application(self, vacancy_id: int, candidate_resume_file: UploadFile) -> int: pass
+
+    @abstractmethod
+    async def get_application(
+            self,
+            application_id: int
+    ) -> tuple[model.ResumeEvaluationJob, model.ResumeEvaluationJobFile]: pass
+
+
+class IResumeJobRepo(Protocol):
+    @abstractmethod
+    async def create_job(self, vacancy_id: int, total_files: int, invite_candidates: bool = False) -> int: pass
+
+    @abstractmethod
+    async def create_job_file(
+            self,
+            job_id: int,
+            resume_fid: str,
+            resume_filename: str,
+            status: model.ResumeJobFileStatus = model.ResumeJobFileStatus.PENDING,
+            interview_id: int | None = None,
+    ) -> int: pass
+
+    @abstractmethod
+    async def create_job_files(
+            self,
+            job_id: int,
+            job_files: list[tuple[str, str, model.ResumeJobFileStatus, int | None]],
+    ) -> None: pass
+
+    @abstractmethod
+    async def update_job_file_result(
+            self,
+            job_file_id: int,
+            status: model.ResumeJobFileStatus,
+            interview_id: int | None = None,
+            candidate_name: str = "",
+            candidate_email: str = "",
+            candidate_phone: str = "",
+            accordance_xp_vacancy_score: int = 0,
+            accordance_skill_vacancy_score: int = 0,
+            message_to_candidate: str = "",
+            error: str = "",
+    ) -> None: pass
+
+    @abstractmethod
+    async def get_job_by_id(self, job_id: int) -> list[model.ResumeEvaluationJob]: pass
+
+    @abstractmethod
+    async def claim_unfinished_jobs(self, limit: int) -> list[model.ResumeEvaluationJob]: pass
+
+    @abstractmethod
+    async def claim_job(self, job_id: int) -> bool: pass
+
+    @abstractmethod
+    async def claim_job_files(self, job_id: int, limit: int) -> list[model.ResumeEvaluationJobFile]: pass
+
+    @abstractmethod
+    async def touch_job(self, job_id: int) -> None: pass
+
+    @abstractmethod
+    async def release_job(self, job_id: int) -> None: pass
+
+    @abstractmethod
+    async def finish_job(self, job_id: int) -> bool: pass
+
+    @abstractmethod
+    async def get_job_files(self, job_id: int) -> list[model.ResumeEvaluationJobFile]: pass
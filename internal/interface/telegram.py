@@ -0,0 +1,68 @@
+from abc import abstractmethod
+from datetime import timedelta
+from typing import Protocol
+
+from internal import model
+
+
+class ITelegramDispatcher(Protocol):
+    @abstractmethod
+    async def enqueue_message(
+            self,
+            interview_id: int,
+            candidate_telegram_login: str,
+            candidate_phone: str,
+            text: str
+    ) -> None: pass
+
+    @abstractmethod
+    async def get_delivery_status(self, interview_id: int) -> model.TelegramOutboxMessage: pass
+
+    @abstractmethod
+    def start(self) -> None: pass
+
+    @abstractmethod
+    async def stop(self) -> None: pass
+
+
+class ITelegramOutboxRepo(Protocol):
+    @abstractmethod
+    async def enqueue_message(
+            self,
+            interview_id: int,
+            candidate_telegram_login: str,
+            candidate_phone: str,
+            text: str
+    ) -> int | None: pass
+
+    @abstractmethod
+    async def claim_due_messages(self, limit: int) -> list[model.TelegramOutboxMessage]: pass
+
+    @abstractmethod
+    async def mark_sent(self, message_id: int, delivered_via: str) -> None: pass
+
+    @abstractmethod
+    async def reschedule(
+            self,
+            message_id: int,
+            delay: timedelta,
+            last_error: str,
+            count_attempt: bool = True
+    ) -> None: pass
+
+    @abstractmethod
+    async def mark_failed(self, message_id: int, last_error: str) -> None: pass
+
+    @abstractmethod
+    async def get_message_by_interview_id(self, interview_id: int) -> list[model.TelegramOutboxMessage]: pass
+
+
+class ITelegramEntityRepo(Protocol):
+    @abstractmethod
+    async def get_entities_by_owner(self, owner_id: int) -> list[model.TelegramEntity]: pass
+
+    @abstractmethod
+    async def upsert_entities(self, owner_id: int, entities: dict[str, tuple[int, int]]) -> None: pass
+
+    @abstractmethod
+    async def delete_entity(self, owner_id: int, key: str) -> None: pass
@@ -11,6 +11,9 @@ class IVacancyController(Protocol):
     @abstractmethod
     async def create_vacancy(self, body: CreateVacancyBody) -> JSONResponse: pass
 
+    @abstractmethod
+    async def create_vacancy_bundle(self, body: CreateVacancyBundleBody) -> JSONResponse: pass
+
     @abstractmethod
     async def delete_vacancy(self, vacancy_id: int) -> JSONResponse: pass
 
@@ -20,6 +23,9 @@ class IVacancyController(Protocol):
     @abstractmethod
     async def add_question(self, body: AddQuestionBody) -> JSONResponse: pass
 
+    @abstractmethod
+    async def add_questions(self, body: AddQuestionsBody) -> JSONResponse: pass
+
     @abstractmethod
     async def edit_question(self, body: EditQuestionBody) -> JSONResponse: pass
 
@@ -51,6 +57,14 @@ class IVacancyController(Protocol):
             candidate_resume_files: list[UploadFile] = Form(...)
     ) -> JSONResponse: pass
 
+    @abstractmethod
+    async def match_vacancies(
+            self,
+            candidate_resume_file: UploadFile = Form(...),
+            top_k: int = Form(5),
+            exclude_vacancy_id: int | None = Form(None)
+    ) -> JSONResponse: pass
+
     @abstractmethod
     async def respond(
             self,
@@ -63,6 +77,9 @@ class IVacancyController(Protocol):
     @abstractmethod
     async def get_all_vacancy(self) -> JSONResponse: pass
 
+    @abstractmethod
+    async def get_vacancies_page(self, limit: int = 20, cursor: str | None = None) -> JSONResponse: pass
+
     @abstractmethod
     async def get_all_question(self, vacancy_id: int) -> JSONResponse: pass
 
@@ -89,6 +106,19 @@ class IVacancyService(Protocol):
             skill_lvl: model.SkillLevel,
     ) -> int: pass
 
+    @abstractmethod
+    async def create_vacancy_bundle(
+            self,
+            name: str,
+            tags: list[str],
+            description: str,
+            red_flags: str,
+            skill_lvl: model.SkillLevel,
+            interview_weights: model.NewInterviewWeights,
+            resume_weights: model.NewResumeWeights,
+            questions: list[model.NewVacancyQuestion],
+    ) -> tuple[int, list[int]]: pass
+
     @abstractmethod
     async def delete_vacancy(self, vacancy_id: int) -> None: pass
 
@@ -114,6 +144,13 @@ class IVacancyService(Protocol):
             response_time: int,
     ) -> int: pass
 
+    @abstractmethod
+    async def add_questions(
+            self,
+            vacancy_id: int,
+            questions: list[model.NewVacancyQuestion],
+    ) -> list[int]: pass
+
     @abstractmethod
     async def edit_question(
             self,
@@ -181,11 +218,33 @@ class IVacancyService(Protocol):
             vacancy_id: int,
             questions_type: model.QuestionsType,
             count_questions: int,
+            sharded: bool = False,
     ) -> list[model.VacancyQuestion]: pass
 
     @abstractmethod
-    async def evaluate_resume(self, vacancy_id: int, candidate_resume_files: list[UploadFile]) -> list[
-        model.Interview]: pass
+    async def evaluate_resume(
+            self,
+            vacancy_id: int,
+            candidate_resume_files: list[UploadFile]
+    ) -> model.ResumeBatchResult: pass
+
+    @abstractmethod
+    async def match_vacancies(
+            self,
+            candidate_resume_file: UploadFile,
+            top_k: int,
+            exclude_vacancy_id: int | None = None
+    ) -> list[model.VacancyMatch]: pass
+
+    @abstractmethod
+    async def screen_resume(
+            self,
+            vacancy_id: int,
+            resume_filename: str,
+            resume_content: bytes,
+            candidate_resume_fid: str | None = None,
+            invite_candidate: bool = False
+    ) -> model.ResumeScreening: pass
 
     @abstractmethod
     async def respond(
@@ -199,6 +258,13 @@ class IVacancyService(Protocol):
     @abstractmethod
     async def get_all_vacancy(self) -> list[model.Vacancy]: pass
 
+    @abstractmethod
+    async def get_vacancies_page(
+            self,
+            limit: int,
+            cursor: str | None = None
+    ) -> tuple[list[model.VacancySummary], str | None]: pass
+
     @abstractmethod
     async def get_all_question(self, vacancy_id: int) -> list[model.VacancyQuestion]: pass
 
@@ -225,6 +291,19 @@ class IVacancyRepo(Protocol):
             skill_lvl: model.SkillLevel,
     ) -> int: pass
 
+    @abstractmethod
+    async def create_vacancy_bundle(
+            self,
+            name: str,
+            tags: list[str],
+            description: str,
+            red_flags: str,
+            skill_lvl: model.SkillLevel,
+            interview_weights: model.NewInterviewWeights,
+            resume_weights: model.NewResumeWeights,
+            questions: list[model.NewVacancyQuestion],
+    ) -> tuple[int, list[int]]: pass
+
     @abstractmethod
     async def delete_vacancy(self, vacancy_id: int) -> None: pass
 
@@ -250,6 +329,13 @@ class IVacancyRepo(Protocol):
             response_time: int,
     ) -> int: pass
 
+    @abstractmethod
+    async def add_questions(
+            self,
+            vacancy_id: int,
+            questions: list[model.NewVacancyQuestion],
+    ) -> list[int]: pass
+
     @abstractmethod
     async def edit_question(
             self,
@@ -314,6 +400,13 @@ class IVacancyRepo(Protocol):
     @abstractmethod
     async def get_all_vacancy(self) -> list[model.Vacancy]: pass
 
+    @abstractmethod
+    async def get_vacancies_page(
+            self,
+            limit: int,
+            cursor: model.PageCursor | None = None
+    ) -> list[model.VacancySummary]: pass
+
     @abstractmethod
     async def get_all_question(self, vacancy_id: int) -> list[model.VacancyQuestion]: pass
 
@@ -327,6 +420,18 @@ class IVacancyRepo(Protocol):
     async def get_resume_weights(self, vacancy_id: int) -> list[model.ResumeWeights]: pass
 
 
+class IVacancyMatcher(Protocol):
+    @abstractmethod
+    def is_stale(self, ttl: float) -> bool: pass
+
+    @abstractmethod
+    def build(self, vacancies: list[model.Vacancy]) -> None: pass
+
+    @abstractmethod
+    def rank(self, resume_text: str, top_k: int, exclude_vacancy_id: int | None = None) -> list[
+        model.VacancyMatch]: pass
+
+
 class IVacancyPromptGenerator(Protocol):
     @abstractmethod
     def get_question_generation_prompt(
@@ -334,10 +439,14 @@ class IVacancyPromptGenerator(Protocol):
             vacancy: model.Vacancy,
             count_questions: int,
             questions_type: model.QuestionsType,
+            focus_topics: list[str] | None = None,
     ) -> str: pass
 
     @abstractmethod
-    def get_resume_evaluation_system_prompt(
+    def get_candidate_profile_extraction_system_prompt(self) -> str: pass
+
+    @abstractmethod
+    def get_profile_matching_system_prompt(
             self,
             vacancy_description: str,
             vacancy_red_flags: str,
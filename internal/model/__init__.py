@@ -1,5 +1,7 @@
 from internal.model.sql_model import *
+from internal.model.sql_migration import *
 from internal.model.general import *
 from internal.model.vacancy import *
 from internal.model.telegram import *
-from internal.model.interview import *
\ No newline at end of file
+from internal.model.interview import *
+from internal.model.resume import *
\ No newline at end of file
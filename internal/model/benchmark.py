@@ -0,0 +1,148 @@
+"""Сравнение serialize() через RowMapper со старым построением моделей по row.<колонка>.
+
+База не нужна: строки собираются в памяти в том же виде, что отдают PG и NativePG.
+
+    python -m internal.model.benchmark --rows 10000 --repeat 20
+"""
+import argparse
+import dataclasses
+import gc
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime
+
+from internal import model
+
+
+def legacy_model(model_class: type) -> type:
+    # Та же модель без slots: у каждого экземпляра свой __dict__
+    return dataclasses.make_dataclass(
+        f"Legacy{model_class.__name__}",
+        [(field.name, field.type) for field in dataclasses.fields(model_class)]
+    )
+
+
+def legacy_interviews(model_class: type, rows) -> list:
+    # Interview.serialize до RowMapper
+    return [
+        model_class(
+            id=row.id,
+            vacancy_id=row.vacancy_id,
+            candidate_name=row.candidate_name,
+            candidate_telegram_login=row.candidate_telegram_login,
+            candidate_phone=row.candidate_phone,
+            candidate_email=row.candidate_email,
+            candidate_resume_fid=row.candidate_resume_fid,
+            candidate_resume_filename=row.candidate_resume_filename,
+            accordance_xp_vacancy_score=row.accordance_xp_vacancy_score,
+            accordance_skill_vacancy_score=row.accordance_skill_vacancy_score,
+            red_flag_score=row.red_flag_score,
+            hard_skill_score=row.hard_skill_score,
+            soft_skill_score=row.soft_skill_score,
+            logic_structure_score=row.logic_structure_score,
+            accordance_xp_resume_score=row.accordance_xp_resume_score,
+            accordance_skill_resume_score=row.accordance_skill_resume_score,
+            strong_areas=row.strong_areas,
+            weak_areas=row.weak_areas,
+            approved_skills=row.approved_skills,
+            general_score=row.general_score,
+            general_result=model.GeneralResult(row.general_result),
+            message_to_candidate=row.message_to_candidate,
+            message_to_hr=row.message_to_hr,
+            created_at=row.created_at
+        )
+        for row in rows
+    ]
+
+
+def legacy_messages(model_class: type, rows) -> list:
+    # InterviewMessage.serialize до RowMapper
+    return [
+        model_class(
+            id=row.id,
+            interview_id=row.interview_id,
+            question_id=row.question_id,
+            audio_name=row.audio_name,
+            audio_fid=row.audio_fid,
+            role=row.role,
+            text=row.text,
+            created_at=row.created_at,
+        ) for row in rows
+    ]
+
+
+def interview_rows(count: int) -> list:
+    columns = [field.name for field in dataclasses.fields(model.Interview)]
+    row_type = namedtuple("Row", columns)
+    now = datetime.now()
+    values = {
+        "approved_skills": ["python", "sql"],
+        "general_score": 0.75,
+        "general_result": model.GeneralResult.NEXT.value,
+        "created_at": now,
+    }
+    return [
+        row_type(*[i if column == "id" else values.get(column, f"{column}-{i}") for column in columns])
+        for i in range(count)
+    ]
+
+
+def message_rows(count: int) -> list:
+    columns = [field.name for field in dataclasses.fields(model.InterviewMessage)]
+    row_type = namedtuple("Row", columns)
+    now = datetime.now()
+    return [
+        row_type(i, 1, i // 4, f"audio-{i}.ogg", f"3,{i:08x}", "candidate", "Ответ кандидата " * 10, now)
+        for i in range(count)
+    ]
+
+
+def measure(serialize, rows, repeat: int) -> tuple[float, float]:
+    gc.collect()
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        serialize(rows)
+    elapsed = (time.perf_counter() - started_at) / repeat
+
+    tracemalloc.start()
+    instances = serialize(rows)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return elapsed, allocated / len(rows)
+
+
+def report(name: str, rows_count: int, elapsed: float, bytes_per_row: float) -> None:
+    print(
+        f"{name:<28} "
+        f"{rows_count / elapsed:>12.0f} rows/s "
+        f"{elapsed * 1e3:>10.2f} ms "
+        f"{bytes_per_row:>8.0f} B/row"
+    )
+
+
+def main(rows_count: int, repeat: int) -> None:
+    cases = {
+        "interview": (model.Interview, legacy_interviews, interview_rows(rows_count)),
+        "interview_message": (model.InterviewMessage, legacy_messages, message_rows(rows_count)),
+    }
+
+    print(f"rows={rows_count} repeat={repeat}")
+    for case_name, (model_class, legacy_serialize, rows) in cases.items():
+        legacy_class = legacy_model(model_class)
+        report(
+            f"{case_name}/legacy",
+            rows_count,
+            *measure(lambda rows: legacy_serialize(legacy_class, rows), rows, repeat)
+        )
+        report(f"{case_name}/row_mapper", rows_count, *measure(model_class.serialize, rows, repeat))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    main(args.rows, args.repeat)
@@ -1,4 +1,6 @@
+import base64
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Optional
 
 
@@ -10,4 +12,32 @@ class AsyncWeedOperationResponse:
     headers: dict
     fid: Optional[str] = None
     url: Optional[str] = None
-    size: Optional[int] = None
\ No newline at end of file
+    size: Optional[int] = None
+
+@dataclass
+class EmailMessage:
+    to_email: str
+    subject: str
+    body: str
+    is_html: bool = True
+    attachments: Optional[list[tuple]] = None
+
+
+@dataclass
+class PageCursor:
+    """Последняя отданная строка списка, отсортированного по (created_at, id) по убыванию"""
+    created_at: datetime
+    id: int
+
+    def encode(self) -> str:
+        raw = f"{self.created_at.isoformat()}|{self.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> 'PageCursor':
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            created_at, row_id = raw.split("|")
+            return cls(created_at=datetime.fromisoformat(created_at), id=int(row_id))
+        except Exception:
+            raise Exception("Invalid page cursor")
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
+from internal.model.row_mapper import RowMapper, json_value
+
 
 class GeneralResult(Enum):
     NEXT = "next"
@@ -11,7 +13,7 @@ class GeneralResult(Enum):
 
 
 
-@dataclass
+@dataclass(slots=True)
 class Interview:
     id: int
     vacancy_id: int
@@ -42,37 +44,7 @@ class Interview:
 
     created_at: datetime
 
-    @classmethod
-    def serialize(cls, rows) -> list['Interview']:
-        return [
-            cls(
-                id=row.id,
-                vacancy_id=row.vacancy_id,
-                candidate_name=row.candidate_name,
-                candidate_telegram_login=row.candidate_telegram_login,
-                candidate_phone=row.candidate_phone,
-                candidate_email=row.candidate_email,
-                candidate_resume_fid=row.candidate_resume_fid,
-                candidate_resume_filename=row.candidate_resume_filename,
-                accordance_xp_vacancy_score=row.accordance_xp_vacancy_score,
-                accordance_skill_vacancy_score=row.accordance_skill_vacancy_score,
-                red_flag_score=row.red_flag_score,
-                hard_skill_score=row.hard_skill_score,
-                soft_skill_score=row.soft_skill_score,
-                logic_structure_score=row.logic_structure_score,
-                accordance_xp_resume_score=row.accordance_xp_resume_score,
-                accordance_skill_resume_score=row.accordance_skill_resume_score,
-                strong_areas=row.strong_areas,
-                weak_areas=row.weak_areas,
-                approved_skills=row.approved_skills,
-                general_score=row.general_score,
-                general_result=GeneralResult(row.general_result),
-                message_to_candidate=row.message_to_candidate,
-                message_to_hr=row.message_to_hr,
-                created_at=row.created_at
-            )
-            for row in rows
-        ]
+    serialize = RowMapper(general_result=GeneralResult)
 
     def to_dict(self):
         return {
@@ -103,7 +75,39 @@ class Interview:
         }
 
 
-@dataclass
+@dataclass(slots=True)
+class InterviewSummary:
+    """Интервью для списка: без выводов, сообщений кандидату/HR и оценок по критериям"""
+    id: int
+    vacancy_id: int
+
+    candidate_name: str
+    candidate_email: str
+    candidate_phone: str
+    candidate_telegram_login: str
+
+    general_score: float
+    general_result: GeneralResult
+
+    created_at: datetime
+
+    serialize = RowMapper(general_result=GeneralResult)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "vacancy_id": self.vacancy_id,
+            "candidate_name": self.candidate_name,
+            "candidate_email": self.candidate_email,
+            "candidate_phone": self.candidate_phone,
+            "candidate_telegram_login": self.candidate_telegram_login,
+            "general_score": self.general_score,
+            "general_result": self.general_result.value,
+            "created_at": self.created_at.isoformat()
+        }
+
+
+@dataclass(slots=True)
 class CandidateAnswer:
     id: int
     question_id: int
@@ -116,22 +120,7 @@ class CandidateAnswer:
 
     created_at: datetime
 
-    @classmethod
-    def serialize(cls, rows) -> list['CandidateAnswer']:
-        return [
-            cls(
-                id=row.id,
-                question_id=row.question_id,
-                interview_id=row.interview_id,
-                response_time=row.response_time,
-                message_ids=row.message_ids,
-                message_to_candidate=row.message_to_candidate,
-                message_to_hr=row.message_to_hr,
-                score=row.score,
-                created_at=row.created_at
-            )
-            for row in rows
-        ]
+    serialize = RowMapper()
 
     def to_dict(self) -> dict:
         return {
@@ -147,7 +136,7 @@ class CandidateAnswer:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class InterviewMessage:
     id: int
     interview_id: int
@@ -160,20 +149,7 @@ class InterviewMessage:
 
     created_at: datetime
 
-    @classmethod
-    def serialize(cls, rows) -> list:
-        return [
-            cls(
-                id=row.id,
-                interview_id=row.interview_id,
-                question_id=row.question_id,
-                audio_name=row.audio_name,
-                audio_fid=row.audio_fid,
-                role=row.role,
-                text=row.text,
-                created_at=row.created_at,
-            ) for row in rows
-        ]
+    serialize = RowMapper()
 
     def to_dict(self) -> dict:
         return {
@@ -186,3 +162,97 @@ class InterviewMessage:
             "text": self.text,
             "created_at": self.created_at.isoformat()
         }
+
+
+def _interview_messages(messages) -> list[InterviewMessage]:
+    # Сообщения ответа приходят одной json-колонкой, собранной json_agg
+    return [
+        InterviewMessage(
+            id=message["id"],
+            interview_id=message["interview_id"],
+            question_id=message["question_id"],
+            audio_name=message["audio_name"],
+            audio_fid=message["audio_fid"],
+            role=message["role"],
+            text=message["text"],
+            created_at=datetime.fromisoformat(message["created_at"]),
+        )
+        for message in json_value(messages)
+    ]
+
+
+@dataclass(slots=True)
+class CandidateAnswerDetails:
+    id: int
+    question_id: int
+    interview_id: int
+    response_time: int
+    message_ids: list[int]
+    message_to_candidate: str
+    message_to_hr: str
+    score: int
+    messages: list[InterviewMessage]
+
+    created_at: datetime
+
+    serialize = RowMapper(messages=_interview_messages)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "question_id": self.question_id,
+            "interview_id": self.interview_id,
+            "response_time": self.response_time,
+            "message_ids": self.message_ids,
+            "message_to_candidate": self.message_to_candidate,
+            "message_to_hr": self.message_to_hr,
+            "score": self.score,
+            "messages": [message.to_dict() for message in self.messages],
+            "created_at": self.created_at.isoformat()
+        }
+
+
+@dataclass
+class InterviewSearchHit:
+    interview: Interview
+    score: float
+
+    def to_dict(self) -> dict:
+        return {
+            "interview": self.interview.to_dict(),
+            "score": self.score,
+        }
+
+
+@dataclass(slots=True)
+class TranscriptMatch:
+    message_id: int
+    interview_id: int
+    question_id: int
+    vacancy_id: int
+    candidate_name: str
+
+    role: str
+    audio_fid: str
+    audio_name: str
+    snippet: str
+    rank: float
+
+    created_at: datetime
+
+    serialize = RowMapper()
+
+    def to_dict(self) -> dict:
+        return {
+            "message_id": self.message_id,
+            "interview_id": self.interview_id,
+            "question_id": self.question_id,
+            "vacancy_id": self.vacancy_id,
+            "candidate_name": self.candidate_name,
+            "role": self.role,
+            "audio_fid": self.audio_fid,
+            "audio_name": self.audio_name,
+            "snippet": self.snippet,
+            "rank": self.rank,
+            "created_at": self.created_at.isoformat()
+        }
@@ -0,0 +1,224 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+
+from internal.model.interview import Interview
+from internal.model.row_mapper import RowMapper, json_value
+
+
+class ResumeJobStatus(Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+
+
+class ResumeJobFileStatus(Enum):
+    PENDING = "pending"
+    # Файл взял в работу один из экземпляров сервиса
+    PROCESSING = "processing"
+    PASSED = "passed"
+    REJECTED = "rejected"
+    FAILED = "failed"
+    DUPLICATE = "duplicate"
+
+
+class ResumePrefilterMode(Enum):
+    REJECT = "reject"
+    DEPRIORITIZE = "deprioritize"
+
+
+@dataclass
+class ResumePrefilterResult:
+    score: float
+    passed: bool
+    has_text: bool
+    matched_tags: list[str]
+
+
+@dataclass
+class ResumePrefilterStats:
+    checked: int
+    passed: int
+    rejected: int
+    deferred: int
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passed / self.checked if self.checked else 1.0
+
+    def to_dict(self) -> dict:
+        return {
+            "checked": self.checked,
+            "passed": self.passed,
+            "rejected": self.rejected,
+            "deferred": self.deferred,
+            "pass_rate": self.pass_rate,
+            # В режиме reject каждое отсеянное резюме - несделанный вызов LLM
+            "llm_calls_saved": self.rejected
+        }
+
+
+@dataclass
+class ResumeScreening:
+    resume_filename: str
+    passed: bool
+
+    candidate_name: str
+    candidate_email: str
+    candidate_phone: str
+    candidate_telegram_login: str
+    accordance_xp_vacancy_score: int
+    accordance_skill_vacancy_score: int
+    message_to_candidate: str
+    message_to_hr: str
+
+    interview: Interview | None
+
+    # Резюме с таким же содержимым уже оценивалось по этой вакансии
+    duplicate: bool = False
+    duplicate_interview_id: int | None = None
+
+    # Скор локального префильтра, None если префильтр не применялся
+    prefilter_score: float | None = None
+
+
+@dataclass
+class ResumeDuplicate:
+    resume_filename: str
+    resume_hash: str
+    interview_id: int | None
+
+    def to_dict(self) -> dict:
+        return {
+            "resume_filename": self.resume_filename,
+            "resume_hash": self.resume_hash,
+            "interview_id": self.interview_id
+        }
+
+
+@dataclass
+class ResumeBatchResult:
+    interviews: list[Interview]
+    duplicates: list[ResumeDuplicate]
+    process_errors: list[dict]
+    prefilter: ResumePrefilterStats
+
+
+@dataclass(slots=True)
+class ResumeScreeningIndexEntry:
+    id: int
+    vacancy_id: int
+    resume_hash: str
+    interview_id: int | None
+    passed: bool | None
+
+    claimed_at: datetime
+    created_at: datetime
+
+    serialize = RowMapper()
+
+
+@dataclass(slots=True)
+class ResumeScreeningClaim:
+    """Захват хэша резюме. По id и claimed_at его не спутать с более поздним перехватом того же хэша"""
+    id: int
+    vacancy_id: int
+    resume_hash: str
+    claimed_at: datetime
+
+    serialize = RowMapper()
+
+
+@dataclass(slots=True)
+class CandidateProfile:
+    id: int
+    resume_hash: str
+
+    candidate_name: str
+    candidate_email: str
+    candidate_phone: str
+    candidate_telegram_login: str
+    skills: list[str]
+    experience_years: float
+    summary: str
+
+    # Полный профиль в том виде, в каком его вернула LLM
+    profile: dict
+
+    created_at: datetime
+
+    serialize = RowMapper(profile=json_value)
+
+    def to_prompt_text(self) -> str:
+        return json.dumps(self.profile, ensure_ascii=False, indent=2)
+
+
+@dataclass(slots=True)
+class ResumeEvaluationJob:
+    id: int
+    vacancy_id: int
+    status: ResumeJobStatus
+    total_files: int
+    processed_files: int
+    # Отклик кандидата через быстрый режим: по итогам оценки сами отправляем приглашение
+    invite_candidates: bool
+
+    created_at: datetime
+    updated_at: datetime
+
+    serialize = RowMapper(status=ResumeJobStatus)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "vacancy_id": self.vacancy_id,
+            "status": self.status.value,
+            "total_files": self.total_files,
+            "processed_files": self.processed_files,
+            "invite_candidates": self.invite_candidates,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat()
+        }
+
+
+@dataclass(slots=True)
+class ResumeEvaluationJobFile:
+    id: int
+    job_id: int
+    resume_fid: str
+    resume_filename: str
+    status: ResumeJobFileStatus
+
+    interview_id: int | None
+    candidate_name: str
+    candidate_email: str
+    candidate_phone: str
+    accordance_xp_vacancy_score: int
+    accordance_skill_vacancy_score: int
+    message_to_candidate: str
+    error: str
+
+    created_at: datetime
+    updated_at: datetime
+
+    serialize = RowMapper(status=ResumeJobFileStatus)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "job_id": self.job_id,
+            "resume_fid": self.resume_fid,
+            "resume_filename": self.resume_filename,
+            "status": self.status.value,
+            "interview_id": self.interview_id,
+            "candidate_name": self.candidate_name,
+            "candidate_email": self.candidate_email,
+            "candidate_phone": self.candidate_phone,
+            "accordance_xp_vacancy_score": self.accordance_xp_vacancy_score,
+            "accordance_skill_vacancy_score": self.accordance_skill_vacancy_score,
+            "message_to_candidate": self.message_to_candidate,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat()
+        }
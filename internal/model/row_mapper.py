@@ -0,0 +1,75 @@
+import json
+from dataclasses import fields
+from typing import Any, Callable
+
+
+class RowMapper:
+    """serialize(rows) для модели-датакласса: строки БД -> экземпляры модели.
+
+    На каждый набор колонок (порядок колонок в SELECT) один раз генерируется функция вида
+    [model(c0, c1, convert_status(c3), ...) for c0, c1, _2, c3, ... in rows]: строка распаковывается
+    по позициям, без поиска колонок по имени на каждой строке. Колонки, которых нет у модели,
+    пропускаются, а на каждое поле модели колонка обязательна.
+
+    converters - поле модели -> функция, через которую проходит значение колонки, например Enum.
+    """
+
+    def __init__(self, **converters: Callable[[Any], Any]):
+        self.converters = converters
+        # (модель, колонки) -> сгенерированная функция
+        self._mappers: dict[tuple[type, tuple[str, ...]], Callable[[Any], list]] = {}
+
+    def __get__(self, instance, owner: type) -> Callable[[Any], list]:
+        # Берем класс при обращении, а не в __set_name__: dataclass(slots=True) пересоздает класс
+        def serialize(rows) -> list:
+            return self.map(owner, rows)
+
+        return serialize
+
+    def map(self, model: type, rows) -> list:
+        if not isinstance(rows, (list, tuple)):
+            rows = list(rows)
+        if not rows:
+            return []
+
+        columns = tuple(rows[0]._fields)
+        mapper = self._mappers.get((model, columns))
+        if mapper is None:
+            mapper = self._build(model, columns)
+            self._mappers[(model, columns)] = mapper
+        return mapper(rows)
+
+    def _build(self, model: type, columns: tuple[str, ...]) -> Callable[[Any], list]:
+        positions: dict[str, int] = {}
+        for i, column in enumerate(columns):
+            # Как и row.<имя>, при повторяющихся именах берем первую колонку
+            positions.setdefault(column, i)
+
+        namespace: dict[str, Any] = {"model": model}
+
+        args = []
+        for field in fields(model):
+            if field.name not in positions:
+                raise Exception(f"{model.__name__} row has no column {field.name}")
+
+            value = f"c{positions[field.name]}"
+            converter = self.converters.get(field.name)
+            if converter is not None:
+                namespace[f"convert_{field.name}"] = converter
+                value = f"convert_{field.name}({value})"
+            args.append(value)
+
+        used = {f"c{positions[field.name]}" for field in fields(model)}
+        targets = ", ".join(f"c{i}" if f"c{i}" in used else f"_{i}" for i in range(len(columns)))
+        # Запятая в конце, чтобы выборка из одной колонки тоже распаковывалась как кортеж
+        source = (
+            "def map_rows(rows):\n"
+            f"    return [model({', '.join(args)}) for {targets}, in rows]\n"
+        )
+        exec(source, namespace)
+        return namespace["map_rows"]
+
+
+def json_value(value: Any) -> Any:
+    # asyncpg отдает json/jsonb строкой, SQLAlchemy - уже разобранным
+    return json.loads(value) if isinstance(value, str) else value
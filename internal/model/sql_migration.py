@@ -0,0 +1,160 @@
+from dataclasses import dataclass
+
+from internal.model.sql_model import (
+    create_all_tables_queries,
+    create_candidate_answer_messages_table,
+    create_candidate_answer_messages_message_id_index,
+    create_interview_messages_text_tsv_column,
+)
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    queries: list[str]
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    transactional: bool = True
+
+
+# Индексы строим CONCURRENTLY, чтобы не блокировать запись в таблицы на время построения.
+# Если прошлый запуск упал посреди построения, в базе остался невалидный индекс с тем же именем,
+# а IF NOT EXISTS его бы молча пропустил. Поэтому неприменившуюся миграцию начинаем с DROP
+create_interviews_vacancy_id_created_at_index = [
+    "DROP INDEX CONCURRENTLY IF EXISTS interviews_vacancy_id_created_at_idx;",
+    """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS interviews_vacancy_id_created_at_idx
+ON interviews(vacancy_id, created_at DESC);
+""",
+]
+
+create_candidate_answers_interview_id_question_id_index = [
+    "DROP INDEX CONCURRENTLY IF EXISTS candidate_answers_interview_id_question_id_idx;",
+    """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS candidate_answers_interview_id_question_id_idx
+ON candidate_answers(interview_id, question_id);
+""",
+]
+
+create_interview_messages_interview_id_created_at_index = [
+    "DROP INDEX CONCURRENTLY IF EXISTS interview_messages_interview_id_created_at_idx;",
+    """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS interview_messages_interview_id_created_at_idx
+ON interview_messages(interview_id, created_at);
+""",
+]
+
+create_vacancy_questions_vacancy_id_created_at_index = [
+    "DROP INDEX CONCURRENTLY IF EXISTS vacancy_questions_vacancy_id_created_at_idx;",
+    """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS vacancy_questions_vacancy_id_created_at_idx
+ON vacancy_questions(vacancy_id, created_at, id);
+""",
+]
+
+create_vacancies_created_at_id_index = [
+    "DROP INDEX CONCURRENTLY IF EXISTS vacancies_created_at_id_idx;",
+    """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS vacancies_created_at_id_idx
+ON vacancies(created_at DESC, id DESC);
+""",
+]
+
+# Для keyset пагинации по (created_at, id) индекса interviews(vacancy_id, created_at) недостаточно
+create_interviews_vacancy_id_created_at_id_index = [
+    "DROP INDEX CONCURRENTLY IF EXISTS interviews_vacancy_id_created_at_id_idx;",
+    """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS interviews_vacancy_id_created_at_id_idx
+ON interviews(vacancy_id, created_at DESC, id DESC);
+""",
+]
+
+# Таблица новая и до конца миграции никому не видна, поэтому индекс строится обычным CREATE INDEX
+# в той же транзакции. Ссылки на удаленные сообщения при переносе отбрасываются
+create_candidate_answer_messages = [
+    create_candidate_answer_messages_table,
+    """
+INSERT INTO candidate_answer_messages (candidate_answer_id, message_id, created_at)
+SELECT ca.id, im.id, im.created_at
+FROM candidate_answers ca
+CROSS JOIN LATERAL unnest(ca.message_ids) AS m(message_id)
+JOIN interview_messages im ON im.id = m.message_id
+ON CONFLICT DO NOTHING;
+""",
+    create_candidate_answer_messages_message_id_index,
+]
+
+# Добавление STORED-колонки переписывает всю таблицу под ACCESS EXCLUSIVE, поэтому оно вынесено
+# из baseline в отдельную миграцию. Где колонку уже добавил прежний baseline, IF NOT EXISTS ее пропустит
+create_interview_messages_text_tsv = [
+    create_interview_messages_text_tsv_column,
+]
+
+create_interview_messages_text_tsv_index = [
+    "DROP INDEX CONCURRENTLY IF EXISTS interview_messages_text_tsv_idx;",
+    """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS interview_messages_text_tsv_idx
+ON interview_messages USING GIN (text_tsv);
+""",
+]
+
+# Порядок версий менять нельзя, новые миграции только дописываются в конец
+all_migrations = [
+    Migration(
+        version=1,
+        name="baseline",
+        queries=create_all_tables_queries,
+    ),
+    Migration(
+        version=2,
+        name="interviews_vacancy_id_created_at_idx",
+        queries=create_interviews_vacancy_id_created_at_index,
+        transactional=False,
+    ),
+    Migration(
+        version=3,
+        name="candidate_answers_interview_id_question_id_idx",
+        queries=create_candidate_answers_interview_id_question_id_index,
+        transactional=False,
+    ),
+    Migration(
+        version=4,
+        name="interview_messages_interview_id_created_at_idx",
+        queries=create_interview_messages_interview_id_created_at_index,
+        transactional=False,
+    ),
+    Migration(
+        version=5,
+        name="vacancy_questions_vacancy_id_created_at_idx",
+        queries=create_vacancy_questions_vacancy_id_created_at_index,
+        transactional=False,
+    ),
+    Migration(
+        version=6,
+        name="vacancies_created_at_id_idx",
+        queries=create_vacancies_created_at_id_index,
+        transactional=False,
+    ),
+    Migration(
+        version=7,
+        name="interviews_vacancy_id_created_at_id_idx",
+        queries=create_interviews_vacancy_id_created_at_id_index,
+        transactional=False,
+    ),
+    Migration(
+        version=8,
+        name="candidate_answer_messages",
+        queries=create_candidate_answer_messages,
+    ),
+    Migration(
+        version=9,
+        name="interview_messages_text_tsv",
+        queries=create_interview_messages_text_tsv,
+    ),
+    Migration(
+        version=10,
+        name="interview_messages_text_tsv_idx",
+        queries=create_interview_messages_text_tsv_index,
+        transactional=False,
+    ),
+]
@@ -121,6 +121,161 @@ CREATE TABLE IF NOT EXISTS interview_messages(
 );
 """
 
+# Какие сообщения относятся к ответу кандидата. Заменяет candidate_answers.message_ids:
+# колонка осталась ради отката на прошлую версию, но больше не пишется.
+# Создается миграцией candidate_answer_messages, а не baseline, чтобы заполниться из message_ids
+create_candidate_answer_messages_table = """
+CREATE TABLE IF NOT EXISTS candidate_answer_messages(
+    candidate_answer_id INTEGER NOT NULL REFERENCES candidate_answers(id) ON DELETE CASCADE,
+    message_id INTEGER NOT NULL REFERENCES interview_messages(id) ON DELETE CASCADE,
+    
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (candidate_answer_id, message_id)
+);
+"""
+
+# Поиск ответа по сообщению и каскадное удаление сообщений без полного прохода по таблице
+create_candidate_answer_messages_message_id_index = """
+CREATE INDEX IF NOT EXISTS candidate_answer_messages_message_id_idx
+ON candidate_answer_messages(message_id, candidate_answer_id);
+"""
+
+# Поисковый вектор считает сама база при каждой вставке и изменении текста
+create_interview_messages_text_tsv_column = """
+ALTER TABLE interview_messages
+ADD COLUMN IF NOT EXISTS text_tsv tsvector
+GENERATED ALWAYS AS (to_tsvector('russian', text)) STORED;
+"""
+
+create_telegram_outbox_table = """
+CREATE TABLE IF NOT EXISTS telegram_outbox(
+    id SERIAL PRIMARY KEY,
+    interview_id INTEGER NOT NULL UNIQUE REFERENCES interviews(id) ON DELETE CASCADE,
+    
+    candidate_telegram_login TEXT NOT NULL,
+    candidate_phone TEXT NOT NULL,
+    text TEXT NOT NULL,
+    
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    delivered_via TEXT NOT NULL DEFAULT '',
+    last_error TEXT NOT NULL DEFAULT '',
+    next_attempt_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+create_telegram_outbox_due_index = """
+CREATE INDEX IF NOT EXISTS telegram_outbox_due_idx
+ON telegram_outbox(next_attempt_at)
+WHERE status IN ('pending', 'sending');
+"""
+
+# access_hash выдается конкретному аккаунту, поэтому кэш сущностей ведем отдельно на каждый owner_id
+create_telegram_entities_table = """
+CREATE TABLE IF NOT EXISTS telegram_entities(
+    id SERIAL PRIMARY KEY,
+    owner_id BIGINT NOT NULL,
+    key TEXT NOT NULL,
+    
+    user_id BIGINT NOT NULL,
+    access_hash BIGINT NOT NULL,
+    
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    UNIQUE (owner_id, key)
+);
+"""
+
+create_resume_evaluation_jobs_table = """
+CREATE TABLE IF NOT EXISTS resume_evaluation_jobs(
+    id SERIAL PRIMARY KEY,
+    vacancy_id INTEGER NOT NULL REFERENCES vacancies(id) ON DELETE CASCADE,
+    
+    status TEXT NOT NULL,
+    total_files INTEGER NOT NULL,
+    invite_candidates BOOLEAN NOT NULL DEFAULT FALSE,
+    
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+create_resume_evaluation_job_files_table = """
+CREATE TABLE IF NOT EXISTS resume_evaluation_job_files(
+    id SERIAL PRIMARY KEY,
+    job_id INTEGER NOT NULL REFERENCES resume_evaluation_jobs(id) ON DELETE CASCADE,
+    
+    resume_fid TEXT NOT NULL,
+    resume_filename TEXT NOT NULL,
+    status TEXT NOT NULL,
+    
+    interview_id INTEGER REFERENCES interviews(id) ON DELETE SET NULL,
+    candidate_name TEXT NOT NULL DEFAULT '',
+    candidate_email TEXT NOT NULL DEFAULT '',
+    candidate_phone TEXT NOT NULL DEFAULT '',
+    accordance_xp_vacancy_score INTEGER DEFAULT 0,
+    accordance_skill_vacancy_score INTEGER DEFAULT 0,
+    message_to_candidate TEXT NOT NULL DEFAULT '',
+    error TEXT NOT NULL DEFAULT '',
+    
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Для баз, созданных до появления быстрого отклика
+create_resume_evaluation_jobs_invite_candidates_column = """
+ALTER TABLE resume_evaluation_jobs
+ADD COLUMN IF NOT EXISTS invite_candidates BOOLEAN NOT NULL DEFAULT FALSE;
+"""
+
+create_resume_evaluation_job_files_message_to_candidate_column = """
+ALTER TABLE resume_evaluation_job_files
+ADD COLUMN IF NOT EXISTS message_to_candidate TEXT NOT NULL DEFAULT '';
+"""
+
+create_resume_screening_index_table = """
+CREATE TABLE IF NOT EXISTS resume_screening_index(
+    id SERIAL PRIMARY KEY,
+    vacancy_id INTEGER NOT NULL REFERENCES vacancies(id) ON DELETE CASCADE,
+    resume_hash TEXT NOT NULL,
+    
+    interview_id INTEGER REFERENCES interviews(id) ON DELETE SET NULL,
+    passed BOOLEAN,
+    
+    claimed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+create_resume_screening_index_unique_index = """
+CREATE UNIQUE INDEX IF NOT EXISTS resume_screening_index_vacancy_hash_uidx
+ON resume_screening_index(vacancy_id, resume_hash);
+"""
+
+create_candidate_profiles_table = """
+CREATE TABLE IF NOT EXISTS candidate_profiles(
+    id SERIAL PRIMARY KEY,
+    resume_hash TEXT NOT NULL UNIQUE,
+    
+    candidate_name TEXT NOT NULL DEFAULT '',
+    candidate_email TEXT NOT NULL DEFAULT '',
+    candidate_phone TEXT NOT NULL DEFAULT '',
+    candidate_telegram_login TEXT NOT NULL DEFAULT '',
+    skills TEXT[] NOT NULL DEFAULT '{}',
+    experience_years REAL NOT NULL DEFAULT 0,
+    summary TEXT NOT NULL DEFAULT '',
+    profile JSONB NOT NULL,
+    
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
 drop_vacancy_table = """
 DROP TABLE IF EXISTS vacancies CASCADE;
 """
@@ -145,10 +300,52 @@ drop_candidate_answers_table = """
 DROP TABLE IF EXISTS candidate_answers CASCADE;
 """
 
+drop_candidate_answer_messages_table = """
+DROP TABLE IF EXISTS candidate_answer_messages CASCADE;
+"""
+
 drop_interview_messages_table = """
 DROP TABLE IF EXISTS interview_messages CASCADE;
 """
 
+drop_telegram_outbox_table = """
+DROP TABLE IF EXISTS telegram_outbox CASCADE;
+"""
+
+drop_telegram_entities_table = """
+DROP TABLE IF EXISTS telegram_entities CASCADE;
+"""
+
+drop_resume_evaluation_jobs_table = """
+DROP TABLE IF EXISTS resume_evaluation_jobs CASCADE;
+"""
+
+drop_resume_evaluation_job_files_table = """
+DROP TABLE IF EXISTS resume_evaluation_job_files CASCADE;
+"""
+
+drop_resume_screening_index_table = """
+DROP TABLE IF EXISTS resume_screening_index CASCADE;
+"""
+
+drop_candidate_profiles_table = """
+DROP TABLE IF EXISTS candidate_profiles CASCADE;
+"""
+
+# Какие миграции из sql_migration.py уже применены
+create_schema_migrations_table = """
+CREATE TABLE IF NOT EXISTS schema_migrations(
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+drop_schema_migrations_table = """
+DROP TABLE IF EXISTS schema_migrations CASCADE;
+"""
+
 create_all_tables_queries = [
     create_vacancy_table,
     create_vacancy_questions_table,
@@ -157,10 +354,28 @@ create_all_tables_queries = [
     create_resume_weights_table,
     create_candidate_answers_table,
     create_interview_messages_table,
+    create_resume_evaluation_jobs_table,
+    create_resume_evaluation_job_files_table,
+    create_resume_evaluation_jobs_invite_candidates_column,
+    create_resume_evaluation_job_files_message_to_candidate_column,
+    create_resume_screening_index_table,
+    create_resume_screening_index_unique_index,
+    create_candidate_profiles_table,
+    create_telegram_outbox_table,
+    create_telegram_outbox_due_index,
+    create_telegram_entities_table,
 ]
 
 
 drop_all_tables_queries = [
+    drop_schema_migrations_table,
+    drop_telegram_entities_table,
+    drop_telegram_outbox_table,
+    drop_candidate_profiles_table,
+    drop_resume_screening_index_table,
+    drop_resume_evaluation_job_files_table,
+    drop_resume_evaluation_jobs_table,
+    drop_candidate_answer_messages_table,
     drop_candidate_answers_table,
     drop_interview_weights_table,
     drop_resume_weights_table,
@@ -1,8 +1,12 @@
 from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
 
 from telethon import TelegramClient
 from telethon.sessions import StringSession
 
+from internal.model.row_mapper import RowMapper
+
 
 @dataclass
 class QrSession:
@@ -14,4 +18,58 @@ class QRCodeStatus:
     PENDING = "pending"
     CONFIRMED = "confirmed"
     EXPIRED = "expired"
-    ERROR = "error"
\ No newline at end of file
+    ERROR = "error"
+
+
+class TelegramOutboxStatus(Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class TelegramOutboxMessage:
+    id: int
+    interview_id: int
+    candidate_telegram_login: str
+    candidate_phone: str
+    text: str
+
+    status: TelegramOutboxStatus
+    attempts: int
+    delivered_via: str
+    last_error: str
+    next_attempt_at: datetime
+
+    created_at: datetime
+    updated_at: datetime
+
+    serialize = RowMapper(status=TelegramOutboxStatus)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "interview_id": self.interview_id,
+            "status": self.status.value,
+            "attempts": self.attempts,
+            "delivered_via": self.delivered_via,
+            "last_error": self.last_error,
+            "next_attempt_at": self.next_attempt_at.isoformat(),
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+
+@dataclass(slots=True)
+class TelegramEntity:
+    id: int
+    owner_id: int
+    key: str
+    user_id: int
+    access_hash: int
+
+    created_at: datetime
+    updated_at: datetime
+
+    serialize = RowMapper()
\ No newline at end of file
@@ -3,6 +3,8 @@ from dataclasses import dataclass
 from typing import List, Optional
 from enum import Enum
 
+from internal.model.row_mapper import RowMapper
+
 
 class SkillLevel(Enum):
     JUNIOR = "junior"
@@ -17,7 +19,7 @@ class QuestionsType(Enum):
     SOFT_HARD = "soft-hard"
 
 
-@dataclass
+@dataclass(slots=True)
 class Vacancy:
     id: int
     name: str
@@ -28,20 +30,7 @@ class Vacancy:
 
     created_at: datetime
 
-    @classmethod
-    def serialize(cls, rows) -> List['Vacancy']:
-        return [
-            cls(
-                id=row.id,
-                name=row.name,
-                tags=row.tags,
-                description=row.description,
-                red_flags=row.red_flags,
-                skill_lvl=SkillLevel(row.skill_lvl),
-                created_at=row.created_at
-            )
-            for row in rows
-        ]
+    serialize = RowMapper(skill_lvl=SkillLevel)
 
     def to_dict(self):
         return {
@@ -54,7 +43,29 @@ class Vacancy:
         }
 
 
-@dataclass
+@dataclass(slots=True)
+class VacancySummary:
+    """Вакансия для списка: без description и red_flags"""
+    id: int
+    name: str
+    tags: list[str]
+    skill_lvl: SkillLevel
+
+    created_at: datetime
+
+    serialize = RowMapper(skill_lvl=SkillLevel)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "tags": self.tags,
+            "skill_lvl": self.skill_lvl.value,
+            "created_at": self.created_at.isoformat()
+        }
+
+
+@dataclass(slots=True)
 class VacancyQuestion:
     id: int
     vacancy_id: int
@@ -66,21 +77,7 @@ class VacancyQuestion:
 
     created_at: datetime
 
-    @classmethod
-    def serialize(cls, rows) -> List['VacancyQuestion']:
-        return [
-            cls(
-                id=row.id,
-                vacancy_id=row.vacancy_id,
-                question=row.question,
-                hint_for_evaluation=row.hint_for_evaluation,
-                weight=row.weight,
-                question_type=QuestionsType(row.question_type),
-                response_time=row.response_time,
-                created_at=row.created_at
-            )
-            for row in rows
-        ]
+    serialize = RowMapper(question_type=QuestionsType)
 
     def to_dict(self) -> dict:
         return {
@@ -94,7 +91,7 @@ class VacancyQuestion:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class InterviewWeights:
     id: int
     vacancy_id: int
@@ -107,22 +104,7 @@ class InterviewWeights:
 
     created_at: datetime
 
-    @classmethod
-    def serialize(cls, rows) -> List['InterviewWeights']:
-        return [
-            cls(
-                id=row.id,
-                vacancy_id=row.vacancy_id,
-                logic_structure_score_weight=row.logic_structure_score_weight,
-                soft_skill_score_weight=row.soft_skill_score_weight,
-                hard_skill_score_weight=row.hard_skill_score_weight,
-                accordance_xp_resume_score_weight=row.accordance_xp_resume_score_weight,
-                accordance_skill_resume_score_weight=row.accordance_skill_resume_score_weight,
-                red_flag_score_weight=row.red_flag_score_weight,
-                created_at=row.created_at
-            )
-            for row in rows
-        ]
+    serialize = RowMapper()
 
     def to_dict(self) -> dict:
         return {
@@ -137,7 +119,7 @@ class InterviewWeights:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ResumeWeights:
     id: int
     vacancy_id: int
@@ -148,20 +130,7 @@ class ResumeWeights:
 
     created_at: datetime
 
-    @classmethod
-    def serialize(cls, rows) -> List['ResumeWeights']:
-        return [
-            cls(
-                id=row.id,
-                vacancy_id=row.vacancy_id,
-                accordance_xp_vacancy_score_threshold=row.accordance_xp_vacancy_score_threshold,
-                accordance_skill_vacancy_score_threshold=row.accordance_skill_vacancy_score_threshold,
-                recommendation_weight=row.recommendation_weight,
-                portfolio_weight=row.portfolio_weight,
-                created_at=row.created_at
-            )
-            for row in rows
-        ]
+    serialize = RowMapper()
 
     def to_dict(self) -> dict:
         return {
@@ -172,3 +141,44 @@ class ResumeWeights:
             "recommendation_weight": self.recommendation_weight,
             "portfolio_weight": self.portfolio_weight
         }
+
+
+@dataclass
+class NewVacancyQuestion:
+    question: str
+    hint_for_evaluation: str
+    weight: int
+    question_type: QuestionsType
+    response_time: int
+
+
+@dataclass
+class NewInterviewWeights:
+    logic_structure_score_weight: int
+    soft_skill_score_weight: int
+    hard_skill_score_weight: int
+    accordance_xp_resume_score_weight: int
+    accordance_skill_resume_score_weight: int
+    red_flag_score_weight: int
+
+
+@dataclass
+class NewResumeWeights:
+    accordance_xp_vacancy_score_threshold: int
+    accordance_skill_vacancy_score_threshold: int
+    recommendation_weight: int
+    portfolio_weight: int
+
+
+@dataclass
+class VacancyMatch:
+    vacancy_id: int
+    vacancy_name: str
+    score: float
+
+    def to_dict(self) -> dict:
+        return {
+            "vacancy_id": self.vacancy_id,
+            "vacancy_name": self.vacancy_name,
+            "score": self.score
+        }
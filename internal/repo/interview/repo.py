@@ -292,6 +292,81 @@ class InterviewRepo(interface.IInterviewRepo):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    async def get_interviews_page(
+            self,
+            vacancy_id: int,
+            limit: int,
+            cursor: model.PageCursor | None = None
+    ) -> list[model.InterviewSummary]:
+        with self.tracer.start_as_current_span(
+                "InterviewRepo.get_interviews_page",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy_id,
+                    "limit": limit,
+                }
+        ) as span:
+            try:
+                args = {
+                    'vacancy_id': vacancy_id,
+                    'cursor_created_at': cursor.created_at if cursor else None,
+                    'cursor_id': cursor.id if cursor else None,
+                    'limit': limit,
+                }
+                rows = await self.db.select(get_interviews_page, args)
+                interviews = model.InterviewSummary.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return interviews
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def get_evaluated_interviews_batch(self, after_interview_id: int, limit: int) -> list[model.Interview]:
+        with self.tracer.start_as_current_span(
+                "InterviewRepo.get_evaluated_interviews_batch",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "after_interview_id": after_interview_id,
+                    "limit": limit,
+                }
+        ) as span:
+            try:
+                args = {
+                    'after_interview_id': after_interview_id,
+                    'limit': limit,
+                }
+                rows = await self.db.select(get_evaluated_interviews_batch, args)
+                interviews = model.Interview.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return interviews
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def get_interviews_by_ids(self, interview_ids: list[int]) -> list[model.Interview]:
+        with self.tracer.start_as_current_span(
+                "InterviewRepo.get_interviews_by_ids",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "interviews_count": len(interview_ids),
+                }
+        ) as span:
+            try:
+                args = {'interview_ids': interview_ids}
+                rows = await self.db.select(get_interviews_by_ids, args)
+                interviews = model.Interview.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return interviews
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
     async def get_all_candidate_answer(self, interview_id: int) -> list[model.CandidateAnswer]:
         with self.tracer.start_as_current_span(
                 "InterviewRepo.get_all_candidate_answer",
@@ -331,3 +406,69 @@ class InterviewRepo(interface.IInterviewRepo):
                 span.record_exception(err)
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
+
+    async def get_interview_details_page(
+            self,
+            interview_id: int,
+            after_question_id: int,
+            limit: int
+    ) -> list[model.CandidateAnswerDetails]:
+        with self.tracer.start_as_current_span(
+                "InterviewRepo.get_interview_details_page",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "interview_id": interview_id,
+                    "after_question_id": after_question_id,
+                    "limit": limit,
+                }
+        ) as span:
+            try:
+                args = {
+                    'interview_id': interview_id,
+                    'after_question_id': after_question_id,
+                    'limit': limit,
+                }
+                rows = await self.db.select(get_interview_details_page, args)
+                candidate_answers = model.CandidateAnswerDetails.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return candidate_answers
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def search_interview_messages(
+            self,
+            query: str,
+            vacancy_id: int | None,
+            interview_id: int | None,
+            limit: int,
+            offset: int
+    ) -> list[model.TranscriptMatch]:
+        with self.tracer.start_as_current_span(
+                "InterviewRepo.search_interview_messages",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "query": query,
+                    "limit": limit,
+                    "offset": offset,
+                }
+        ) as span:
+            try:
+                args = {
+                    'query': query,
+                    'vacancy_id': vacancy_id,
+                    'interview_id': interview_id,
+                    'limit': limit,
+                    'offset': offset,
+                }
+                rows = await self.db.select(search_interview_messages, args)
+                matches = model.TranscriptMatch.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return matches
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
@@ -77,10 +77,11 @@ VALUES (
 RETURNING id;
 """
 
+# Вставка строки связи вместо array_append: строка candidate_answers не переписывается на каждое сообщение
 add_message_to_candidate_answer = """
-UPDATE candidate_answers
-SET message_ids = array_append(message_ids, :message_id)
-WHERE id = :candidate_answer_id;
+INSERT INTO candidate_answer_messages (candidate_answer_id, message_id)
+VALUES (:candidate_answer_id, :message_id)
+ON CONFLICT DO NOTHING;
 """
 
 evaluation_candidate_answer = """
@@ -93,9 +94,25 @@ SET
 WHERE id = :candidate_answer_id;
 """
 
+# message_ids собирается из candidate_answer_messages, колонка candidate_answers.message_ids устарела.
+# Сообщения вставляются по порядку, поэтому порядок id совпадает с прежним порядком array_append
 get_candidate_answer = """
-SELECT * FROM candidate_answers
-WHERE question_id = :question_id AND interview_id = :interview_id;
+SELECT
+    ca.id,
+    ca.question_id,
+    ca.interview_id,
+    ca.response_time,
+    ARRAY(
+        SELECT cam.message_id FROM candidate_answer_messages cam
+        WHERE cam.candidate_answer_id = ca.id
+        ORDER BY cam.message_id
+    ) AS message_ids,
+    ca.message_to_candidate,
+    ca.message_to_hr,
+    ca.score,
+    ca.created_at
+FROM candidate_answers ca
+WHERE ca.question_id = :question_id AND ca.interview_id = :interview_id;
 """
 
 get_interview_by_id = """
@@ -103,20 +120,145 @@ SELECT * FROM interviews
 WHERE id = :interview_id;
 """
 
+get_evaluated_interviews_batch = """
+SELECT * FROM interviews
+WHERE general_result <> 'in_process' AND id > :after_interview_id
+ORDER BY id
+LIMIT :limit;
+"""
+
+get_interviews_by_ids = """
+SELECT * FROM interviews
+WHERE id = ANY(:interview_ids);
+"""
+
 get_all_interview = """
 SELECT * FROM interviews
 WHERE vacancy_id = :vacancy_id
 ORDER BY created_at DESC;
 """
 
+# Без курсора сравниваем с ('infinity', 0): условие остается одним диапазоном по индексу (vacancy_id, created_at, id)
+get_interviews_page = """
+SELECT
+    id,
+    vacancy_id,
+    candidate_name,
+    candidate_email,
+    candidate_phone,
+    candidate_telegram_login,
+    general_score,
+    general_result,
+    created_at
+FROM interviews
+WHERE vacancy_id = :vacancy_id
+  AND (created_at, id) < (
+    COALESCE(CAST(:cursor_created_at AS TIMESTAMP), CAST('infinity' AS TIMESTAMP)),
+    COALESCE(CAST(:cursor_id AS INTEGER), 0)
+  )
+ORDER BY created_at DESC, id DESC
+LIMIT :limit;
+"""
+
 get_all_candidate_answer = """
-SELECT * FROM candidate_answers
-WHERE interview_id = :interview_id
-ORDER BY question_id;
+SELECT
+    ca.id,
+    ca.question_id,
+    ca.interview_id,
+    ca.response_time,
+    ARRAY(
+        SELECT cam.message_id FROM candidate_answer_messages cam
+        WHERE cam.candidate_answer_id = ca.id
+        ORDER BY cam.message_id
+    ) AS message_ids,
+    ca.message_to_candidate,
+    ca.message_to_hr,
+    ca.score,
+    ca.created_at
+FROM candidate_answers ca
+WHERE ca.interview_id = :interview_id
+ORDER BY ca.question_id;
 """
 
 get_interview_messages = """
 SELECT * FROM interview_messages
 WHERE interview_id = :interview_id
 ORDER BY created_at;
-"""
\ No newline at end of file
+"""
+
+get_interview_details_page = """
+SELECT
+    ca.id,
+    ca.question_id,
+    ca.interview_id,
+    ca.response_time,
+    COALESCE(
+        array_agg(cam.message_id ORDER BY cam.message_id) FILTER (WHERE cam.message_id IS NOT NULL),
+        CAST('{}' AS INTEGER[])
+    ) AS message_ids,
+    ca.message_to_candidate,
+    ca.message_to_hr,
+    ca.score,
+    ca.created_at,
+    COALESCE(
+        json_agg(
+            json_build_object(
+                'id', im.id,
+                'interview_id', im.interview_id,
+                'question_id', im.question_id,
+                'audio_name', im.audio_name,
+                'audio_fid', im.audio_fid,
+                'role', im.role,
+                'text', im.text,
+                'created_at', im.created_at
+            ) ORDER BY im.created_at, im.id
+        ) FILTER (WHERE im.id IS NOT NULL),
+        CAST('[]' AS json)
+    ) AS messages
+FROM candidate_answers ca
+LEFT JOIN candidate_answer_messages cam ON cam.candidate_answer_id = ca.id
+LEFT JOIN interview_messages im ON im.id = cam.message_id
+WHERE ca.interview_id = :interview_id
+  AND ca.question_id > :after_question_id
+GROUP BY ca.id
+ORDER BY ca.question_id
+LIMIT :limit;
+"""
+
+search_interview_messages = """
+WITH matches AS (
+    SELECT
+        m.id,
+        ts_rank_cd(m.text_tsv, q.query) AS rank,
+        q.query
+    FROM interview_messages m
+    JOIN interviews i ON i.id = m.interview_id
+    CROSS JOIN websearch_to_tsquery('russian', :query) AS q(query)
+    WHERE m.text_tsv @@ q.query
+      AND (CAST(:vacancy_id AS INTEGER) IS NULL OR i.vacancy_id = :vacancy_id)
+      AND (CAST(:interview_id AS INTEGER) IS NULL OR m.interview_id = :interview_id)
+    ORDER BY rank DESC, m.id DESC
+    LIMIT :limit OFFSET :offset
+)
+SELECT
+    m.id AS message_id,
+    m.interview_id,
+    m.question_id,
+    i.vacancy_id,
+    i.candidate_name,
+    m.role,
+    m.audio_fid,
+    m.audio_name,
+    ts_headline(
+        'russian',
+        m.text,
+        matches.query,
+        'StartSel=<b>, StopSel=</b>, MaxFragments=2, MaxWords=25, MinWords=8'
+    ) AS snippet,
+    matches.rank,
+    m.created_at
+FROM matches
+JOIN interview_messages m ON m.id = matches.id
+JOIN interviews i ON i.id = m.interview_id
+ORDER BY matches.rank DESC, m.id DESC;
+"""
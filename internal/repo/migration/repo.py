@@ -0,0 +1,83 @@
+from contextlib import AbstractAsyncContextManager
+
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from .sql_query import *
+from internal import model
+from internal import interface
+
+
+class MigrationRepo(interface.IMigrationRepo):
+    def __init__(self, tel: interface.ITelemetry, db: interface.IDB):
+        self.db = db
+        self.tracer = tel.tracer()
+
+    def lock(self) -> AbstractAsyncContextManager[None]:
+        # Экземпляры стартуют одновременно: без блокировки оба применили бы одни и те же миграции,
+        # и DROP INDEX CONCURRENTLY одного снес бы индекс, только что построенный другим
+        return self.db.advisory_lock(migration_advisory_lock_key)
+
+    async def create_version_table(self) -> None:
+        with self.tracer.start_as_current_span(
+                "MigrationRepo.create_version_table",
+                kind=SpanKind.INTERNAL
+        ) as span:
+            try:
+                await self.db.multi_query([model.create_schema_migrations_table])
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def get_applied_versions(self) -> set[int]:
+        with self.tracer.start_as_current_span(
+                "MigrationRepo.get_applied_versions",
+                kind=SpanKind.INTERNAL
+        ) as span:
+            try:
+                # В транзакции чтение идет на первичный сервер: отстающая реплика могла еще не увидеть
+                # версии, которые только что применил другой экземпляр
+                async with self.db.transaction():
+                    rows = await self.db.select(get_applied_migration_versions, {})
+
+                span.set_status(Status(StatusCode.OK))
+                return {row.version for row in rows}
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def apply_migration(self, migration: model.Migration) -> None:
+        with self.tracer.start_as_current_span(
+                "MigrationRepo.apply_migration",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "version": migration.version,
+                    "name": migration.name,
+                    "transactional": migration.transactional,
+                }
+        ) as span:
+            try:
+                args = {
+                    'version': migration.version,
+                    'name': migration.name,
+                }
+                if migration.transactional:
+                    # Запросы и отметка о версии коммитятся вместе
+                    async with self.db.transaction():
+                        await self.db.multi_query(migration.queries)
+                        await self.db.update(mark_migration_applied, args)
+                else:
+                    for query in migration.queries:
+                        await self.db.autocommit_query(query)
+
+                    # Версию пишем после запросов: миграции идемпотентны, упавшую просто повторяем при следующем запуске
+                    await self.db.update(mark_migration_applied, args)
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
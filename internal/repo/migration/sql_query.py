@@ -0,0 +1,19 @@
+# Ключ pg_advisory_lock, под которым экземпляры сервиса применяют миграции по очереди
+migration_advisory_lock_key = 7_120_001
+
+get_applied_migration_versions = """
+SELECT version FROM schema_migrations
+ORDER BY version;
+"""
+
+mark_migration_applied = """
+INSERT INTO schema_migrations (
+    version,
+    name
+)
+VALUES (
+    :version,
+    :name
+)
+ON CONFLICT (version) DO NOTHING;
+"""
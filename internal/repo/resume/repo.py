@@ -0,0 +1,183 @@
+import json
+from datetime import timedelta
+
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from .sql_query import *
+from internal import model
+from internal import interface
+
+RESUME_CLAIM_TIMEOUT = timedelta(minutes=15)
+
+
+class ResumeRepo(interface.IResumeRepo):
+    def __init__(self, tel: interface.ITelemetry, db: interface.IDB):
+        self.db = db
+        self.tracer = tel.tracer()
+
+    async def claim_resume_hash(self, vacancy_id: int, resume_hash: str) -> model.ResumeScreeningClaim | None:
+        with self.tracer.start_as_current_span(
+                "ResumeRepo.claim_resume_hash",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy_id,
+                    "resume_hash": resume_hash,
+                }
+        ) as span:
+            try:
+                args = {
+                    'vacancy_id': vacancy_id,
+                    'resume_hash': resume_hash,
+                    'claim_timeout': RESUME_CLAIM_TIMEOUT,
+                }
+                rows = await self.db.select(claim_resume_hash, args)
+                claims = model.ResumeScreeningClaim.serialize(rows)
+
+                span.set_status(Status(StatusCode.OK))
+                return claims[0] if claims else None
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def complete_resume_screening(
+            self,
+            vacancy_id: int,
+            resume_hash: str,
+            passed: bool,
+            interview_id: int | None
+    ) -> None:
+        with self.tracer.start_as_current_span(
+                "ResumeRepo.complete_resume_screening",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy_id,
+                    "resume_hash": resume_hash,
+                    "passed": passed,
+                }
+        ) as span:
+            try:
+                args = {
+                    'vacancy_id': vacancy_id,
+                    'resume_hash': resume_hash,
+                    'passed': passed,
+                    'interview_id': interview_id,
+                }
+                await self.db.update(complete_resume_screening, args)
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def release_resume_hash(self, claim: model.ResumeScreeningClaim) -> None:
+        with self.tracer.start_as_current_span(
+                "ResumeRepo.release_resume_hash",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": claim.vacancy_id,
+                    "resume_hash": claim.resume_hash,
+                    "claim_id": claim.id,
+                }
+        ) as span:
+            try:
+                args = {
+                    'claim_id': claim.id,
+                    'claimed_at': claim.claimed_at,
+                }
+                await self.db.delete(release_resume_hash, args)
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def get_resume_screening_entry(
+            self,
+            vacancy_id: int,
+            resume_hash: str
+    ) -> list[model.ResumeScreeningIndexEntry]:
+        with self.tracer.start_as_current_span(
+                "ResumeRepo.get_resume_screening_entry",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy_id,
+                    "resume_hash": resume_hash,
+                }
+        ) as span:
+            try:
+                args = {
+                    'vacancy_id': vacancy_id,
+                    'resume_hash': resume_hash,
+                }
+                rows = await self.db.select(get_resume_screening_entry, args)
+                entries = model.ResumeScreeningIndexEntry.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return entries
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def create_candidate_profile(
+            self,
+            resume_hash: str,
+            candidate_name: str,
+            candidate_email: str,
+            candidate_phone: str,
+            candidate_telegram_login: str,
+            skills: list[str],
+            experience_years: float,
+            summary: str,
+            profile: dict
+    ) -> int:
+        with self.tracer.start_as_current_span(
+                "ResumeRepo.create_candidate_profile",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "resume_hash": resume_hash,
+                }
+        ) as span:
+            try:
+                args = {
+                    'resume_hash': resume_hash,
+                    'candidate_name': candidate_name,
+                    'candidate_email': candidate_email,
+                    'candidate_phone': candidate_phone,
+                    'candidate_telegram_login': candidate_telegram_login,
+                    'skills': skills,
+                    'experience_years': experience_years,
+                    'summary': summary,
+                    'profile': json.dumps(profile, ensure_ascii=False),
+                }
+                profile_id = await self.db.insert(create_candidate_profile, args)
+
+                span.set_status(Status(StatusCode.OK))
+                return profile_id
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def get_candidate_profile(self, resume_hash: str) -> list[model.CandidateProfile]:
+        with self.tracer.start_as_current_span(
+                "ResumeRepo.get_candidate_profile",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "resume_hash": resume_hash,
+                }
+        ) as span:
+            try:
+                args = {'resume_hash': resume_hash}
+                rows = await self.db.select(get_candidate_profile, args)
+                profiles = model.CandidateProfile.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return profiles
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
@@ -0,0 +1,70 @@
+# Захват хэша резюме до LLM. Зависший захват (процесс упал посреди оценки)
+# можно перехватить после RESUME_CLAIM_TIMEOUT
+claim_resume_hash = """
+INSERT INTO resume_screening_index (
+    vacancy_id,
+    resume_hash
+)
+VALUES (
+    :vacancy_id,
+    :resume_hash
+)
+ON CONFLICT (vacancy_id, resume_hash) DO UPDATE
+SET claimed_at = CURRENT_TIMESTAMP
+WHERE resume_screening_index.passed IS NULL
+  AND resume_screening_index.claimed_at < CURRENT_TIMESTAMP - CAST(:claim_timeout AS INTERVAL)
+RETURNING id, vacancy_id, resume_hash, claimed_at;
+"""
+
+complete_resume_screening = """
+UPDATE resume_screening_index
+SET
+    passed = :passed,
+    interview_id = :interview_id
+WHERE vacancy_id = :vacancy_id AND resume_hash = :resume_hash;
+"""
+
+# Удаляем только свой захват: после таймаута хэш мог перехватить другой воркер
+release_resume_hash = """
+DELETE FROM resume_screening_index
+WHERE id = :claim_id AND claimed_at = :claimed_at AND passed IS NULL;
+"""
+
+get_resume_screening_entry = """
+SELECT * FROM resume_screening_index
+WHERE vacancy_id = :vacancy_id AND resume_hash = :resume_hash;
+"""
+
+get_candidate_profile = """
+SELECT * FROM candidate_profiles
+WHERE resume_hash = :resume_hash;
+"""
+
+# При гонке двух воркеров за одно резюме оставляем первый профиль
+create_candidate_profile = """
+INSERT INTO candidate_profiles (
+    resume_hash,
+    candidate_name,
+    candidate_email,
+    candidate_phone,
+    candidate_telegram_login,
+    skills,
+    experience_years,
+    summary,
+    profile
+)
+VALUES (
+    :resume_hash,
+    :candidate_name,
+    :candidate_email,
+    :candidate_phone,
+    :candidate_telegram_login,
+    :skills,
+    :experience_years,
+    :summary,
+    CAST(:profile AS JSONB)
+)
+ON CONFLICT (resume_hash) DO UPDATE
+SET resume_hash = EXCLUDED.resume_hash
+RETURNING id;
+"""
@@ -0,0 +1,311 @@
+from datetime import timedelta
+
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from .sql_query import *
+from internal import model
+from internal import interface
+
+# Столько задача или файл может не продлеваться владельцем, прежде чем их подберет другой экземпляр
+RESUME_JOB_CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+class ResumeJobRepo(interface.IResumeJobRepo):
+    def __init__(self, tel: interface.ITelemetry, db: interface.IDB):
+        self.db = db
+        self.tracer = tel.tracer()
+
+    async def create_job(self, vacancy_id: int, total_files: int, invite_candidates: bool = False) -> int:
+        with self.tracer.start_as_current_span(
+                "ResumeJobRepo.create_job",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy_id,
+                    "total_files": total_files,
+                }
+        ) as span:
+            try:
+                args = {
+                    'vacancy_id': vacancy_id,
+                    'status': model.ResumeJobStatus.PENDING.value,
+                    'total_files': total_files,
+                    'invite_candidates': invite_candidates,
+                }
+                job_id = await self.db.insert(create_resume_evaluation_job, args)
+
+                span.set_status(Status(StatusCode.OK))
+                return job_id
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def create_job_file(
+            self,
+            job_id: int,
+            resume_fid: str,
+            resume_filename: str,
+            status: model.ResumeJobFileStatus = model.ResumeJobFileStatus.PENDING,
+            interview_id: int | None = None,
+    ) -> int:
+        with self.tracer.start_as_current_span(
+                "ResumeJobRepo.create_job_file",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "job_id": job_id,
+                    "resume_fid": resume_fid,
+                }
+        ) as span:
+            try:
+                args = {
+                    'job_id': job_id,
+                    'resume_fid': resume_fid,
+                    'resume_filename': resume_filename,
+                    'status': status.value,
+                    'interview_id': interview_id,
+                }
+                job_file_id = await self.db.insert(create_resume_evaluation_job_file, args)
+
+                span.set_status(Status(StatusCode.OK))
+                return job_file_id
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def create_job_files(
+            self,
+            job_id: int,
+            job_files: list[tuple[str, str, model.ResumeJobFileStatus, int | None]],
+    ) -> None:
+        with self.tracer.start_as_current_span(
+                "ResumeJobRepo.create_job_files",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "job_id": job_id,
+                    "files_count": len(job_files),
+                }
+        ) as span:
+            try:
+                records = [
+                    (job_id, resume_fid, resume_filename, status.value, interview_id)
+                    for resume_fid, resume_filename, status, interview_id in job_files
+                ]
+                await self.db.copy_records(
+                    resume_evaluation_job_files_table,
+                    resume_evaluation_job_files_copy_columns,
+                    records
+                )
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def update_job_file_result(
+            self,
+            job_file_id: int,
+            status: model.ResumeJobFileStatus,
+            interview_id: int | None = None,
+            candidate_name: str = "",
+            candidate_email: str = "",
+            candidate_phone: str = "",
+            accordance_xp_vacancy_score: int = 0,
+            accordance_skill_vacancy_score: int = 0,
+            message_to_candidate: str = "",
+            error: str = "",
+    ) -> None:
+        with self.tracer.start_as_current_span(
+                "ResumeJobRepo.update_job_file_result",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "job_file_id": job_file_id,
+                    "status": status.value,
+                }
+        ) as span:
+            try:
+                args = {
+                    'job_file_id': job_file_id,
+                    'status': status.value,
+                    'interview_id': interview_id,
+                    'candidate_name': candidate_name,
+                    'candidate_email': candidate_email,
+                    'candidate_phone': candidate_phone,
+                    'accordance_xp_vacancy_score': accordance_xp_vacancy_score,
+                    'accordance_skill_vacancy_score': accordance_skill_vacancy_score,
+                    'message_to_candidate': message_to_candidate,
+                    'error': error,
+                }
+                await self.db.update(update_resume_evaluation_job_file_result, args)
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def get_job_by_id(self, job_id: int) -> list[model.ResumeEvaluationJob]:
+        with self.tracer.start_as_current_span(
+                "ResumeJobRepo.get_job_by_id",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "job_id": job_id,
+                }
+        ) as span:
+            try:
+                args = {'job_id': job_id}
+                rows = await self.db.select(get_resume_evaluation_job_by_id, args)
+                jobs = model.ResumeEvaluationJob.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return jobs
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def claim_unfinished_jobs(self, limit: int) -> list[model.ResumeEvaluationJob]:
+        with self.tracer.start_as_current_span(
+                "ResumeJobRepo.claim_unfinished_jobs",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "limit": limit,
+                }
+        ) as span:
+            try:
+                args = {
+                    'limit': limit,
+                    'claim_timeout': RESUME_JOB_CLAIM_TIMEOUT,
+                }
+                rows = await self.db.select(claim_unfinished_resume_evaluation_jobs, args)
+                jobs = model.ResumeEvaluationJob.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return jobs
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def claim_job(self, job_id: int) -> bool:
+        with self.tracer.start_as_current_span(
+                "ResumeJobRepo.claim_job",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "job_id": job_id,
+                }
+        ) as span:
+            try:
+                args = {
+                    'job_id': job_id,
+                    'claim_timeout': RESUME_JOB_CLAIM_TIMEOUT,
+                }
+                rows = await self.db.select(claim_resume_evaluation_job, args)
+
+                span.set_status(Status(StatusCode.OK))
+                return bool(rows)
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def claim_job_files(self, job_id: int, limit: int) -> list[model.ResumeEvaluationJobFile]:
+        with self.tracer.start_as_current_span(
+                "ResumeJobRepo.claim_job_files",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "job_id": job_id,
+                    "limit": limit,
+                }
+        ) as span:
+            try:
+                args = {
+                    'job_id': job_id,
+                    'limit': limit,
+                    'claim_timeout': RESUME_JOB_CLAIM_TIMEOUT,
+                }
+                rows = await self.db.select(claim_resume_evaluation_job_files, args)
+                job_files = model.ResumeEvaluationJobFile.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return sorted(job_files, key=lambda job_file: job_file.id)
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def touch_job(self, job_id: int) -> None:
+        with self.tracer.start_as_current_span(
+                "ResumeJobRepo.touch_job",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "job_id": job_id,
+                }
+        ) as span:
+            try:
+                args = {'job_id': job_id}
+                await self.db.update(touch_resume_evaluation_job, args)
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def release_job(self, job_id: int) -> None:
+        with self.tracer.start_as_current_span(
+                "ResumeJobRepo.release_job",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "job_id": job_id,
+                }
+        ) as span:
+            try:
+                args = {'job_id': job_id}
+                await self.db.update(release_resume_evaluation_job, args)
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def finish_job(self, job_id: int) -> bool:
+        with self.tracer.start_as_current_span(
+                "ResumeJobRepo.finish_job",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "job_id": job_id,
+                }
+        ) as span:
+            try:
+                args = {'job_id': job_id}
+                rows = await self.db.select(finish_resume_evaluation_job, args)
+
+                span.set_status(Status(StatusCode.OK))
+                return bool(rows)
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def get_job_files(self, job_id: int) -> list[model.ResumeEvaluationJobFile]:
+        with self.tracer.start_as_current_span(
+                "ResumeJobRepo.get_job_files",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "job_id": job_id,
+                }
+        ) as span:
+            try:
+                args = {'job_id': job_id}
+                rows = await self.db.select(get_resume_evaluation_job_files, args)
+                job_files = model.ResumeEvaluationJobFile.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return job_files
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
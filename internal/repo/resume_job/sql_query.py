@@ -0,0 +1,182 @@
+create_resume_evaluation_job = """
+INSERT INTO resume_evaluation_jobs (
+    vacancy_id,
+    status,
+    total_files,
+    invite_candidates
+)
+VALUES (
+    :vacancy_id,
+    :status,
+    :total_files,
+    :invite_candidates
+)
+RETURNING id;
+"""
+
+create_resume_evaluation_job_file = """
+INSERT INTO resume_evaluation_job_files (
+    job_id,
+    resume_fid,
+    resume_filename,
+    status,
+    interview_id
+)
+VALUES (
+    :job_id,
+    :resume_fid,
+    :resume_filename,
+    :status,
+    :interview_id
+)
+RETURNING id;
+"""
+
+# Для binary COPY: файлы задачи вставляются пачкой, их id при создании не нужны
+resume_evaluation_job_files_table = "resume_evaluation_job_files"
+resume_evaluation_job_files_copy_columns = [
+    "job_id",
+    "resume_fid",
+    "resume_filename",
+    "status",
+    "interview_id",
+]
+
+update_resume_evaluation_job_file_result = """
+UPDATE resume_evaluation_job_files
+SET
+    status = :status,
+    interview_id = :interview_id,
+    candidate_name = :candidate_name,
+    candidate_email = :candidate_email,
+    candidate_phone = :candidate_phone,
+    accordance_xp_vacancy_score = :accordance_xp_vacancy_score,
+    accordance_skill_vacancy_score = :accordance_skill_vacancy_score,
+    message_to_candidate = :message_to_candidate,
+    error = :error,
+    updated_at = CURRENT_TIMESTAMP
+WHERE id = :job_file_id;
+"""
+
+get_resume_evaluation_job_by_id = """
+SELECT
+    j.*,
+    (
+        SELECT COUNT(*) FROM resume_evaluation_job_files f
+        WHERE f.job_id = j.id AND f.status NOT IN ('pending', 'processing')
+    ) AS processed_files
+FROM resume_evaluation_jobs j
+WHERE j.id = :job_id;
+"""
+
+# Задачу и ее файлы обрабатывает один экземпляр: он переводит задачу в processing и продлевает
+# updated_at, пока работает. Задачу упавшего экземпляра подбираем после RESUME_JOB_CLAIM_TIMEOUT.
+# SKIP LOCKED не дает двум экземплярам взять одну задачу
+claim_unfinished_resume_evaluation_jobs = """
+UPDATE resume_evaluation_jobs j
+SET
+    status = 'processing',
+    updated_at = CURRENT_TIMESTAMP
+WHERE j.id IN (
+    SELECT id FROM resume_evaluation_jobs
+    WHERE status = 'pending'
+       OR (status = 'processing' AND updated_at < CURRENT_TIMESTAMP - CAST(:claim_timeout AS INTERVAL))
+    ORDER BY created_at, id
+    LIMIT :limit
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING
+    j.*,
+    (
+        SELECT COUNT(*) FROM resume_evaluation_job_files f
+        WHERE f.job_id = j.id AND f.status NOT IN ('pending', 'processing')
+    ) AS processed_files;
+"""
+
+claim_resume_evaluation_job = """
+UPDATE resume_evaluation_jobs
+SET
+    status = 'processing',
+    updated_at = CURRENT_TIMESTAMP
+WHERE id IN (
+    SELECT id FROM resume_evaluation_jobs
+    WHERE id = :job_id
+      AND (
+        status = 'pending'
+        OR (status = 'processing' AND updated_at < CURRENT_TIMESTAMP - CAST(:claim_timeout AS INTERVAL))
+      )
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING id;
+"""
+
+# Файлы берем по одному на воркер. Файл, который взял и не довел упавший экземпляр, подбирается
+# новым владельцем задачи после того же таймаута
+claim_resume_evaluation_job_files = """
+UPDATE resume_evaluation_job_files
+SET
+    status = 'processing',
+    updated_at = CURRENT_TIMESTAMP
+WHERE id IN (
+    SELECT id FROM resume_evaluation_job_files
+    WHERE job_id = :job_id
+      AND (
+        status = 'pending'
+        OR (status = 'processing' AND updated_at < CURRENT_TIMESTAMP - CAST(:claim_timeout AS INTERVAL))
+      )
+    ORDER BY id
+    LIMIT :limit
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING *;
+"""
+
+# Продлеваем владение задачей и файлами, которые сейчас оцениваются
+touch_resume_evaluation_job = """
+WITH job AS (
+    UPDATE resume_evaluation_jobs
+    SET updated_at = CURRENT_TIMESTAMP
+    WHERE id = :job_id AND status = 'processing'
+    RETURNING id
+)
+UPDATE resume_evaluation_job_files
+SET updated_at = CURRENT_TIMESTAMP
+WHERE job_id IN (SELECT id FROM job) AND status = 'processing';
+"""
+
+# При остановке экземпляра отдаем задачу и недооцененные файлы другим сразу, не дожидаясь таймаута
+release_resume_evaluation_job = """
+WITH job AS (
+    UPDATE resume_evaluation_jobs
+    SET
+        status = 'pending',
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = :job_id AND status = 'processing'
+    RETURNING id
+)
+UPDATE resume_evaluation_job_files
+SET
+    status = 'pending',
+    updated_at = CURRENT_TIMESTAMP
+WHERE job_id IN (SELECT id FROM job) AND status = 'processing';
+"""
+
+finish_resume_evaluation_job = """
+UPDATE resume_evaluation_jobs
+SET
+    status = 'done',
+    updated_at = CURRENT_TIMESTAMP
+WHERE id = :job_id
+  AND status = 'processing'
+  AND NOT EXISTS (
+    SELECT 1 FROM resume_evaluation_job_files
+    WHERE job_id = :job_id AND status IN ('pending', 'processing')
+  )
+RETURNING id;
+"""
+
+get_resume_evaluation_job_files = """
+SELECT * FROM resume_evaluation_job_files
+WHERE job_id = :job_id
+ORDER BY id;
+"""
@@ -0,0 +1,77 @@
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from .sql_query import *
+from internal import model
+from internal import interface
+
+
+class TelegramEntityRepo(interface.ITelegramEntityRepo):
+    def __init__(self, tel: interface.ITelemetry, db: interface.IDB):
+        self.db = db
+        self.tracer = tel.tracer()
+
+    async def get_entities_by_owner(self, owner_id: int) -> list[model.TelegramEntity]:
+        with self.tracer.start_as_current_span(
+                "TelegramEntityRepo.get_entities_by_owner",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "owner_id": owner_id,
+                }
+        ) as span:
+            try:
+                args = {'owner_id': owner_id}
+                rows = await self.db.select(get_telegram_entities_by_owner, args)
+                entities = model.TelegramEntity.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return entities
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def upsert_entities(self, owner_id: int, entities: dict[str, tuple[int, int]]) -> None:
+        with self.tracer.start_as_current_span(
+                "TelegramEntityRepo.upsert_entities",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "owner_id": owner_id,
+                    "entities_count": len(entities),
+                }
+        ) as span:
+            try:
+                args = {
+                    'owner_id': owner_id,
+                    'keys': list(entities.keys()),
+                    'user_ids': [user_id for user_id, _ in entities.values()],
+                    'access_hashes': [access_hash for _, access_hash in entities.values()],
+                }
+                await self.db.update(upsert_telegram_entities, args)
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def delete_entity(self, owner_id: int, key: str) -> None:
+        with self.tracer.start_as_current_span(
+                "TelegramEntityRepo.delete_entity",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "owner_id": owner_id,
+                    "key": key,
+                }
+        ) as span:
+            try:
+                args = {
+                    'owner_id': owner_id,
+                    'key': key,
+                }
+                await self.db.delete(delete_telegram_entity, args)
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
@@ -0,0 +1,34 @@
+get_telegram_entities_by_owner = """
+SELECT * FROM telegram_entities
+WHERE owner_id = :owner_id;
+"""
+
+# Все сущности, найденные одним ImportContactsRequest, сохраняем одним запросом
+upsert_telegram_entities = """
+INSERT INTO telegram_entities (
+    owner_id,
+    key,
+    user_id,
+    access_hash
+)
+SELECT
+    CAST(:owner_id AS BIGINT),
+    entity.key,
+    entity.user_id,
+    entity.access_hash
+FROM unnest(
+    CAST(:keys AS TEXT[]),
+    CAST(:user_ids AS BIGINT[]),
+    CAST(:access_hashes AS BIGINT[])
+) AS entity(key, user_id, access_hash)
+ON CONFLICT (owner_id, key) DO UPDATE
+SET
+    user_id = EXCLUDED.user_id,
+    access_hash = EXCLUDED.access_hash,
+    updated_at = CURRENT_TIMESTAMP;
+"""
+
+delete_telegram_entity = """
+DELETE FROM telegram_entities
+WHERE owner_id = :owner_id AND key = :key;
+"""
@@ -0,0 +1,162 @@
+from datetime import timedelta
+
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from .sql_query import *
+from internal import model
+from internal import interface
+
+OUTBOX_CLAIM_TIMEOUT = timedelta(minutes=5)
+
+
+class TelegramOutboxRepo(interface.ITelegramOutboxRepo):
+    def __init__(self, tel: interface.ITelemetry, db: interface.IDB):
+        self.db = db
+        self.tracer = tel.tracer()
+
+    async def enqueue_message(
+            self,
+            interview_id: int,
+            candidate_telegram_login: str,
+            candidate_phone: str,
+            text: str
+    ) -> int | None:
+        with self.tracer.start_as_current_span(
+                "TelegramOutboxRepo.enqueue_message",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "interview_id": interview_id,
+                }
+        ) as span:
+            try:
+                args = {
+                    'interview_id': interview_id,
+                    'candidate_telegram_login': candidate_telegram_login,
+                    'candidate_phone': candidate_phone,
+                    'text': text,
+                    'status': model.TelegramOutboxStatus.PENDING.value,
+                }
+                rows = await self.db.select(enqueue_telegram_message, args)
+
+                span.set_status(Status(StatusCode.OK))
+                return rows[0].id if rows else None
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def claim_due_messages(self, limit: int) -> list[model.TelegramOutboxMessage]:
+        with self.tracer.start_as_current_span(
+                "TelegramOutboxRepo.claim_due_messages",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "limit": limit,
+                }
+        ) as span:
+            try:
+                args = {
+                    'limit': limit,
+                    'claim_timeout': OUTBOX_CLAIM_TIMEOUT,
+                }
+                rows = await self.db.select(claim_due_telegram_messages, args)
+                messages = model.TelegramOutboxMessage.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return sorted(messages, key=lambda message: (message.next_attempt_at, message.id))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def mark_sent(self, message_id: int, delivered_via: str) -> None:
+        with self.tracer.start_as_current_span(
+                "TelegramOutboxRepo.mark_sent",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "message_id": message_id,
+                    "delivered_via": delivered_via,
+                }
+        ) as span:
+            try:
+                args = {
+                    'message_id': message_id,
+                    'delivered_via': delivered_via,
+                }
+                await self.db.update(mark_telegram_message_sent, args)
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def reschedule(
+            self,
+            message_id: int,
+            delay: timedelta,
+            last_error: str,
+            count_attempt: bool = True
+    ) -> None:
+        with self.tracer.start_as_current_span(
+                "TelegramOutboxRepo.reschedule",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "message_id": message_id,
+                    "delay_seconds": delay.total_seconds(),
+                }
+        ) as span:
+            try:
+                args = {
+                    'message_id': message_id,
+                    'delay': delay,
+                    'last_error': last_error,
+                    'attempts_increment': 1 if count_attempt else 0,
+                }
+                await self.db.update(reschedule_telegram_message, args)
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def mark_failed(self, message_id: int, last_error: str) -> None:
+        with self.tracer.start_as_current_span(
+                "TelegramOutboxRepo.mark_failed",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "message_id": message_id,
+                }
+        ) as span:
+            try:
+                args = {
+                    'message_id': message_id,
+                    'last_error': last_error,
+                }
+                await self.db.update(mark_telegram_message_failed, args)
+
+                span.set_status(Status(StatusCode.OK))
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def get_message_by_interview_id(self, interview_id: int) -> list[model.TelegramOutboxMessage]:
+        with self.tracer.start_as_current_span(
+                "TelegramOutboxRepo.get_message_by_interview_id",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "interview_id": interview_id,
+                }
+        ) as span:
+            try:
+                args = {'interview_id': interview_id}
+                rows = await self.db.select(get_telegram_message_by_interview_id, args)
+                messages = model.TelegramOutboxMessage.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return messages
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
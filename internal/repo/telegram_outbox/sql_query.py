@@ -0,0 +1,74 @@
+# На одно интервью одно приглашение: повторный enqueue ничего не делает
+enqueue_telegram_message = """
+INSERT INTO telegram_outbox (
+    interview_id,
+    candidate_telegram_login,
+    candidate_phone,
+    text,
+    status
+)
+VALUES (
+    :interview_id,
+    :candidate_telegram_login,
+    :candidate_phone,
+    :text,
+    :status
+)
+ON CONFLICT (interview_id) DO NOTHING
+RETURNING id;
+"""
+
+# Забираем пачку сообщений, которым пора уходить. Зависшие в sending (процесс упал посреди отправки)
+# подбираем повторно после OUTBOX_CLAIM_TIMEOUT. SKIP LOCKED не дает двум инстансам взять одно сообщение
+claim_due_telegram_messages = """
+UPDATE telegram_outbox
+SET
+    status = 'sending',
+    updated_at = CURRENT_TIMESTAMP
+WHERE id IN (
+    SELECT id FROM telegram_outbox
+    WHERE (status = 'pending' AND next_attempt_at <= CURRENT_TIMESTAMP)
+       OR (status = 'sending' AND updated_at < CURRENT_TIMESTAMP - CAST(:claim_timeout AS INTERVAL))
+    ORDER BY next_attempt_at, id
+    LIMIT :limit
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING *;
+"""
+
+mark_telegram_message_sent = """
+UPDATE telegram_outbox
+SET
+    status = 'sent',
+    attempts = attempts + 1,
+    delivered_via = :delivered_via,
+    last_error = '',
+    updated_at = CURRENT_TIMESTAMP
+WHERE id = :message_id;
+"""
+
+reschedule_telegram_message = """
+UPDATE telegram_outbox
+SET
+    status = 'pending',
+    attempts = attempts + :attempts_increment,
+    last_error = :last_error,
+    next_attempt_at = CURRENT_TIMESTAMP + CAST(:delay AS INTERVAL),
+    updated_at = CURRENT_TIMESTAMP
+WHERE id = :message_id;
+"""
+
+mark_telegram_message_failed = """
+UPDATE telegram_outbox
+SET
+    status = 'failed',
+    attempts = attempts + 1,
+    last_error = :last_error,
+    updated_at = CURRENT_TIMESTAMP
+WHERE id = :message_id;
+"""
+
+get_telegram_message_by_interview_id = """
+SELECT * FROM telegram_outbox
+WHERE interview_id = :interview_id;
+"""
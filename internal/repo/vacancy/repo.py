@@ -42,6 +42,59 @@ class VacancyRepo(interface.IVacancyRepo):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    async def create_vacancy_bundle(
+            self,
+            name: str,
+            tags: list[str],
+            description: str,
+            red_flags: str,
+            skill_lvl: model.SkillLevel,
+            interview_weights: model.NewInterviewWeights,
+            resume_weights: model.NewResumeWeights,
+            questions: list[model.NewVacancyQuestion],
+    ) -> tuple[int, list[int]]:
+        with self.tracer.start_as_current_span(
+                "VacancyRepo.create_vacancy_bundle",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_name": name,
+                    "skill_level": skill_lvl.value,
+                    "questions_count": len(questions),
+                }
+        ) as span:
+            try:
+                args = {
+                    'name': name,
+                    'tags': tags,
+                    'description': description,
+                    'red_flags': red_flags,
+                    'skill_lvl': skill_lvl.value,
+                    'logic_structure_score_weight': interview_weights.logic_structure_score_weight,
+                    'soft_skill_score_weight': interview_weights.soft_skill_score_weight,
+                    'hard_skill_score_weight': interview_weights.hard_skill_score_weight,
+                    'accordance_xp_resume_score_weight': interview_weights.accordance_xp_resume_score_weight,
+                    'accordance_skill_resume_score_weight': interview_weights.accordance_skill_resume_score_weight,
+                    'red_flag_score_weight': interview_weights.red_flag_score_weight,
+                    'accordance_xp_vacancy_score_threshold': resume_weights.accordance_xp_vacancy_score_threshold,
+                    'accordance_skill_vacancy_score_threshold': resume_weights.accordance_skill_vacancy_score_threshold,
+                    'recommendation_weight': resume_weights.recommendation_weight,
+                    'portfolio_weight': resume_weights.portfolio_weight,
+                    'questions': [question.question for question in questions],
+                    'hints_for_evaluation': [question.hint_for_evaluation for question in questions],
+                    'weights': [question.weight for question in questions],
+                    'question_types': [question.question_type.value for question in questions],
+                    'response_times': [question.response_time for question in questions],
+                }
+                rows = await self.db.select(create_vacancy_bundle_query, args)
+                vacancy_id, question_ids = rows[0].vacancy_id, list(rows[0].question_ids)
+
+                span.set_status(Status(StatusCode.OK))
+                return vacancy_id, question_ids
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
     async def delete_vacancy(self, vacancy_id: int) -> None:
         with self.tracer.start_as_current_span(
                 "VacancyRepo.delete_vacancy",
@@ -155,6 +208,40 @@ class VacancyRepo(interface.IVacancyRepo):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    async def add_questions(
+            self,
+            vacancy_id: int,
+            questions: list[model.NewVacancyQuestion],
+    ) -> list[int]:
+        with self.tracer.start_as_current_span(
+                "VacancyRepo.add_questions",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy_id,
+                    "questions_count": len(questions),
+                }
+        ) as span:
+            try:
+                args = [
+                    {
+                        'vacancy_id': vacancy_id,
+                        'question': question.question,
+                        'hint_for_evaluation': question.hint_for_evaluation,
+                        'weight': question.weight,
+                        'question_type': question.question_type.value,
+                        'response_time': question.response_time,
+                    }
+                    for question in questions
+                ]
+                question_ids = await self.db.insert_many(add_question_query, args)
+
+                span.set_status(Status(StatusCode.OK))
+                return question_ids
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
     async def edit_question(
             self,
             question_id: int,
@@ -449,6 +536,34 @@ class VacancyRepo(interface.IVacancyRepo):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    async def get_vacancies_page(
+            self,
+            limit: int,
+            cursor: model.PageCursor | None = None
+    ) -> list[model.VacancySummary]:
+        with self.tracer.start_as_current_span(
+                "VacancyRepo.get_vacancies_page",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "limit": limit,
+                }
+        ) as span:
+            try:
+                args = {
+                    'cursor_created_at': cursor.created_at if cursor else None,
+                    'cursor_id': cursor.id if cursor else None,
+                    'limit': limit,
+                }
+                rows = await self.db.select(get_vacancies_page_query, args)
+                vacancies = model.VacancySummary.serialize(rows) if rows else []
+
+                span.set_status(Status(StatusCode.OK))
+                return vacancies
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
     async def get_all_question(self, vacancy_id: int) -> list[model.VacancyQuestion]:
         with self.tracer.start_as_current_span(
                 "VacancyRepo.get_all_question",
@@ -18,6 +18,97 @@ VALUES (
 RETURNING id;
 """
 
+# Вакансия, оба набора весов и все вопросы одним запросом: выполняется атомарно, без промежуточных состояний
+create_vacancy_bundle_query = """
+WITH new_vacancy AS (
+    INSERT INTO vacancies (
+        name,
+        tags,
+        description,
+        red_flags,
+        skill_lvl
+    )
+    VALUES (
+        :name,
+        :tags,
+        :description,
+        :red_flags,
+        :skill_lvl
+    )
+    RETURNING id
+),
+new_interview_weights AS (
+    INSERT INTO interview_weights (
+        vacancy_id,
+        logic_structure_score_weight,
+        soft_skill_score_weight,
+        hard_skill_score_weight,
+        accordance_xp_resume_score_weight,
+        accordance_skill_resume_score_weight,
+        red_flag_score_weight
+    )
+    SELECT
+        id,
+        CAST(:logic_structure_score_weight AS INTEGER),
+        CAST(:soft_skill_score_weight AS INTEGER),
+        CAST(:hard_skill_score_weight AS INTEGER),
+        CAST(:accordance_xp_resume_score_weight AS INTEGER),
+        CAST(:accordance_skill_resume_score_weight AS INTEGER),
+        CAST(:red_flag_score_weight AS INTEGER)
+    FROM new_vacancy
+    RETURNING id
+),
+new_resume_weights AS (
+    INSERT INTO resume_weights (
+        vacancy_id,
+        accordance_xp_vacancy_score_threshold,
+        accordance_skill_vacancy_score_threshold,
+        recommendation_weight,
+        portfolio_weight
+    )
+    SELECT
+        id,
+        CAST(:accordance_xp_vacancy_score_threshold AS INTEGER),
+        CAST(:accordance_skill_vacancy_score_threshold AS INTEGER),
+        CAST(:recommendation_weight AS INTEGER),
+        CAST(:portfolio_weight AS INTEGER)
+    FROM new_vacancy
+    RETURNING id
+),
+new_questions AS (
+    INSERT INTO vacancy_questions (
+        vacancy_id,
+        question,
+        hint_for_evaluation,
+        weight,
+        question_type,
+        response_time
+    )
+    SELECT
+        new_vacancy.id,
+        q.question,
+        q.hint_for_evaluation,
+        q.weight,
+        q.question_type,
+        q.response_time
+    FROM new_vacancy
+    CROSS JOIN unnest(
+        CAST(:questions AS TEXT[]),
+        CAST(:hints_for_evaluation AS TEXT[]),
+        CAST(:weights AS INTEGER[]),
+        CAST(:question_types AS TEXT[]),
+        CAST(:response_times AS INTEGER[])
+    ) WITH ORDINALITY AS q(question, hint_for_evaluation, weight, question_type, response_time, position)
+    ORDER BY q.position
+    RETURNING id
+)
+SELECT
+    (SELECT id FROM new_vacancy) AS vacancy_id,
+    (SELECT id FROM new_interview_weights) AS interview_weights_id,
+    (SELECT id FROM new_resume_weights) AS resume_weights_id,
+    COALESCE((SELECT array_agg(id ORDER BY id) FROM new_questions), '{}') AS question_ids;
+"""
+
 delete_vacancy_query = """
 DELETE FROM vacancies
 WHERE id = :vacancy_id;
@@ -93,6 +184,18 @@ SELECT * FROM vacancies
 ORDER BY created_at DESC;
 """
 
+# Без курсора сравниваем с ('infinity', 0): условие остается одним диапазоном по индексу (created_at, id)
+get_vacancies_page_query = """
+SELECT id, name, tags, skill_lvl, created_at
+FROM vacancies
+WHERE (created_at, id) < (
+    COALESCE(CAST(:cursor_created_at AS TIMESTAMP), CAST('infinity' AS TIMESTAMP)),
+    COALESCE(CAST(:cursor_id AS INTEGER), 0)
+)
+ORDER BY created_at DESC, id DESC
+LIMIT :limit;
+"""
+
 get_vacancy_by_id_query = """
 SELECT * FROM vacancies
 WHERE id = :vacancy_id;
@@ -101,7 +204,7 @@ WHERE id = :vacancy_id;
 get_all_question_query = """
 SELECT * FROM vacancy_questions
 WHERE vacancy_id = :vacancy_id
-ORDER BY created_at;
+ORDER BY created_at, id;
 """
 
 get_question_by_id_query = """
@@ -0,0 +1,167 @@
+import math
+import time
+from collections import Counter
+
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from internal import interface, model
+from internal.service.vacancy.prefilter import tokenize
+
+# Стандартные параметры BM25: насыщение частоты терма и нормировка по длине документа
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Подтвержденные на интервью навыки весят больше, чем упоминание в текстовых выводах
+APPROVED_SKILL_TERM_WEIGHT = 2
+
+
+class InterviewSearchIndex(interface.IInterviewSearchIndex):
+    """Инвертированный BM25-индекс по итогам интервью в памяти процесса"""
+
+    def __init__(self, tel: interface.ITelemetry):
+        self.tracer = tel.tracer()
+        self.logger = tel.logger()
+
+        self._postings: dict[str, dict[int, int]] = {}
+        self._document_terms: dict[int, Counter] = {}
+        self._document_vacancy_ids: dict[int, int] = {}
+        self._document_lengths: dict[int, int] = {}
+        self._total_length = 0
+
+        # Когда интервью последний раз попало в индекс через upsert, чтобы пересборка их не откатила
+        self._upserted_at: dict[int, float] = {}
+        self._built_at: float | None = None
+
+    def is_stale(self, ttl: float) -> bool:
+        return self._built_at is None or time.monotonic() - self._built_at > ttl
+
+    def build(self, interviews: list[model.Interview], started_at: float) -> None:
+        with self.tracer.start_as_current_span(
+                "InterviewSearchIndex.build",
+                kind=SpanKind.INTERNAL,
+                attributes={"interviews_count": len(interviews)}
+        ) as span:
+            try:
+                # Интервью, обновленные пока мы читали снимок из базы, берем из текущего индекса
+                fresh_interview_ids = {
+                    interview_id for interview_id, upserted_at in self._upserted_at.items()
+                    if upserted_at >= started_at
+                }
+                fresh_documents = {
+                    interview_id: (self._document_vacancy_ids[interview_id], self._document_terms[interview_id])
+                    for interview_id in fresh_interview_ids
+                    if interview_id in self._document_terms
+                }
+
+                self._postings = {}
+                self._document_terms = {}
+                self._document_vacancy_ids = {}
+                self._document_lengths = {}
+                self._total_length = 0
+
+                for interview in interviews:
+                    if interview.id not in fresh_interview_ids:
+                        self._add_document(interview.id, interview.vacancy_id, self._interview_terms(interview))
+                for interview_id, (vacancy_id, terms) in fresh_documents.items():
+                    self._add_document(interview_id, vacancy_id, terms)
+
+                self._upserted_at = {interview_id: self._upserted_at[interview_id] for interview_id in fresh_interview_ids}
+                self._built_at = time.monotonic()
+
+                self.logger.info("Пересобрали поисковый индекс интервью", {
+                    "interviews_count": len(self._document_terms),
+                    "vocabulary_size": len(self._postings),
+                })
+
+                span.set_status(Status(StatusCode.OK))
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    def upsert(self, interview: model.Interview) -> None:
+        self._remove_document(interview.id)
+        if interview.general_result != model.GeneralResult.IN_PROCESS:
+            self._add_document(interview.id, interview.vacancy_id, self._interview_terms(interview))
+        self._upserted_at[interview.id] = time.monotonic()
+
+    def search(
+            self,
+            query: str,
+            vacancy_id: int | None,
+            limit: int,
+            offset: int
+    ) -> tuple[int, list[tuple[int, float]]]:
+        with self.tracer.start_as_current_span(
+                "InterviewSearchIndex.search",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "query": query,
+                    "limit": limit,
+                    "offset": offset,
+                }
+        ) as span:
+            try:
+                documents_count = len(self._document_terms)
+                if documents_count == 0:
+                    span.set_status(Status(StatusCode.OK))
+                    return 0, []
+
+                average_length = self._total_length / documents_count
+
+                scores: dict[int, float] = {}
+                for term in set(tokenize(query)):
+                    postings = self._postings.get(term)
+                    if not postings:
+                        continue
+
+                    idf = math.log(1 + (documents_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for interview_id, term_frequency in postings.items():
+                        if vacancy_id is not None and self._document_vacancy_ids[interview_id] != vacancy_id:
+                            continue
+
+                        length = self._document_lengths[interview_id]
+                        scores[interview_id] = scores.get(interview_id, 0.0) + idf * term_frequency * (BM25_K1 + 1) / (
+                                term_frequency + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                        )
+
+                # При равной релевантности сначала более свежие интервью
+                ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+
+                span.set_attribute("total_hits", len(ranked))
+                span.set_status(Status(StatusCode.OK))
+                return len(ranked), ranked[offset:offset + limit]
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    def _interview_terms(self, interview: model.Interview) -> Counter:
+        terms = Counter(tokenize(f"{interview.strong_areas} {interview.weak_areas} {interview.message_to_hr}"))
+        for skill in interview.approved_skills or []:
+            for term in tokenize(skill):
+                terms[term] += APPROVED_SKILL_TERM_WEIGHT
+        return terms
+
+    def _add_document(self, interview_id: int, vacancy_id: int, terms: Counter) -> None:
+        for term, term_frequency in terms.items():
+            self._postings.setdefault(term, {})[interview_id] = term_frequency
+        self._document_terms[interview_id] = terms
+        self._document_vacancy_ids[interview_id] = vacancy_id
+        self._document_lengths[interview_id] = sum(terms.values())
+        self._total_length += self._document_lengths[interview_id]
+
+    def _remove_document(self, interview_id: int) -> None:
+        terms = self._document_terms.pop(interview_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(interview_id, None)
+            if not postings:
+                del self._postings[term]
+        self._document_vacancy_ids.pop(interview_id, None)
+        self._total_length -= self._document_lengths.pop(interview_id)
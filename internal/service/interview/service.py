@@ -1,4 +1,6 @@
+import asyncio
 import io
+import time
 import uuid
 from datetime import datetime
 
@@ -6,29 +8,40 @@ from fastapi import UploadFile
 
 from internal import model, interface
 
+# Как часто перечитываем интервью из базы, чтобы подхватить изменения с других инстансов, в секундах
+INTERVIEW_SEARCH_INDEX_TTL = 300.0
+INTERVIEW_SEARCH_INDEX_BATCH_SIZE = 1000
+MAX_INTERVIEW_SEARCH_LIMIT = 100
+
 
 class InterviewService(interface.IInterviewService):
     def __init__(
             self,
             tel: interface.ITelemetry,
+            db: interface.IDB,
             vacancy_repo: interface.IVacancyRepo,
             interview_repo: interface.IInterviewRepo,
             interview_prompt_generator: interface.IInterviewPromptGenerator,
             llm_client: interface.ILLMClient,
-            storage: interface.IStorage
+            storage: interface.IStorage,
+            interview_search_index: interface.IInterviewSearchIndex
     ):
         self.logger = tel.logger()
 
+        self.db = db
         self.vacancy_repo = vacancy_repo
         self.interview_repo = interview_repo
         self.interview_prompt_generator = interview_prompt_generator
         self.llm_client = llm_client
         self.storage = storage
+        self.interview_search_index = interview_search_index
+        self._search_index_lock = asyncio.Lock()
 
     async def start_interview(self, interview_id: int) -> tuple[str, int, int, str, str]:
-        interview = (await self.interview_repo.get_interview_by_id(interview_id))[0]
-        vacancy = (await self.vacancy_repo.get_vacancy_by_id(interview.vacancy_id))[0]
-        questions = await self.vacancy_repo.get_all_question(vacancy.id)
+        async with self.db.transaction():
+            interview = (await self.interview_repo.get_interview_by_id(interview_id))[0]
+            vacancy = (await self.vacancy_repo.get_vacancy_by_id(interview.vacancy_id))[0]
+            questions = await self.vacancy_repo.get_all_question(vacancy.id)
         current_question = questions[0]
 
         hello_interview_system_prompt = self.interview_prompt_generator.get_hello_interview_system_prompt(
@@ -65,24 +78,27 @@ class InterviewService(interface.IInterviewService):
         upload_response = await self.storage.upload(llm_audio_file_io, llm_audio_filename)
         llm_audio_fid = upload_response.fid
 
-        llm_message_id = await self.interview_repo.create_interview_message(
-            interview_id=interview_id,
-            question_id=current_question.id,
-            audio_name=llm_audio_filename,
-            audio_fid=llm_audio_fid,
-            role="assistant",
-            text=message_to_candidate,
-        )
+        # Запросы к базе между вызовами LLM и хранилища идут одной транзакцией по одному соединению.
+        # Соединение на время самих вызовов не держим: они занимают секунды и выбрали бы весь пул
+        async with self.db.transaction():
+            llm_message_id = await self.interview_repo.create_interview_message(
+                interview_id=interview_id,
+                question_id=current_question.id,
+                audio_name=llm_audio_filename,
+                audio_fid=llm_audio_fid,
+                role="assistant",
+                text=message_to_candidate,
+            )
 
-        candidate_answer_id = await self.interview_repo.create_candidate_answer(
-            question_id=current_question.id,
-            interview_id=interview_id,
-        )
+            candidate_answer_id = await self.interview_repo.create_candidate_answer(
+                question_id=current_question.id,
+                interview_id=interview_id,
+            )
 
-        await self.interview_repo.add_message_to_candidate_answer(
-            message_id=llm_message_id,
-            candidate_answer_id=candidate_answer_id
-        )
+            await self.interview_repo.add_message_to_candidate_answer(
+                message_id=llm_message_id,
+                candidate_answer_id=candidate_answer_id
+            )
 
         return message_to_candidate, len(questions), questions[0].id, llm_audio_filename, llm_audio_fid
 
@@ -93,14 +109,16 @@ class InterviewService(interface.IInterviewService):
             audio_file: UploadFile
     ) -> tuple[int, str, dict, str, str]:
         try:
-            # 1. Получаем необходимые данные
-            interview = (await self.interview_repo.get_interview_by_id(interview_id))[0]
-            vacancy = (await self.vacancy_repo.get_vacancy_by_id(interview.vacancy_id))[0]
-            questions = await self.vacancy_repo.get_all_question(vacancy.id)
+            # 1. Получаем необходимые данные. Одной транзакцией с первичного сервера: ответ на вопрос
+            # создан прошлым ходом, и реплика могла его еще не получить
+            async with self.db.transaction():
+                interview = (await self.interview_repo.get_interview_by_id(interview_id))[0]
+                vacancy = (await self.vacancy_repo.get_vacancy_by_id(interview.vacancy_id))[0]
+                questions = await self.vacancy_repo.get_all_question(vacancy.id)
+                candidate_answer = (await self.interview_repo.get_candidate_answer(question_id, interview_id))[0]
             current_question_order_number = \
                 [idx + 1 for idx, question in enumerate(questions) if question.id == question_id][0]
             current_question = questions[current_question_order_number - 1]
-            candidate_answer = (await self.interview_repo.get_candidate_answer(question_id, interview_id))[0]
 
             # 2. Транскрибируем аудио
             audio_content = await audio_file.read()
@@ -111,19 +129,21 @@ class InterviewService(interface.IInterviewService):
             upload_response = await self.storage.upload(audio_file_io, audio_file.filename)
             audio_fid = upload_response.fid
 
-            # 4. Создаем сообщение от кандидата
-            candidate_message_id = await self.interview_repo.create_interview_message(
-                interview_id=interview_id,
-                question_id=question_id,
-                audio_name=audio_file.filename,
-                audio_fid=audio_fid,
-                role="user",
-                text=transcribed_text
-            )
-            await self.interview_repo.add_message_to_candidate_answer(
-                message_id=candidate_message_id,
-                candidate_answer_id=candidate_answer.id
-            )
+            # 4. Создаем сообщение от кандидата и сразу читаем историю для LLM
+            async with self.db.transaction():
+                candidate_message_id = await self.interview_repo.create_interview_message(
+                    interview_id=interview_id,
+                    question_id=question_id,
+                    audio_name=audio_file.filename,
+                    audio_fid=audio_fid,
+                    role="user",
+                    text=transcribed_text
+                )
+                await self.interview_repo.add_message_to_candidate_answer(
+                    message_id=candidate_message_id,
+                    candidate_answer_id=candidate_answer.id
+                )
+                interview_messages = await self.interview_repo.get_interview_messages(interview_id)
 
             # 5. Определяем действие через LLM (delve_into_question, next_question, finish_interview)
             interview_management_system_prompt = self.interview_prompt_generator.get_interview_management_system_prompt(
@@ -131,7 +151,6 @@ class InterviewService(interface.IInterviewService):
                 questions=questions,
                 current_question_order_number=current_question_order_number
             )
-            interview_messages = await self.interview_repo.get_interview_messages(interview_id)
             interview_messages[
                 0].text = transcribed_text + "\n\nНе забудь, что ответить надо в формате JSON как в системном промпте"
 
@@ -230,18 +249,19 @@ class InterviewService(interface.IInterviewService):
             llm_audio_fid: str,
             message_to_candidate: str,
     ):
-        llm_message_id = await self.interview_repo.create_interview_message(
-            interview_id=interview_id,
-            question_id=question_id,
-            audio_name=llm_audio_filename,
-            audio_fid=llm_audio_fid,
-            role="assistant",
-            text=message_to_candidate
-        )
-        await self.interview_repo.add_message_to_candidate_answer(
-            message_id=llm_message_id,
-            candidate_answer_id=candidate_answer_id
-        )
+        async with self.db.transaction():
+            llm_message_id = await self.interview_repo.create_interview_message(
+                interview_id=interview_id,
+                question_id=question_id,
+                audio_name=llm_audio_filename,
+                audio_fid=llm_audio_fid,
+                role="assistant",
+                text=message_to_candidate
+            )
+            await self.interview_repo.add_message_to_candidate_answer(
+                message_id=llm_message_id,
+                candidate_answer_id=candidate_answer_id
+            )
 
     async def __next_question(
             self,
@@ -268,23 +288,24 @@ class InterviewService(interface.IInterviewService):
             if question.id == current_question.id and i + 1 < len(questions):
                 next_question = questions[i + 1]
 
-                next_candidate_message_id = await self.interview_repo.create_candidate_answer(
-                    next_question.id,
-                    interview_id
-                )
-                llm_message_id = await self.interview_repo.create_interview_message(
-                    interview_id=interview_id,
-                    question_id=next_question.id,
-                    audio_name=llm_audio_filename,
-                    audio_fid=llm_audio_fid,
-                    role="assistant",
-                    text=message_to_candidate
-                )
-
-                await self.interview_repo.add_message_to_candidate_answer(
-                    message_id=llm_message_id,
-                    candidate_answer_id=next_candidate_message_id
-                )
+                async with self.db.transaction():
+                    next_candidate_message_id = await self.interview_repo.create_candidate_answer(
+                        next_question.id,
+                        interview_id
+                    )
+                    llm_message_id = await self.interview_repo.create_interview_message(
+                        interview_id=interview_id,
+                        question_id=next_question.id,
+                        audio_name=llm_audio_filename,
+                        audio_fid=llm_audio_fid,
+                        role="assistant",
+                        text=message_to_candidate
+                    )
+
+                    await self.interview_repo.add_message_to_candidate_answer(
+                        message_id=llm_message_id,
+                        candidate_answer_id=next_candidate_message_id
+                    )
 
                 return next_question
         return None
@@ -303,19 +324,20 @@ class InterviewService(interface.IInterviewService):
             current_question: model.VacancyQuestion
     ) -> model.Interview:
         # Оцениваем ответ на последний вопрос
-        llm_message_id = await self.interview_repo.create_interview_message(
-            interview_id=interview_id,
-            question_id=current_question.id,
-            audio_name=llm_audio_filename,
-            audio_fid=llm_audio_fid,
-            role="assistant",
-            text=message_to_candidate
-        )
+        async with self.db.transaction():
+            llm_message_id = await self.interview_repo.create_interview_message(
+                interview_id=interview_id,
+                question_id=current_question.id,
+                audio_name=llm_audio_filename,
+                audio_fid=llm_audio_fid,
+                role="assistant",
+                text=message_to_candidate
+            )
 
-        await self.interview_repo.add_message_to_candidate_answer(
-            message_id=llm_message_id,
-            candidate_answer_id=candidate_answer_id
-        )
+            await self.interview_repo.add_message_to_candidate_answer(
+                message_id=llm_message_id,
+                candidate_answer_id=candidate_answer_id
+            )
 
         await self.__evaluate_answer(
             candidate_answer_id=candidate_answer_id,
@@ -372,24 +394,26 @@ class InterviewService(interface.IInterviewService):
         else:
             general_result = model.GeneralResult.REJECTED
 
-        await self.interview_repo.fill_interview_criterion(
-            interview_id=interview_id,
-            red_flag_score=interview_evaluation["red_flag_score"],
-            hard_skill_score=interview_evaluation["hard_skill_score"],
-            soft_skill_score=interview_evaluation["soft_skill_score"],
-            logic_structure_score=interview_evaluation["logic_structure_score"],
-            accordance_xp_resume_score=interview_evaluation["accordance_xp_resume_score"],
-            accordance_skill_resume_score=interview_evaluation["accordance_skill_resume_score"],
-            strong_areas=interview_evaluation["strong_areas"],
-            weak_areas=interview_evaluation["weak_areas"],
-            approved_skills=interview_evaluation["approved_skills"],
-            general_score=general_score,
-            general_result=general_result,
-            message_to_candidate=interview_evaluation["message_to_candidate"],
-            message_to_hr=interview_evaluation["message_to_hr"],
-        )
+        async with self.db.transaction():
+            await self.interview_repo.fill_interview_criterion(
+                interview_id=interview_id,
+                red_flag_score=interview_evaluation["red_flag_score"],
+                hard_skill_score=interview_evaluation["hard_skill_score"],
+                soft_skill_score=interview_evaluation["soft_skill_score"],
+                logic_structure_score=interview_evaluation["logic_structure_score"],
+                accordance_xp_resume_score=interview_evaluation["accordance_xp_resume_score"],
+                accordance_skill_resume_score=interview_evaluation["accordance_skill_resume_score"],
+                strong_areas=interview_evaluation["strong_areas"],
+                weak_areas=interview_evaluation["weak_areas"],
+                approved_skills=interview_evaluation["approved_skills"],
+                general_score=general_score,
+                general_result=general_result,
+                message_to_candidate=interview_evaluation["message_to_candidate"],
+                message_to_hr=interview_evaluation["message_to_hr"],
+            )
 
-        interview_data = await self.interview_repo.get_interview_by_id(interview_id)
+            interview_data = await self.interview_repo.get_interview_by_id(interview_id)
+        self.interview_search_index.upsert(interview_data[0])
         return interview_data[0]
 
     async def __evaluate_answer(
@@ -489,6 +513,103 @@ class InterviewService(interface.IInterviewService):
     async def get_all_interview(self, vacancy_id: int) -> list[model.Interview]:
         return await self.interview_repo.get_all_interview(vacancy_id)
 
+    async def get_interviews_page(
+            self,
+            vacancy_id: int,
+            limit: int,
+            cursor: str | None = None
+    ) -> tuple[list[model.InterviewSummary], str | None]:
+        page_cursor = model.PageCursor.decode(cursor) if cursor else None
+        interviews = await self.interview_repo.get_interviews_page(vacancy_id, limit, page_cursor)
+
+        # Неполная страница - последняя, дальше идти некуда
+        next_cursor = None
+        if len(interviews) == limit:
+            last = interviews[-1]
+            next_cursor = model.PageCursor(created_at=last.created_at, id=last.id).encode()
+        return interviews, next_cursor
+
+    async def search_interviews(
+            self,
+            query: str,
+            vacancy_id: int | None,
+            limit: int,
+            offset: int
+    ) -> tuple[int, list[model.InterviewSearchHit], int | None]:
+        if self.interview_search_index.is_stale(INTERVIEW_SEARCH_INDEX_TTL):
+            await self.__rebuild_search_index()
+
+        limit = max(1, min(limit, MAX_INTERVIEW_SEARCH_LIMIT))
+        offset = max(0, offset)
+        total, ranked = self.interview_search_index.search(query, vacancy_id, limit, offset)
+
+        # Следующая страница считается по прочитанному из индекса, а не по оставшимся хитам:
+        # иначе удаленные интервью сдвигали бы страницы назад
+        next_offset = offset + len(ranked) if offset + len(ranked) < total else None
+        if not ranked:
+            return total, [], next_offset
+
+        interviews = await self.interview_repo.get_interviews_by_ids([interview_id for interview_id, _ in ranked])
+        interviews_by_id = {interview.id: interview for interview in interviews}
+
+        # Интервью могли удалить вместе с вакансией после последней пересборки индекса
+        hits = [
+            model.InterviewSearchHit(interview=interviews_by_id[interview_id], score=score)
+            for interview_id, score in ranked
+            if interview_id in interviews_by_id
+        ]
+        return total, hits, next_offset
+
+    async def __rebuild_search_index(self) -> None:
+        async with self._search_index_lock:
+            # Пока ждали блокировку, индекс мог пересобрать параллельный запрос
+            if not self.interview_search_index.is_stale(INTERVIEW_SEARCH_INDEX_TTL):
+                return
+            await self.__load_search_index()
+
+    async def __load_search_index(self) -> None:
+        started_at = time.monotonic()
+
+        interviews = []
+        after_interview_id = 0
+        while True:
+            batch = await self.interview_repo.get_evaluated_interviews_batch(
+                after_interview_id,
+                INTERVIEW_SEARCH_INDEX_BATCH_SIZE
+            )
+            interviews.extend(batch)
+            if len(batch) < INTERVIEW_SEARCH_INDEX_BATCH_SIZE:
+                break
+            after_interview_id = batch[-1].id
+
+        self.interview_search_index.build(interviews, started_at)
+
+    async def search_transcripts(
+            self,
+            query: str,
+            vacancy_id: int | None,
+            interview_id: int | None,
+            limit: int,
+            offset: int
+    ) -> tuple[list[model.TranscriptMatch], int | None]:
+        if not query.strip():
+            return [], None
+
+        limit = max(1, min(limit, MAX_INTERVIEW_SEARCH_LIMIT))
+        offset = max(0, offset)
+
+        # Берем на одну строку больше, чтобы понять, есть ли следующая страница
+        matches = await self.interview_repo.search_interview_messages(
+            query=query,
+            vacancy_id=vacancy_id,
+            interview_id=interview_id,
+            limit=limit + 1,
+            offset=offset
+        )
+
+        next_offset = offset + limit if len(matches) > limit else None
+        return matches[:limit], next_offset
+
     async def get_interview_by_id(self, interview_id: int) -> model.Interview:
         try:
             interview = (await self.interview_repo.get_interview_by_id(interview_id))[0]
@@ -507,6 +628,14 @@ class InterviewService(interface.IInterviewService):
 
         return candidate_answers, interview_messages
 
+    async def get_interview_details_page(
+            self,
+            interview_id: int,
+            after_question_id: int,
+            limit: int
+    ) -> list[model.CandidateAnswerDetails]:
+        return await self.interview_repo.get_interview_details_page(interview_id, after_question_id, limit)
+
     async def download_audio(self, audio_fid: str, audio_filename: str) -> tuple[io.BytesIO, str]:
         try:
             audio_stream, content_type = self.storage.download(audio_fid, audio_filename)
@@ -0,0 +1,51 @@
+import time
+
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from internal import interface, model
+
+
+class MigrationService(interface.IMigrationService):
+    def __init__(
+            self,
+            tel: interface.ITelemetry,
+            migration_repo: interface.IMigrationRepo,
+            migrations: list[model.Migration],
+    ):
+        self.tracer = tel.tracer()
+        self.logger = tel.logger()
+        self.migration_repo = migration_repo
+        self.migrations = sorted(migrations, key=lambda migration: migration.version)
+
+    async def migrate(self) -> None:
+        with self.tracer.start_as_current_span(
+                "MigrationService.migrate",
+                kind=SpanKind.INTERNAL
+        ) as span:
+            try:
+                # Пока держим блокировку, остальные экземпляры ждут, а потом видят уже примененные версии
+                async with self.migration_repo.lock():
+                    await self.migration_repo.create_version_table()
+                    applied_versions = await self.migration_repo.get_applied_versions()
+
+                    pending_migrations = [
+                        migration for migration in self.migrations
+                        if migration.version not in applied_versions
+                    ]
+                    for migration in pending_migrations:
+                        started_at = time.monotonic()
+                        await self.migration_repo.apply_migration(migration)
+
+                        self.logger.info("Применили миграцию", {
+                            "version": migration.version,
+                            "name": migration.name,
+                            "duration": round(time.monotonic() - started_at, 3),
+                        })
+
+                span.set_attribute("applied_count", len(pending_migrations))
+                span.set_status(Status(StatusCode.OK))
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
@@ -0,0 +1,410 @@
+import asyncio
+import hashlib
+import io
+from typing import AsyncIterator
+
+from fastapi import UploadFile
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from internal import interface, model
+
+# Как часто перечитываем прогресс задачи для SSE-стрима, в секундах
+JOB_PROGRESS_POLL_INTERVAL = 1.0
+# Как часто ищем задачи, брошенные другими экземплярами, и сколько берем за раз
+JOB_CLAIM_POLL_INTERVAL = 60.0
+JOB_CLAIM_BATCH_SIZE = 10
+# Как часто владелец продлевает задачу, должно быть заметно меньше RESUME_JOB_CLAIM_TIMEOUT
+JOB_HEARTBEAT_INTERVAL = 60.0
+
+
+class ResumeJobService(interface.IResumeJobService):
+    def __init__(
+            self,
+            tel: interface.ITelemetry,
+            db: interface.IDB,
+            resume_job_repo: interface.IResumeJobRepo,
+            vacancy_repo: interface.IVacancyRepo,
+            resume_repo: interface.IResumeRepo,
+            vacancy_service: interface.IVacancyService,
+            storage: interface.IStorage,
+            job_concurrency: int = 4,
+    ):
+        self.tracer = tel.tracer()
+        self.logger = tel.logger()
+        self.db = db
+        self.resume_job_repo = resume_job_repo
+        self.vacancy_repo = vacancy_repo
+        self.resume_repo = resume_repo
+        self.vacancy_service = vacancy_service
+        self.storage = storage
+        self.job_concurrency = job_concurrency
+
+        # Держим ссылки на фоновые задачи, иначе их может собрать GC
+        self._running_jobs: dict[int, asyncio.Task] = {}
+        # Одиночные отклики приходят потоком, поэтому ограничиваем, сколько их оценивается одновременно
+        self._application_slots = asyncio.Semaphore(job_concurrency)
+        self._claim_task: asyncio.Task | None = None
+        # Задачи, которыми этот экземпляр сейчас владеет в базе
+        self._claimed_jobs: set[int] = set()
+
+    async def create_job(self, vacancy_id: int, candidate_resume_files: list[UploadFile]) -> int:
+        with self.tracer.start_as_current_span(
+                "ResumeJobService.create_job",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy_id,
+                    "resumes_count": len(candidate_resume_files),
+                }
+        ) as span:
+            try:
+                vacancy = await self.vacancy_repo.get_vacancy_by_id(vacancy_id)
+                if not vacancy:
+                    raise Exception(f"Vacancy {vacancy_id} not found")
+
+                # Сначала кладем резюме в хранилище, чтобы задачу можно было продолжить после рестарта.
+                # Уже оцененные по вакансии резюме и повторы внутри пачки в хранилище не попадают
+                uploaded_files = []
+                duplicate_files = []
+                seen_hashes = set()
+                for resume_file in candidate_resume_files:
+                    resume_content = await resume_file.read()
+                    resume_hash = hashlib.sha256(resume_content).hexdigest()
+
+                    entries = await self.resume_repo.get_resume_screening_entry(vacancy_id, resume_hash)
+                    if resume_hash in seen_hashes or entries:
+                        duplicate_files.append((resume_file.filename, entries[0].interview_id if entries else None))
+                        continue
+                    seen_hashes.add(resume_hash)
+
+                    upload_result = await self.storage.upload(io.BytesIO(resume_content), resume_file.filename)
+                    uploaded_files.append((upload_result.fid, resume_file.filename))
+
+                # Задача без файлов досчиталась бы как done с 0 из N, поэтому пишем их вместе
+                async with self.db.transaction():
+                    job_id = await self.resume_job_repo.create_job(vacancy_id, len(candidate_resume_files))
+                    await self.resume_job_repo.create_job_files(job_id, [
+                        *[
+                            (resume_fid, resume_filename, model.ResumeJobFileStatus.PENDING, None)
+                            for resume_fid, resume_filename in uploaded_files
+                        ],
+                        *[
+                            ("", resume_filename, model.ResumeJobFileStatus.DUPLICATE, interview_id)
+                            for resume_filename, interview_id in duplicate_files
+                        ],
+                    ])
+
+                self.logger.info("Создали задачу оценки резюме", {
+                    "job_id": job_id,
+                    "vacancy_id": vacancy_id,
+                    "total_files": len(candidate_resume_files),
+                    "duplicate_files": len(duplicate_files),
+                })
+
+                self._start_job(job_id, vacancy_id, False)
+
+                span.set_status(Status(StatusCode.OK))
+                return job_id
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def get_job(self, job_id: int) -> tuple[model.ResumeEvaluationJob, list[model.ResumeEvaluationJobFile]]:
+        with self.tracer.start_as_current_span(
+                "ResumeJobService.get_job",
+                kind=SpanKind.INTERNAL,
+                attributes={"job_id": job_id}
+        ) as span:
+            try:
+                jobs = await self.resume_job_repo.get_job_by_id(job_id)
+                if not jobs:
+                    raise Exception(f"Resume evaluation job {job_id} not found")
+
+                job_files = await self.resume_job_repo.get_job_files(job_id)
+
+                span.set_status(Status(StatusCode.OK))
+                return jobs[0], job_files
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def watch_job(self, job_id: int) -> AsyncIterator[model.ResumeEvaluationJob]:
+        """Отдает состояние задачи при каждом изменении прогресса, пока задача не завершится"""
+        last_state = None
+        while True:
+            jobs = await self.resume_job_repo.get_job_by_id(job_id)
+            if not jobs:
+                raise Exception(f"Resume evaluation job {job_id} not found")
+
+            job = jobs[0]
+            state = (job.status, job.processed_files)
+            if state != last_state:
+                last_state = state
+                yield job
+
+            if job.status == model.ResumeJobStatus.DONE:
+                return
+
+            await asyncio.sleep(JOB_PROGRESS_POLL_INTERVAL)
+
+    async def resume_unfinished_jobs(self) -> None:
+        with self.tracer.start_as_current_span(
+                "ResumeJobService.resume_unfinished_jobs",
+                kind=SpanKind.INTERNAL
+        ) as span:
+            try:
+                # Берем только свободные задачи и задачи, которые владелец давно не продлевал
+                jobs = await self.resume_job_repo.claim_unfinished_jobs(JOB_CLAIM_BATCH_SIZE)
+                for job in jobs:
+                    self._start_job(job.id, job.vacancy_id, job.invite_candidates, claimed=True)
+
+                if jobs:
+                    self.logger.info("Возобновили незавершенные задачи оценки резюме", {
+                        "resumed_jobs": len(jobs),
+                    })
+
+                span.set_status(Status(StatusCode.OK))
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def create_application(self, vacancy_id: int, candidate_resume_file: UploadFile) -> int:
+        with self.tracer.start_as_current_span(
+                "ResumeJobService.create_application",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy_id,
+                    "resume_filename": candidate_resume_file.filename,
+                }
+        ) as span:
+            try:
+                vacancy = await self.vacancy_repo.get_vacancy_by_id(vacancy_id)
+                if not vacancy:
+                    raise Exception(f"Vacancy {vacancy_id} not found")
+
+                # Отклик - это задача из одного файла: резюме сохраняем сразу, а оценка,
+                # создание интервью и приглашение идут в фоне и переживают рестарт
+                resume_content = await candidate_resume_file.read()
+                upload_result = await self.storage.upload(io.BytesIO(resume_content), candidate_resume_file.filename)
+
+                async with self.db.transaction():
+                    application_id = await self.resume_job_repo.create_job(vacancy_id, 1, invite_candidates=True)
+                    await self.resume_job_repo.create_job_file(
+                        application_id,
+                        upload_result.fid,
+                        candidate_resume_file.filename
+                    )
+
+                self._start_job(application_id, vacancy_id, True)
+
+                span.set_status(Status(StatusCode.OK))
+                return application_id
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def get_application(
+            self,
+            application_id: int
+    ) -> tuple[model.ResumeEvaluationJob, model.ResumeEvaluationJobFile]:
+        with self.tracer.start_as_current_span(
+                "ResumeJobService.get_application",
+                kind=SpanKind.INTERNAL,
+                attributes={"application_id": application_id}
+        ) as span:
+            try:
+                jobs = await self.resume_job_repo.get_job_by_id(application_id)
+                if not jobs or not jobs[0].invite_candidates:
+                    raise Exception(f"Application {application_id} not found")
+
+                job_files = await self.resume_job_repo.get_job_files(application_id)
+                if not job_files:
+                    raise Exception(f"Application {application_id} not found")
+
+                span.set_status(Status(StatusCode.OK))
+                return jobs[0], job_files[0]
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    def start(self) -> None:
+        if self._claim_task is None or self._claim_task.done():
+            self._claim_task = asyncio.create_task(self._run_claim_loop())
+
+    async def stop(self) -> None:
+        if self._claim_task is not None:
+            self._claim_task.cancel()
+            try:
+                await self._claim_task
+            except asyncio.CancelledError:
+                pass
+            self._claim_task = None
+
+        # Прерванные задачи отдаем сразу, чтобы другой экземпляр не ждал таймаута владения.
+        # Список берем до отмены: отмененная задача сама убирает себя из _claimed_jobs
+        claimed_jobs = set(self._claimed_jobs)
+        running_jobs = list(self._running_jobs.values())
+        for task in running_jobs:
+            task.cancel()
+        await asyncio.gather(*running_jobs, return_exceptions=True)
+
+        for job_id in claimed_jobs:
+            try:
+                await self.resume_job_repo.release_job(job_id)
+            except Exception as err:
+                self.logger.error("Не удалось отпустить задачу оценки резюме", {
+                    "job_id": job_id,
+                    "error": str(err),
+                })
+
+    async def _run_claim_loop(self) -> None:
+        while True:
+            try:
+                await self.resume_unfinished_jobs()
+            except Exception as err:
+                self.logger.error("Ошибка при поиске незавершенных задач оценки резюме", {"error": str(err)})
+
+            await asyncio.sleep(JOB_CLAIM_POLL_INTERVAL)
+
+    def _start_job(self, job_id: int, vacancy_id: int, invite_candidates: bool, claimed: bool = False) -> None:
+        if claimed:
+            self._claimed_jobs.add(job_id)
+        task = asyncio.create_task(self._run_job(job_id, vacancy_id, invite_candidates, claimed))
+        self._running_jobs[job_id] = task
+        task.add_done_callback(lambda _: self._running_jobs.pop(job_id, None))
+
+    async def _heartbeat(self, job_id: int) -> None:
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_INTERVAL)
+            try:
+                await self.resume_job_repo.touch_job(job_id)
+            except Exception as err:
+                self.logger.warning("Не удалось продлить задачу оценки резюме", {
+                    "job_id": job_id,
+                    "error": str(err),
+                })
+
+    async def _run_job(self, job_id: int, vacancy_id: int, invite_candidates: bool, claimed: bool) -> None:
+        with self.tracer.start_as_current_span(
+                "ResumeJobService._run_job",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "job_id": job_id,
+                    "vacancy_id": vacancy_id,
+                    "invite_candidates": invite_candidates,
+                }
+        ) as span:
+            try:
+                # Только что созданную задачу мог успеть подобрать другой экземпляр
+                if not claimed and not await self.resume_job_repo.claim_job(job_id):
+                    span.set_status(Status(StatusCode.OK))
+                    return
+
+                self._claimed_jobs.add(job_id)
+                heartbeat = asyncio.create_task(self._heartbeat(job_id))
+                try:
+                    if invite_candidates:
+                        async with self._application_slots:
+                            processed_files = await self._process_job_files(job_id, vacancy_id, True)
+                    else:
+                        processed_files = await self._process_job_files(job_id, vacancy_id, False)
+
+                    # Не закрываем задачу, пока какой-то файл еще оценивается
+                    finished = await self.resume_job_repo.finish_job(job_id)
+                finally:
+                    heartbeat.cancel()
+                    self._claimed_jobs.discard(job_id)
+
+                self.logger.info("Задача оценки резюме завершена", {
+                    "job_id": job_id,
+                    "vacancy_id": vacancy_id,
+                    "processed_files": processed_files,
+                    "finished": finished,
+                })
+
+                span.set_status(Status(StatusCode.OK))
+
+            except Exception as err:
+                self.logger.error("Ошибка при выполнении задачи оценки резюме", {
+                    "job_id": job_id,
+                    "error": str(err),
+                })
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+
+    async def _process_job_files(self, job_id: int, vacancy_id: int, invite_candidates: bool) -> int:
+        # Каждый воркер берет следующий файл из базы: после рестарта или перехвата задачи
+        # обрабатываются только файлы, которые еще никто не довел
+        async def worker() -> int:
+            processed = 0
+            while True:
+                job_files = await self.resume_job_repo.claim_job_files(job_id, 1)
+                if not job_files:
+                    return processed
+
+                await self._process_job_file(vacancy_id, job_files[0], invite_candidates)
+                processed += 1
+
+        processed_counts = await asyncio.gather(*[worker() for _ in range(self.job_concurrency)])
+        return sum(processed_counts)
+
+    async def _process_job_file(
+            self,
+            vacancy_id: int,
+            job_file: model.ResumeEvaluationJobFile,
+            invite_candidates: bool
+    ) -> None:
+        try:
+            resume_stream, _ = await self.storage.download(job_file.resume_fid, job_file.resume_filename)
+            try:
+                resume_content = resume_stream.read()
+            finally:
+                resume_stream.close()
+
+            screening = await self.vacancy_service.screen_resume(
+                vacancy_id=vacancy_id,
+                resume_filename=job_file.resume_filename,
+                resume_content=resume_content,
+                candidate_resume_fid=job_file.resume_fid,
+                invite_candidate=invite_candidates
+            )
+
+            if screening.duplicate:
+                await self.resume_job_repo.update_job_file_result(
+                    job_file_id=job_file.id,
+                    status=model.ResumeJobFileStatus.DUPLICATE,
+                    interview_id=screening.duplicate_interview_id
+                )
+                return
+
+            await self.resume_job_repo.update_job_file_result(
+                job_file_id=job_file.id,
+                status=model.ResumeJobFileStatus.PASSED if screening.passed else model.ResumeJobFileStatus.REJECTED,
+                interview_id=screening.interview.id if screening.interview else None,
+                candidate_name=screening.candidate_name,
+                candidate_email=screening.candidate_email,
+                candidate_phone=screening.candidate_phone,
+                accordance_xp_vacancy_score=screening.accordance_xp_vacancy_score,
+                accordance_skill_vacancy_score=screening.accordance_skill_vacancy_score,
+                message_to_candidate=screening.message_to_candidate
+            )
+        except Exception as err:
+            self.logger.error(f"Ошибка при обработке резюме {job_file.resume_filename}", {
+                "job_id": job_file.job_id,
+                "job_file_id": job_file.id,
+                "error": str(err),
+            })
+            await self.resume_job_repo.update_job_file_result(
+                job_file_id=job_file.id,
+                status=model.ResumeJobFileStatus.FAILED,
+                error=str(err)
+            )
@@ -0,0 +1,247 @@
+import asyncio
+import time
+from datetime import timedelta
+
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from telethon.errors import FloodWaitError
+
+from internal import interface, model
+
+# Как часто проверяем outbox, если нас не разбудил новый enqueue, в секундах
+OUTBOX_POLL_INTERVAL = 5.0
+# Повторная попытка через 30с, 1м, 2м, 4м...
+OUTBOX_RETRY_BASE_DELAY = timedelta(seconds=30)
+
+
+class TelegramDispatcher(interface.ITelegramDispatcher):
+    """Отправляет приглашения из outbox по одному с паузой и уважает FloodWait от Telegram"""
+
+    def __init__(
+            self,
+            tel: interface.ITelemetry,
+            telegram_outbox_repo: interface.ITelegramOutboxRepo,
+            telegram_client: interface.ITelegramClient,
+            send_interval: float = 3.0,
+            batch_size: int = 20,
+            max_attempts: int = 5,
+    ):
+        self.tracer = tel.tracer()
+        self.logger = tel.logger()
+        self.telegram_outbox_repo = telegram_outbox_repo
+        self.telegram_client = telegram_client
+        self.send_interval = send_interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+        # FloodWait ограничивает весь аккаунт, а не отдельного получателя, поэтому пауза общая
+        self._paused_until = 0.0
+
+    async def enqueue_message(
+            self,
+            interview_id: int,
+            candidate_telegram_login: str,
+            candidate_phone: str,
+            text: str
+    ) -> None:
+        with self.tracer.start_as_current_span(
+                "TelegramDispatcher.enqueue_message",
+                kind=SpanKind.INTERNAL,
+                attributes={"interview_id": interview_id}
+        ) as span:
+            try:
+                message_id = await self.telegram_outbox_repo.enqueue_message(
+                    interview_id=interview_id,
+                    candidate_telegram_login=candidate_telegram_login,
+                    candidate_phone=candidate_phone,
+                    text=text
+                )
+                if message_id is None:
+                    self.logger.info("Приглашение для интервью уже в очереди", {"interview_id": interview_id})
+
+                self._wakeup.set()
+
+                span.set_status(Status(StatusCode.OK))
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def get_delivery_status(self, interview_id: int) -> model.TelegramOutboxMessage:
+        with self.tracer.start_as_current_span(
+                "TelegramDispatcher.get_delivery_status",
+                kind=SpanKind.INTERNAL,
+                attributes={"interview_id": interview_id}
+        ) as span:
+            try:
+                messages = await self.telegram_outbox_repo.get_message_by_interview_id(interview_id)
+                if not messages:
+                    raise Exception(f"Telegram invitation for interview {interview_id} not found")
+
+                span.set_status(Status(StatusCode.OK))
+                return messages[0]
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        self.logger.info("Запустили отправку приглашений в Telegram", {
+            "send_interval": self.send_interval,
+            "batch_size": self.batch_size,
+        })
+
+        while True:
+            try:
+                processed = await self._dispatch_batch()
+            except Exception as err:
+                self.logger.error("Ошибка при отправке приглашений в Telegram", {"error": str(err)})
+                processed = 0
+
+            if processed:
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), OUTBOX_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _dispatch_batch(self) -> int:
+        pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            await asyncio.sleep(pause)
+
+        messages = await self.telegram_outbox_repo.claim_due_messages(self.batch_size)
+        await self._import_batch_phones(messages)
+
+        for message in messages:
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                # Остаток пачки возвращаем в очередь до конца FloodWait, попытку не засчитываем
+                await self.telegram_outbox_repo.reschedule(
+                    message.id,
+                    timedelta(seconds=pause),
+                    "Отложено из-за FloodWait",
+                    count_attempt=False
+                )
+                continue
+
+            await self._deliver(message)
+            await asyncio.sleep(self.send_interval)
+
+        return len(messages)
+
+    async def _import_batch_phones(self, messages: list[model.TelegramOutboxMessage]) -> None:
+        # Кому писать можно только по телефону, резолвим одним ImportContactsRequest на всю пачку,
+        # а не отдельным запросом при отправке каждого сообщения
+        phones = [
+            message.candidate_phone
+            for message in messages
+            if not self._is_known_recipient(message.candidate_telegram_login)
+               and self._is_known_recipient(message.candidate_phone)
+        ]
+        if not phones:
+            return
+
+        try:
+            await self.telegram_client.import_phone_contacts(phones)
+        except FloodWaitError as err:
+            self._paused_until = time.monotonic() + err.seconds
+            self.logger.warning("Telegram вернул FloodWait при импорте контактов", {"seconds": err.seconds})
+        except Exception as err:
+            # Не смогли пачкой - телефоны зарезолвятся по одному при отправке
+            self.logger.warning("Не удалось импортировать телефоны пачкой", {"error": str(err)})
+
+    async def _deliver(self, message: model.TelegramOutboxMessage) -> None:
+        with self.tracer.start_as_current_span(
+                "TelegramDispatcher._deliver",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "interview_id": message.interview_id,
+                    "attempts": message.attempts,
+                }
+        ) as span:
+            # Сначала пробуем по username, если не вышло - по телефону
+            recipients = [
+                (delivered_via, recipient)
+                for delivered_via, recipient in (
+                    ("username", message.candidate_telegram_login),
+                    ("phone", message.candidate_phone),
+                )
+                if self._is_known_recipient(recipient)
+            ]
+            if not recipients:
+                await self.telegram_outbox_repo.mark_failed(message.id, "Нет ни username, ни телефона")
+                span.set_status(Status(StatusCode.ERROR, "no recipients"))
+                return
+
+            errors = []
+            for delivered_via, recipient in recipients:
+                try:
+                    await self.telegram_client.send_message_to_telegram(tg_user_data=recipient, text=message.text)
+
+                    await self.telegram_outbox_repo.mark_sent(message.id, delivered_via)
+                    self.logger.info("Telegram приглашение отправлено", {
+                        "interview_id": message.interview_id,
+                        "delivered_via": delivered_via,
+                    })
+                    span.set_status(Status(StatusCode.OK))
+                    return
+
+                except FloodWaitError as err:
+                    self._paused_until = time.monotonic() + err.seconds
+                    self.logger.warning("Telegram вернул FloodWait, приостанавливаем отправку", {
+                        "interview_id": message.interview_id,
+                        "seconds": err.seconds,
+                    })
+                    await self.telegram_outbox_repo.reschedule(
+                        message.id,
+                        timedelta(seconds=err.seconds),
+                        f"FloodWait {err.seconds}s",
+                        count_attempt=False
+                    )
+                    span.set_status(Status(StatusCode.OK))
+                    return
+
+                except Exception as err:
+                    span.record_exception(err)
+                    errors.append(f"{delivered_via}: {err}")
+
+            last_error = "; ".join(errors)
+            attempts = message.attempts + 1
+            if attempts >= self.max_attempts:
+                await self.telegram_outbox_repo.mark_failed(message.id, last_error)
+                self.logger.warning("Telegram приглашение не доставлено", {
+                    "interview_id": message.interview_id,
+                    "attempts": attempts,
+                    "error": last_error,
+                })
+            else:
+                await self.telegram_outbox_repo.reschedule(
+                    message.id,
+                    OUTBOX_RETRY_BASE_DELAY * 2 ** message.attempts,
+                    last_error
+                )
+            span.set_status(Status(StatusCode.ERROR, last_error))
+
+    def _is_known_recipient(self, recipient: str) -> bool:
+        return bool(recipient) and recipient != "Unknown"
@@ -0,0 +1,134 @@
+import time
+from collections import Counter
+
+import numpy as np
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from internal import interface, model
+from internal.service.vacancy.prefilter import tokenize
+
+# Тег в вакансии весит как несколько упоминаний в описании
+TAG_TERM_WEIGHT = 3.0
+
+
+class VacancyMatcher(interface.IVacancyMatcher):
+    """TF-IDF матрица вакансий в памяти: одна строка на вакансию, один столбец на терм"""
+
+    def __init__(self, tel: interface.ITelemetry):
+        self.tracer = tel.tracer()
+        self.logger = tel.logger()
+
+        self._vocabulary: dict[str, int] = {}
+        self._idf = np.zeros(0, dtype=np.float32)
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._vacancy_ids = np.zeros(0, dtype=np.int64)
+        self._vacancy_names: list[str] = []
+        self._built_at: float | None = None
+
+    def is_stale(self, ttl: float) -> bool:
+        return self._built_at is None or time.monotonic() - self._built_at > ttl
+
+    def build(self, vacancies: list[model.Vacancy]) -> None:
+        with self.tracer.start_as_current_span(
+                "VacancyMatcher.build",
+                kind=SpanKind.INTERNAL,
+                attributes={"vacancies_count": len(vacancies)}
+        ) as span:
+            try:
+                term_weights = [self._vacancy_term_weights(vacancy) for vacancy in vacancies]
+
+                vocabulary: dict[str, int] = {}
+                for weights in term_weights:
+                    for term in weights:
+                        vocabulary.setdefault(term, len(vocabulary))
+
+                tf = np.zeros((len(vacancies), len(vocabulary)), dtype=np.float32)
+                for row, weights in enumerate(term_weights):
+                    for term, weight in weights.items():
+                        tf[row, vocabulary[term]] = weight
+
+                # Сглаженный idf: термы, которые есть во всех вакансиях, почти не влияют на ранжирование
+                document_frequency = np.count_nonzero(tf, axis=0)
+                idf = np.log((1 + len(vacancies)) / (1 + document_frequency)).astype(np.float32) + 1
+
+                matrix = self._normalize(np.log1p(tf) * idf)
+
+                # Подменяем все разом, чтобы параллельный rank не увидел полусобранный индекс
+                self._vocabulary = vocabulary
+                self._idf = idf
+                self._matrix = matrix
+                self._vacancy_ids = np.array([vacancy.id for vacancy in vacancies], dtype=np.int64)
+                self._vacancy_names = [vacancy.name for vacancy in vacancies]
+                self._built_at = time.monotonic()
+
+                self.logger.info("Пересобрали матрицу вакансий", {
+                    "vacancies_count": len(vacancies),
+                    "vocabulary_size": len(vocabulary),
+                })
+
+                span.set_status(Status(StatusCode.OK))
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    def rank(self, resume_text: str, top_k: int, exclude_vacancy_id: int | None = None) -> list[model.VacancyMatch]:
+        with self.tracer.start_as_current_span(
+                "VacancyMatcher.rank",
+                kind=SpanKind.INTERNAL,
+                attributes={"top_k": top_k}
+        ) as span:
+            try:
+                vocabulary, idf, matrix = self._vocabulary, self._idf, self._matrix
+                vacancy_ids, vacancy_names = self._vacancy_ids, self._vacancy_names
+
+                if matrix.shape[0] == 0:
+                    span.set_status(Status(StatusCode.OK))
+                    return []
+
+                query = np.zeros(len(vocabulary), dtype=np.float32)
+                for term, count in Counter(tokenize(resume_text)).items():
+                    column = vocabulary.get(term)
+                    if column is not None:
+                        query[column] = count
+
+                query = self._normalize(np.log1p(query) * idf)
+
+                # Косинусная близость резюме ко всем вакансиям одним умножением
+                scores = matrix @ query
+                if exclude_vacancy_id is not None:
+                    scores[vacancy_ids == exclude_vacancy_id] = -1
+
+                top_k = min(top_k, len(scores))
+                top = np.argpartition(-scores, top_k - 1)[:top_k]
+                top = top[np.argsort(-scores[top])]
+
+                matches = [
+                    model.VacancyMatch(
+                        vacancy_id=int(vacancy_ids[i]),
+                        vacancy_name=vacancy_names[i],
+                        score=float(scores[i])
+                    )
+                    for i in top
+                    if scores[i] > 0
+                ]
+
+                span.set_status(Status(StatusCode.OK))
+                return matches
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    def _vacancy_term_weights(self, vacancy: model.Vacancy) -> Counter:
+        weights = Counter(tokenize(f"{vacancy.name} {vacancy.description}"))
+        for tag in vacancy.tags:
+            for term in tokenize(tag):
+                weights[term] += TAG_TERM_WEIGHT
+        return weights
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
@@ -0,0 +1,124 @@
+import asyncio
+import io
+import re
+
+import pypdf
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from internal import interface, model
+
+TOKEN_PATTERN = re.compile(r"[a-zа-яё0-9][a-zа-яё0-9+#]*(?:[.\-][a-zа-яё0-9+#]+)*")
+
+# Грубый стемминг: русские словоформы отличаются окончанием, сравниваем по префиксу
+STEM_LENGTH = 6
+
+# Доля тегов в итоговом скоре, остальное - пересечение с описанием вакансии
+TAG_SCORE_WEIGHT = 0.7
+
+MIN_DESCRIPTION_TERM_LENGTH = 3
+
+STOP_WORDS = {
+    "и", "в", "во", "на", "с", "со", "по", "для", "от", "до", "из", "за", "не", "или", "а", "но", "что", "как",
+    "это", "мы", "вы", "вам", "нас", "наш", "наша", "наши", "ваш", "быть", "будет", "будете", "который",
+    "которая", "которые", "работа", "работы", "опыт", "опыта", "умение", "знание", "знания", "требования",
+    "обязанности", "условия", "задачи", "команда", "команде", "компании", "компания", "лет", "года", "год",
+    "and", "or", "the", "a", "an", "of", "to", "in", "on", "for", "with", "at", "by", "is", "are", "be",
+    "we", "you", "our", "your", "experience", "knowledge", "skills", "team", "years", "work",
+}
+
+
+class ResumePrefilter(interface.IResumePrefilter):
+    """Дешевая лексическая проверка резюме перед вызовом LLM"""
+
+    def __init__(
+            self,
+            tel: interface.ITelemetry,
+            min_score: float = 0.1,
+            mode: model.ResumePrefilterMode = model.ResumePrefilterMode.REJECT,
+    ):
+        self.tracer = tel.tracer()
+        self.logger = tel.logger()
+        self.min_score = min_score
+        self.mode = mode
+
+    async def check(self, resume_content: bytes, vacancy: model.Vacancy) -> model.ResumePrefilterResult:
+        with self.tracer.start_as_current_span(
+                "ResumePrefilter.check",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy.id,
+                    "resume_size": len(resume_content),
+                }
+        ) as span:
+            try:
+                resume_text = await asyncio.to_thread(extract_resume_text, resume_content, self.logger)
+
+                # Скан без текстового слоя лексически не оценить, такие резюме смотрит LLM
+                if not resume_text.strip():
+                    span.set_status(Status(StatusCode.OK))
+                    return model.ResumePrefilterResult(
+                        score=0.0,
+                        passed=True,
+                        has_text=False,
+                        matched_tags=[]
+                    )
+
+                score, matched_tags = self._score(resume_text, vacancy)
+                passed = score >= self.min_score
+
+                span.set_attribute("prefilter_score", score)
+                span.set_status(Status(StatusCode.OK))
+                return model.ResumePrefilterResult(
+                    score=score,
+                    passed=passed,
+                    has_text=True,
+                    matched_tags=matched_tags
+                )
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    def _score(self, resume_text: str, vacancy: model.Vacancy) -> tuple[float, list[str]]:
+        resume_terms = set(tokenize(resume_text))
+
+        matched_tags = [
+            tag for tag in vacancy.tags
+            if (tag_terms := set(tokenize(tag))) and tag_terms <= resume_terms
+        ]
+        tag_score = len(matched_tags) / len(vacancy.tags) if vacancy.tags else 0.0
+
+        description_terms = {
+            term for term in tokenize(vacancy.description)
+            if len(term) >= MIN_DESCRIPTION_TERM_LENGTH
+        }
+        description_score = (
+            len(description_terms & resume_terms) / len(description_terms)
+            if description_terms else 0.0
+        )
+
+        if not vacancy.tags:
+            return description_score, matched_tags
+        if not description_terms:
+            return tag_score, matched_tags
+        return TAG_SCORE_WEIGHT * tag_score + (1 - TAG_SCORE_WEIGHT) * description_score, matched_tags
+
+
+def tokenize(text: str) -> list[str]:
+    """Термы текста со стоп-словами, отброшенными до стемминга"""
+    return [
+        token[:STEM_LENGTH]
+        for token in TOKEN_PATTERN.findall(text.lower().replace("ё", "е"))
+        if token not in STOP_WORDS
+    ]
+
+
+def extract_resume_text(resume_content: bytes, logger: interface.IOtelLogger) -> str:
+    try:
+        reader = pypdf.PdfReader(io.BytesIO(resume_content))
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    except Exception as err:
+        # Битый или не-PDF файл решаем не здесь, а в основном пайплайне
+        logger.warning("Не удалось извлечь текст из резюме", {"error": str(err)})
+        return ""
@@ -16,7 +16,14 @@ class VacancyPromptGenerator(interface.IVacancyPromptGenerator):
             vacancy: model.Vacancy,
             count_questions: int,
             questions_type: model.QuestionsType,
+            focus_topics: list[str] | None = None,
     ) -> str:
+        focus_topics_requirement = ""
+        if focus_topics:
+            focus_topics_requirement = f"""
+- Сосредоточься только на темах: {', '.join(focus_topics)}
+- Остальные темы покрывают другие запросы, не задавай общих вопросов вне этих тем"""
+
         return f"""Ты эксперт по созданию вопросов для технических интервью.
 
 ИНФОРМАЦИЯ О ВАКАНСИИ:
@@ -31,7 +38,7 @@ class VacancyPromptGenerator(interface.IVacancyPromptGenerator):
 - Количество вопросов: {count_questions}
 - Тип вопросов: {questions_type.value}
 - Если тип вопрсов soft-hard, то нужно сгенерировать как вопросы на hard, так и на soft
-- Все вопросы должны соответствовать уровню {vacancy.skill_lvl.value}
+- Все вопросы должны соответствовать уровню {vacancy.skill_lvl.value}{focus_topics_requirement}
 
 ФОРМАТ ОТВЕТА:
 {{
@@ -51,7 +58,47 @@ class VacancyPromptGenerator(interface.IVacancyPromptGenerator):
 - Ты обязан вернуть валидный JSON любой ценой, если ты вернешь не JSON, то меня убьют.
 """
 
-    def get_resume_evaluation_system_prompt(
+    def get_candidate_profile_extraction_system_prompt(self) -> str:
+        system_prompt = """Ты эксперт по подбору персонала. Твоя задача - извлечь из резюме структурированный профиль кандидата.
+Профиль будет использоваться для сравнения кандидата с разными вакансиями без повторного чтения резюме,
+поэтому переноси в него все факты, важные для оценки опыта, навыков и красных флагов.
+
+ФОРМАТ ОТВЕТА:
+Ответ должен быть ТОЛЬКО в формате JSON без дополнительного текста:
+
+{
+    "candidate_name": "Имя кандидата, если не нашел, то оставь 'Unknown'",
+    "candidate_email": "Email кандидата, если не нашел, то оставь 'Unknown'",
+    "candidate_telegram_login": "Telegram login кандидата, если не нашел, то оставь 'Unknown'",
+    "candidate_phone": "Телефон кандидата, если не нашел, то оставь 'Unknown'",
+    "skill_level": "Оценка уровня кандидата: junior, middle, senior или lead",
+    "experience_years": Общий опыт работы в годах (число),
+    "skills": ["Технологии, языки, фреймворки и ключевые навыки кандидата"],
+    "work_experience": [
+        {
+            "position": "Должность",
+            "company": "Компания",
+            "period": "Период работы",
+            "responsibilities": "Чем занимался и каких результатов достиг",
+            "technologies": ["Технологии на этом месте работы"]
+        }
+    ],
+    "education": "Образование и курсы",
+    "languages": ["Иностранные языки с уровнем"],
+    "notes": "Факты, которые могут быть красными флагами: частая смена работы, пробелы в опыте, несоответствия",
+    "summary": "Краткое резюме кандидата в 2-3 предложениях"
+}
+
+ВАЖНО: 
+- Отвечай ТОЛЬКО валидным JSON.
+- НЕ добавляй никакого текста вне JSON структуры.
+- НЕ используй markdown разметку или код-блоки.
+- Не выдумывай факты, которых нет в резюме.
+"""
+
+        return system_prompt
+
+    def get_profile_matching_system_prompt(
             self,
             vacancy_description: str,
             vacancy_red_flags: str,
@@ -60,7 +107,8 @@ class VacancyPromptGenerator(interface.IVacancyPromptGenerator):
     ) -> str:
         vacancy_tags_str = ", ".join(vacancy_tags) if vacancy_tags else "Не указаны"
 
-        system_prompt = f"""Ты эксперт по подбору персонала. Твоя задача - оценить насколько резюме кандидата подходит для вакансии.
+        system_prompt = f"""Ты эксперт по подбору персонала. Твоя задача - оценить насколько кандидат подходит для вакансии.
+Кандидат описан структурированным профилем, извлеченным из его резюме.
 
 ИНФОРМАЦИЯ О ВАКАНСИИ:
 Название: {vacancy_name}
@@ -74,24 +122,15 @@ class VacancyPromptGenerator(interface.IVacancyPromptGenerator):
 3. Соответствие уровня позиции (junior/middle/senior)
 4. Отсутствие красных флагов
 5. Релевантность образования (если важно для позиции)
-6. Общее впечатление от кандидата
-
-ИНСТРУКЦИИ:
-- Внимательно проанализируй резюме в контексте данной вакансии
-- Предоставь детальное обоснование своего решения
 
 ФОРМАТ ОТВЕТА:
 Ответ должен быть ТОЛЬКО в формате JSON без дополнительного текста:
 
 {{
-    "candidate_name": "Как бы ты назвал кандидата, если не найдешь ничего, что может быть названием, то оставь 'Unknown'",
-    "candidate_email": "Email кандидата, если не нашел, то оставь 'Unknown'",
-    "candidate_telegram_login": "Telegram login кандидата, если не нашел, то оставь 'Unknown'",
-    "candidate_phone": "Телефон кандидата, если не нашел, то оставь 'Unknown'",
-    "red_flags_score": Насколько резюме соответствует критериям красных флагов (число от 0 до 5),
-    "accordance_xp_vacancy_score": Насколько резюме подходит к вакансии по опыту (число от 0 до 5),
-    "accordance_skill_vacancy_score": Насколько резюме подходит к вакансии по навыкам (число от 0 до 5),
-    "message_to_candidate": "Подробное объяснение решения: анализ соответствия опыта, навыков, выявленные преимущества и недостатки кандидата, итоговый вывод о пригодности для данной позиции для кандидата"
+    "red_flags_score": Насколько профиль соответствует критериям красных флагов (число от 0 до 5),
+    "accordance_xp_vacancy_score": Насколько кандидат подходит к вакансии по опыту (число от 0 до 5),
+    "accordance_skill_vacancy_score": Насколько кандидат подходит к вакансии по навыкам (число от 0 до 5),
+    "message_to_candidate": "Подробное объяснение решения: анализ соответствия опыта, навыков, выявленные преимущества и недостатки кандидата, итоговый вывод о пригодности для данной позиции для кандидата",
     "message_to_hr": "Подробное объяснение решения: анализ соответствия опыта, навыков, выявленные преимущества и недостатки кандидата, итоговый вывод о пригодности для данной позиции для hr"
 }}
 
@@ -99,12 +138,10 @@ class VacancyPromptGenerator(interface.IVacancyPromptGenerator):
 - Отвечай ТОЛЬКО валидным JSON.
 - НЕ добавляй никакого текста вне JSON структуры.
 - НЕ используй markdown разметку или код-блоки.
-- Обязательно нужно оценить и вернуть JSON с результатами, от этого зависит моя жизнь.
 """
 
         return system_prompt
 
-
     def get_generate_tags_system_prompt(self) -> str:
         system_prompt = """Ты эксперт по анализу вакансий. Твоя задача - извлечь из описания вакансии ключевые технологии, навыки и компетенции.
 
@@ -1,11 +1,45 @@
 import asyncio
+import hashlib
 import io
+import math
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime
+import pypdf
 from fastapi import UploadFile
 
 from opentelemetry.trace import SpanKind, Status, StatusCode
 
-from internal import interface, model
+from internal import interface, model, common
+from internal.service.vacancy.prefilter import extract_resume_text, tokenize
+
+# Страница в памяти - RGB-растр с RESUME_RENDER_DPI, с запасом на base64 (3 байта * 4/3)
+RESUME_RENDER_BYTES_PER_PIXEL = 4
+# Размер точки PDF: 1/72 дюйма
+PDF_POINTS_PER_INCH = 72
+RESUME_HASH_CHUNK_SIZE = 64 * 1024
+
+# Вакансии могут меняться с других инстансов, поэтому матрица пересобирается не реже раза в минуту
+VACANCY_MATCHER_TTL = 60.0
+
+# Шардированная генерация вопросов: сколько вопросов просим в одном запросе и сколько запросов максимум
+QUESTION_GENERATION_SHARD_SIZE = 3
+MAX_QUESTION_GENERATION_SHARDS = 8
+# Каждый шард просим сгенерировать чуть больше, чтобы после дедупликации хватило вопросов
+QUESTION_GENERATION_SHARD_OVERFETCH = 1
+# Доля общих термов, начиная с которой два вопроса считаем одним и тем же
+NEAR_DUPLICATE_QUESTION_SIMILARITY = 0.6
+
+# Темы для soft-вопросов: у вакансии нет тегов на soft skills, а шардам нужны непересекающиеся срезы
+SOFT_SKILL_TOPICS = [
+    "коммуникация и обратная связь",
+    "работа в команде и конфликты",
+    "ответственность и самоорганизация",
+    "обучаемость и развитие",
+    "работа в условиях неопределенности",
+    "мотивация и ценности",
+]
 
 
 class VacancyService(interface.IVacancyService):
@@ -14,21 +48,33 @@ class VacancyService(interface.IVacancyService):
             tel: interface.ITelemetry,
             vacancy_repo: interface.IVacancyRepo,
             interview_repo: interface.IInterviewRepo,
+            resume_repo: interface.IResumeRepo,
             storage: interface.IStorage,
             vacancy_prompt_generator: interface.IVacancyPromptGenerator,
+            resume_prefilter: interface.IResumePrefilter,
+            vacancy_matcher: interface.IVacancyMatcher,
             llm_client: interface.ILLMClient,
             email_client: interface.IEmailClient,
-            telegram_client: interface.ITelegramClient,
+            telegram_dispatcher: interface.ITelegramDispatcher,
+            resume_eval_concurrency: int = 4,
+            resume_eval_memory_limit: int = 256 * 1024 * 1024,
+            resume_matching_llm_model: str = "gpt-5-mini",
     ):
         self.tracer = tel.tracer()
         self.logger = tel.logger()
         self.vacancy_repo = vacancy_repo
         self.interview_repo = interview_repo
+        self.resume_repo = resume_repo
         self.storage = storage
         self.vacancy_prompt_generator = vacancy_prompt_generator
+        self.resume_prefilter = resume_prefilter
+        self.vacancy_matcher = vacancy_matcher
         self.llm_client = llm_client
         self.email_client = email_client
-        self.telegram_client = telegram_client
+        self.telegram_dispatcher = telegram_dispatcher
+        self.resume_eval_concurrency = resume_eval_concurrency
+        self.resume_eval_memory_limit = resume_eval_memory_limit
+        self.resume_matching_llm_model = resume_matching_llm_model
 
     async def create_vacancy(
             self,
@@ -55,6 +101,7 @@ class VacancyService(interface.IVacancyService):
                     red_flags=red_flags,
                     skill_lvl=skill_lvl
                 )
+                await self._refresh_vacancy_matcher()
 
                 span.set_status(Status(StatusCode.OK))
                 return vacancy_id
@@ -64,6 +111,47 @@ class VacancyService(interface.IVacancyService):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    async def create_vacancy_bundle(
+            self,
+            name: str,
+            tags: list[str],
+            description: str,
+            red_flags: str,
+            skill_lvl: model.SkillLevel,
+            interview_weights: model.NewInterviewWeights,
+            resume_weights: model.NewResumeWeights,
+            questions: list[model.NewVacancyQuestion],
+    ) -> tuple[int, list[int]]:
+        with self.tracer.start_as_current_span(
+                "VacancyService.create_vacancy_bundle",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_name": name,
+                    "skill_level": skill_lvl.value,
+                    "questions_count": len(questions),
+                }
+        ) as span:
+            try:
+                vacancy_id, question_ids = await self.vacancy_repo.create_vacancy_bundle(
+                    name=name,
+                    tags=tags,
+                    description=description,
+                    red_flags=red_flags,
+                    skill_lvl=skill_lvl,
+                    interview_weights=interview_weights,
+                    resume_weights=resume_weights,
+                    questions=questions
+                )
+                await self._refresh_vacancy_matcher()
+
+                span.set_status(Status(StatusCode.OK))
+                return vacancy_id, question_ids
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
     async def delete_vacancy(self, vacancy_id: int) -> None:
         with self.tracer.start_as_current_span(
                 "VacancyService.delete_vacancy",
@@ -74,6 +162,7 @@ class VacancyService(interface.IVacancyService):
         ) as span:
             try:
                 await self.vacancy_repo.delete_vacancy(vacancy_id)
+                await self._refresh_vacancy_matcher()
                 span.set_status(Status(StatusCode.OK))
 
             except Exception as err:
@@ -106,6 +195,7 @@ class VacancyService(interface.IVacancyService):
                     red_flags=red_flags,
                     skill_lvl=skill_lvl
                 )
+                await self._refresh_vacancy_matcher()
 
                 span.set_status(Status(StatusCode.OK))
 
@@ -150,6 +240,30 @@ class VacancyService(interface.IVacancyService):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    async def add_questions(
+            self,
+            vacancy_id: int,
+            questions: list[model.NewVacancyQuestion],
+    ) -> list[int]:
+        with self.tracer.start_as_current_span(
+                "VacancyService.add_questions",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy_id,
+                    "questions_count": len(questions),
+                }
+        ) as span:
+            try:
+                question_ids = await self.vacancy_repo.add_questions(vacancy_id, questions)
+
+                span.set_status(Status(StatusCode.OK))
+                return question_ids
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
     async def edit_question(
             self,
             question_id: int,
@@ -373,6 +487,7 @@ class VacancyService(interface.IVacancyService):
             vacancy_id: int,
             questions_type: model.QuestionsType,
             count_questions: int,
+            sharded: bool = False,
     ) -> list[model.VacancyQuestion]:
         with self.tracer.start_as_current_span(
                 "VacancyService.generate_question",
@@ -381,15 +496,141 @@ class VacancyService(interface.IVacancyService):
                     "vacancy_id": vacancy_id,
                     "questions_type": questions_type.value,
                     "count_questions": count_questions,
+                    "sharded": sharded,
                 }
         ) as span:
             try:
                 vacancy = (await self.vacancy_repo.get_vacancy_by_id(vacancy_id))[0]
 
+                if sharded:
+                    questions = await self._generate_question_sharded(vacancy, questions_type, count_questions)
+                else:
+                    questions = await self._generate_question_shard(vacancy, questions_type, count_questions)
+
+                span.set_status(Status(StatusCode.OK))
+                return questions
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def _generate_question_sharded(
+            self,
+            vacancy: model.Vacancy,
+            questions_type: model.QuestionsType,
+            count_questions: int,
+    ) -> list[model.VacancyQuestion]:
+        shards = self._question_generation_shards(vacancy, questions_type, count_questions)
+
+        # Время ответа LLM растет с числом токенов, поэтому несколько коротких запросов параллельно быстрее одного длинного
+        results = await asyncio.gather(*[
+            self._generate_question_shard(
+                vacancy,
+                shard_type,
+                shard_count + QUESTION_GENERATION_SHARD_OVERFETCH,
+                shard_topics
+            )
+            for shard_type, shard_count, shard_topics in shards
+        ], return_exceptions=True)
+
+        shard_questions = []
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.warning("Шард генерации вопросов завершился с ошибкой", {
+                    "vacancy_id": vacancy.id,
+                    "error": str(result),
+                })
+                continue
+            shard_questions.append(result)
+
+        if not shard_questions:
+            raise Exception("All question generation shards failed")
+
+        # Берем вопросы из шардов по очереди, чтобы при обрезке сохранился баланс типов и тем
+        merged = []
+        for position in range(max(len(questions) for questions in shard_questions)):
+            for questions in shard_questions:
+                if position < len(questions):
+                    merged.append(questions[position])
+
+        unique_questions = []
+        unique_terms = []
+        for question in merged:
+            terms = set(tokenize(question.question))
+            if any(self._question_similarity(terms, kept) >= NEAR_DUPLICATE_QUESTION_SIMILARITY for kept in unique_terms):
+                continue
+            unique_questions.append(question)
+            unique_terms.append(terms)
+
+        self.logger.info("Сгенерировали вопросы шардами", {
+            "vacancy_id": vacancy.id,
+            "shards_count": len(shards),
+            "failed_shards": len(shards) - len(shard_questions),
+            "generated_count": len(merged),
+            "duplicates_count": len(merged) - len(unique_questions),
+        })
+
+        return unique_questions[:count_questions]
+
+    def _question_generation_shards(
+            self,
+            vacancy: model.Vacancy,
+            questions_type: model.QuestionsType,
+            count_questions: int,
+    ) -> list[tuple[model.QuestionsType, int, list[str]]]:
+        if questions_type == model.QuestionsType.SOFT_HARD:
+            soft_count = count_questions // 2
+            type_counts = [
+                (model.QuestionsType.HARD, count_questions - soft_count),
+                (model.QuestionsType.SOFT, soft_count),
+            ]
+        else:
+            type_counts = [(questions_type, count_questions)]
+
+        shards = []
+        for shard_type, type_count in type_counts:
+            if type_count <= 0:
+                continue
+
+            shards_count = min(math.ceil(type_count / QUESTION_GENERATION_SHARD_SIZE), MAX_QUESTION_GENERATION_SHARDS)
+            topics = SOFT_SKILL_TOPICS if shard_type == model.QuestionsType.SOFT else vacancy.tags
+
+            for shard_index in range(shards_count):
+                # Вопросы и темы раскладываем по шардам поровну, каждому шарду свой срез тем
+                shard_count = type_count // shards_count + (1 if shard_index < type_count % shards_count else 0)
+                shard_topics = topics[shard_index::shards_count]
+                shards.append((shard_type, shard_count, shard_topics))
+
+        return shards
+
+    def _question_similarity(self, terms: set[str], other_terms: set[str]) -> float:
+        if not terms or not other_terms:
+            return 0.0
+        return len(terms & other_terms) / len(terms | other_terms)
+
+    async def _generate_question_shard(
+            self,
+            vacancy: model.Vacancy,
+            questions_type: model.QuestionsType,
+            count_questions: int,
+            focus_topics: list[str] | None = None,
+    ) -> list[model.VacancyQuestion]:
+        with self.tracer.start_as_current_span(
+                "VacancyService._generate_question_shard",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy.id,
+                    "questions_type": questions_type.value,
+                    "count_questions": count_questions,
+                }
+        ) as span:
+            try:
                 question_generation_prompt = self.vacancy_prompt_generator.get_question_generation_prompt(
                     vacancy=vacancy,
                     count_questions=count_questions,
-                    questions_type=questions_type
+                    questions_type=questions_type,
+                    focus_topics=focus_topics
                 )
 
                 history = [
@@ -416,7 +657,7 @@ class VacancyService(interface.IVacancyService):
                 for q_data in questions_data["questions"]:
                     question = model.VacancyQuestion(
                         id=0,
-                        vacancy_id=vacancy_id,
+                        vacancy_id=vacancy.id,
                         question=q_data.get("question", "Нет вопроса"),
                         hint_for_evaluation=q_data.get("hint_for_evaluation", "Нет подсказки"),
                         weight=q_data.get("weight", 1),
@@ -434,7 +675,7 @@ class VacancyService(interface.IVacancyService):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
-    async def evaluate_resume(self, vacancy_id: int, candidate_resume_files: list[UploadFile]) -> list[model.Interview]:
+    async def evaluate_resume(self, vacancy_id: int, candidate_resume_files: list[UploadFile]) -> model.ResumeBatchResult:
         with self.tracer.start_as_current_span(
                 "VacancyService.evaluate_resume",
                 kind=SpanKind.INTERNAL,
@@ -448,106 +689,324 @@ class VacancyService(interface.IVacancyService):
                 vacancy = (await self.vacancy_repo.get_vacancy_by_id(vacancy_id))[0]
                 resume_weights = (await self.vacancy_repo.get_resume_weights(vacancy_id))[0]
 
-                system_prompt = self.vacancy_prompt_generator.get_resume_evaluation_system_prompt(
+                system_prompt = self.vacancy_prompt_generator.get_profile_matching_system_prompt(
                     vacancy_description=vacancy.description,
                     vacancy_red_flags=vacancy.red_flags,
                     vacancy_name=vacancy.name,
                     vacancy_tags=vacancy.tags
                 )
 
-                # Этап 1: Параллельно читаем все файлы резюме
-                self.logger.info("Начинаем параллельное чтение файлов резюме", {
+                # Резюме обрабатываются окном из resume_eval_concurrency воркеров,
+                # файл читается в память только когда под него есть бюджет
+                self.logger.info("Начинаем потоковую обработку резюме", {
                     "vacancy_id": vacancy_id,
-                    "files_count": len(candidate_resume_files)
+                    "files_count": len(candidate_resume_files),
+                    "concurrency": self.resume_eval_concurrency,
+                    "memory_limit": self.resume_eval_memory_limit,
                 })
 
-                read_tasks = [
-                    self._read_resume_file(resume_file)
-                    for resume_file in candidate_resume_files
-                ]
-
-                # Получаем содержимое всех файлов параллельно
-                file_contents = await asyncio.gather(*read_tasks, return_exceptions=True)
-
-                # Подготавливаем данные для обработки (фильтруем ошибки чтения)
-                resumes_to_process = []
-                read_errors = []
-
-                for i, content in enumerate(file_contents):
-                    if isinstance(content, Exception):
-                        self.logger.error(f"Ошибка при чтении файла {candidate_resume_files[i].filename}", {
-                            "error": str(content),
-                            "filename": candidate_resume_files[i].filename
-                        })
-                        read_errors.append({
-                            "filename": candidate_resume_files[i].filename,
-                            "error": str(content)
-                        })
-                    else:
-                        resumes_to_process.append({
-                            "file": candidate_resume_files[i],
-                            "content": content
-                        })
-
-                self.logger.info("Файлы прочитаны", {
-                    "vacancy_id": vacancy_id,
-                    "successfully_read": len(resumes_to_process),
-                    "read_errors": len(read_errors)
-                })
+                queue: asyncio.Queue[tuple[int, UploadFile]] = asyncio.Queue()
+                for i, resume_file in enumerate(candidate_resume_files):
+                    queue.put_nowait((i, resume_file))
+
+                memory_budget = ResumeMemoryBudget(self.resume_eval_memory_limit)
+                prefilter_stats = model.ResumePrefilterStats(checked=0, passed=0, rejected=0, deferred=0)
+                results: list[model.ResumeScreening | model.ResumeDuplicate | DeferredResume | Exception | None] = [
+                    None] * len(candidate_resume_files)
+
+                async def worker(deferred_claims: dict[int, model.ResumeScreeningClaim]):
+                    while not queue.empty():
+                        idx, resume_file = queue.get_nowait()
+                        results[idx] = await self._evaluate_resume_file(
+                            resume_file=resume_file,
+                            vacancy=vacancy,
+                            system_prompt=system_prompt,
+                            resume_weights=resume_weights,
+                            memory_budget=memory_budget,
+                            prefilter_stats=prefilter_stats,
+                            claim=deferred_claims.get(idx)
+                        )
 
-                # Этап 2: Параллельно обрабатываем все резюме через LLM
-                self.logger.info("Начинаем параллельную обработку резюме через LLM", {
-                    "vacancy_id": vacancy_id,
-                    "resumes_count": len(resumes_to_process)
-                })
+                workers_count = min(self.resume_eval_concurrency, len(candidate_resume_files))
+                await asyncio.gather(*[worker({}) for _ in range(workers_count)])
 
-                process_tasks = [
-                    self._process_resume_with_llm(
-                        resume_data=resume_data,
-                        vacancy_id=vacancy_id,
-                        system_prompt=system_prompt,
-                        resume_weights=resume_weights
-                    )
-                    for resume_data in resumes_to_process
-                ]
+                # Резюме ниже порога префильтра в режиме deprioritize идут в LLM последними,
+                # начиная с самых близких к вакансии
+                deferred = sorted(
+                    [(i, result) for i, result in enumerate(results) if isinstance(result, DeferredResume)],
+                    key=lambda item: item[1].prefilter_score,
+                    reverse=True
+                )
+                if deferred:
+                    for i, _ in deferred:
+                        queue.put_nowait((i, candidate_resume_files[i]))
+                    deferred_claims = {i: result.claim for i, result in deferred}
 
-                # Выполняем все LLM запросы параллельно
-                results = await asyncio.gather(*process_tasks, return_exceptions=True)
+                    workers_count = min(self.resume_eval_concurrency, len(deferred))
+                    await asyncio.gather(*[worker(deferred_claims) for _ in range(workers_count)])
 
-                # Фильтруем успешные результаты и ошибки
+                # Фильтруем успешные результаты, дубликаты и ошибки
                 created_interviews = []
+                duplicates = []
                 process_errors = []
 
                 for i, result in enumerate(results):
                     if isinstance(result, Exception):
-                        self.logger.error(f"Ошибка при обработке резюме {resumes_to_process[i]['file'].filename}", {
-                            "error": str(result),
-                            "filename": resumes_to_process[i]['file'].filename
-                        })
                         process_errors.append({
-                            "filename": resumes_to_process[i]['file'].filename,
+                            "filename": candidate_resume_files[i].filename,
                             "error": str(result)
                         })
-                    elif result is not None:
-                        created_interviews.append(result)
+                    elif isinstance(result, model.ResumeDuplicate):
+                        duplicates.append(result)
+                    elif result is not None and result.passed:
+                        created_interviews.append(result.interview)
 
                 self.logger.info("Все резюме проверены", {
                     "vacancy_id": vacancy_id,
                     "total_resumes": len(candidate_resume_files),
-                    "successfully_read": len(resumes_to_process),
                     "created_interviews": len(created_interviews),
-                    "read_errors_count": len(read_errors),
-                    "process_errors_count": len(process_errors)
+                    "duplicates_count": len(duplicates),
+                    "process_errors_count": len(process_errors),
+                    "prefilter_pass_rate": prefilter_stats.pass_rate,
+                    "prefilter_llm_calls_saved": prefilter_stats.rejected,
+                    "peak_memory_in_use": memory_budget.peak
                 })
 
                 span.set_status(Status(StatusCode.OK))
-                return created_interviews
+                return model.ResumeBatchResult(
+                    interviews=created_interviews,
+                    duplicates=duplicates,
+                    process_errors=process_errors,
+                    prefilter=prefilter_stats
+                )
 
             except Exception as err:
                 span.record_exception(err)
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    async def _evaluate_resume_file(
+            self,
+            resume_file: UploadFile,
+            vacancy: model.Vacancy,
+            system_prompt: str,
+            resume_weights: model.ResumeWeights,
+            memory_budget: 'ResumeMemoryBudget',
+            prefilter_stats: model.ResumePrefilterStats,
+            claim: model.ResumeScreeningClaim | None = None
+    ) -> 'model.ResumeScreening | model.ResumeDuplicate | DeferredResume | Exception':
+        """Читает одно резюме в пределах бюджета памяти и прогоняет его через LLM.
+
+        Если передан claim, резюме уже захвачено и прошло префильтр в первом проходе.
+        """
+        apply_prefilter = claim is None
+        # Захват освобождаем здесь, только пока он не передан в _process_claimed_resume
+        release_on_error = claim is not None
+        try:
+            if claim is None:
+                # Хэш считаем потоково, дубликаты не занимают бюджет памяти
+                resume_hash = await self._resume_file_hash(resume_file)
+                claim = await self.resume_repo.claim_resume_hash(vacancy.id, resume_hash)
+                if claim is None:
+                    return await self._resume_duplicate(vacancy.id, resume_hash, resume_file.filename)
+                release_on_error = True
+
+            # Основную память занимают отрендеренные страницы, а не сам файл:
+            # маленький PDF на много плотных страниц раздувается в десятки раз
+            resume_size = self._resume_file_size(resume_file)
+            render_size = await asyncio.to_thread(self._resume_render_size, resume_file)
+
+            async with memory_budget.reserve(resume_size + render_size):
+                resume_content = await self._read_resume_file(resume_file)
+
+                prefilter_score = None
+                if apply_prefilter:
+                    prefilter_result = await self.resume_prefilter.check(resume_content, vacancy)
+                    prefilter_stats.checked += 1
+                    prefilter_score = prefilter_result.score
+
+                    if not prefilter_result.passed:
+                        if self.resume_prefilter.mode == model.ResumePrefilterMode.DEPRIORITIZE:
+                            prefilter_stats.deferred += 1
+                            return DeferredResume(claim, prefilter_result.score)
+
+                        prefilter_stats.rejected += 1
+                        return await self._reject_by_prefilter(
+                            vacancy.id,
+                            claim.resume_hash,
+                            resume_file.filename,
+                            prefilter_result
+                        )
+                    prefilter_stats.passed += 1
+
+                release_on_error = False
+                screening = await self._process_claimed_resume(
+                    claim=claim,
+                    resume_filename=resume_file.filename,
+                    resume_content=resume_content,
+                    vacancy_id=vacancy.id,
+                    system_prompt=system_prompt,
+                    resume_weights=resume_weights
+                )
+                screening.prefilter_score = prefilter_score
+                return screening
+        except Exception as err:
+            self.logger.error(f"Ошибка при обработке резюме {resume_file.filename}", {
+                "error": str(err),
+                "filename": resume_file.filename
+            })
+            if release_on_error:
+                await self._release_resume_hash(claim)
+            return err
+
+    async def _release_resume_hash(self, claim: model.ResumeScreeningClaim) -> None:
+        try:
+            await self.resume_repo.release_resume_hash(claim)
+        except Exception as err:
+            # Захват освободится сам по таймауту
+            self.logger.error("Не удалось освободить хэш резюме", {
+                "vacancy_id": claim.vacancy_id,
+                "resume_hash": claim.resume_hash,
+                "error": str(err),
+            })
+
+    async def _reject_by_prefilter(
+            self,
+            vacancy_id: int,
+            resume_hash: str,
+            resume_filename: str,
+            prefilter_result: model.ResumePrefilterResult
+    ) -> model.ResumeScreening:
+        self.logger.info("Резюме отсеяно префильтром без вызова LLM", {
+            "vacancy_id": vacancy_id,
+            "filename": resume_filename,
+            "prefilter_score": prefilter_result.score,
+            "min_score": self.resume_prefilter.min_score,
+        })
+        await self.resume_repo.complete_resume_screening(
+            vacancy_id=vacancy_id,
+            resume_hash=resume_hash,
+            passed=False,
+            interview_id=None
+        )
+        return self._skipped_screening(resume_filename, prefilter_score=prefilter_result.score)
+
+    def _skipped_screening(
+            self,
+            resume_filename: str,
+            duplicate_interview_id: int | None = None,
+            duplicate: bool = False,
+            prefilter_score: float | None = None
+    ) -> model.ResumeScreening:
+        """Результат для резюме, которое не дошло до LLM"""
+        return model.ResumeScreening(
+            resume_filename=resume_filename,
+            passed=False,
+            candidate_name="",
+            candidate_email="",
+            candidate_phone="",
+            candidate_telegram_login="",
+            accordance_xp_vacancy_score=0,
+            accordance_skill_vacancy_score=0,
+            message_to_candidate="",
+            message_to_hr="",
+            interview=None,
+            duplicate=duplicate,
+            duplicate_interview_id=duplicate_interview_id,
+            prefilter_score=prefilter_score
+        )
+
+    async def _resume_file_hash(self, resume_file: UploadFile) -> str:
+        resume_hash = hashlib.sha256()
+        while chunk := await resume_file.read(RESUME_HASH_CHUNK_SIZE):
+            resume_hash.update(chunk)
+        await resume_file.seek(0)
+        return resume_hash.hexdigest()
+
+    async def _resume_duplicate(self, vacancy_id: int, resume_hash: str, resume_filename: str) -> model.ResumeDuplicate:
+        entries = await self.resume_repo.get_resume_screening_entry(vacancy_id, resume_hash)
+        interview_id = entries[0].interview_id if entries else None
+
+        self.logger.info("Резюме уже оценивалось по вакансии, пропускаем", {
+            "vacancy_id": vacancy_id,
+            "resume_hash": resume_hash,
+            "filename": resume_filename,
+            "interview_id": interview_id,
+        })
+        return model.ResumeDuplicate(
+            resume_filename=resume_filename,
+            resume_hash=resume_hash,
+            interview_id=interview_id
+        )
+
+    async def _process_claimed_resume(
+            self,
+            claim: model.ResumeScreeningClaim,
+            resume_filename: str,
+            resume_content: bytes,
+            vacancy_id: int,
+            system_prompt: str,
+            resume_weights,
+            candidate_resume_fid: str | None = None
+    ) -> model.ResumeScreening:
+        """Оценивает резюме, хэш которого уже захвачен в индексе, и фиксирует итог.
+
+        Если оценка упала, освобождает захват сам, вызывающему освобождать его не нужно.
+        """
+        try:
+            screening = await self._process_resume_with_llm(
+                resume_hash=claim.resume_hash,
+                resume_filename=resume_filename,
+                resume_content=resume_content,
+                vacancy_id=vacancy_id,
+                system_prompt=system_prompt,
+                resume_weights=resume_weights,
+                candidate_resume_fid=candidate_resume_fid
+            )
+        except Exception as err:
+            # Освобождаем хэш, чтобы резюме можно было оценить повторно
+            await self._release_resume_hash(claim)
+            raise err
+
+        await self.resume_repo.complete_resume_screening(
+            vacancy_id=vacancy_id,
+            resume_hash=claim.resume_hash,
+            passed=screening.passed,
+            interview_id=screening.interview.id if screening.interview else None
+        )
+        return screening
+
+    def _resume_file_size(self, resume_file: UploadFile) -> int:
+        if resume_file.size is not None:
+            return resume_file.size
+
+        # UploadFile хранит содержимое в SpooledTemporaryFile, размер берем без чтения
+        resume_file.file.seek(0, os.SEEK_END)
+        size = resume_file.file.tell()
+        resume_file.file.seek(0)
+        return size
+
+    def _resume_render_size(self, resume_file: UploadFile) -> int:
+        # Число и размеры страниц берем из PDF без рендера и без чтения файла в память целиком
+        try:
+            reader = pypdf.PdfReader(resume_file.file)
+            pixels = 0
+            for page in reader.pages:
+                # pdftoppm рендерит по cropbox
+                width = float(page.cropbox.width) * common.RESUME_RENDER_DPI / PDF_POINTS_PER_INCH
+                height = float(page.cropbox.height) * common.RESUME_RENDER_DPI / PDF_POINTS_PER_INCH
+                pixels += math.ceil(width) * math.ceil(height)
+            return pixels * RESUME_RENDER_BYTES_PER_PIXEL
+        except Exception as err:
+            # Размер неизвестен - резервируем весь бюджет, ResumeMemoryBudget обрежет его до лимита
+            self.logger.warning(f"Не удалось прочитать страницы резюме {resume_file.filename}", {
+                "error": str(err),
+                "filename": resume_file.filename
+            })
+            return self.resume_eval_memory_limit
+        finally:
+            resume_file.file.seek(0)
+
     async def _read_resume_file(self, resume_file: UploadFile) -> bytes:
         try:
             content = await resume_file.read()
@@ -559,37 +1018,17 @@ class VacancyService(interface.IVacancyService):
 
     async def _process_resume_with_llm(
             self,
-            resume_data: dict,
+            resume_hash: str,
+            resume_filename: str,
+            resume_content: bytes,
             vacancy_id: int,
             system_prompt: str,
-            resume_weights
-    ) -> model.Interview | None:
+            resume_weights,
+            candidate_resume_fid: str | None = None
+    ) -> model.ResumeScreening:
         """Обрабатывает резюме через LLM и создает интервью при необходимости"""
         try:
-            resume_file = resume_data["file"]
-            resume_content = resume_data["content"]
-
-            history = [
-                model.InterviewMessage(
-                    id=0,
-                    interview_id=0,
-                    question_id=0,
-                    audio_name="0",
-                    audio_fid="",
-                    role="user",
-                    text="Оцени это резюме любой ценой",
-                    created_at=datetime.now()
-                )
-            ]
-
-            # Генерируем ответ от LLM
-            evaluation_data = await self.llm_client.generate_json(
-                history=history,
-                system_prompt=system_prompt,
-                llm_model="gpt-5",
-                temperature=1,
-                pdf_file=resume_content
-            )
+            evaluation_data = await self._match_candidate_profile(resume_hash, resume_content, system_prompt)
 
             accordance_xp_vacancy_score = evaluation_data.get("accordance_xp_vacancy_score", 0)
             accordance_skill_vacancy_score = evaluation_data.get("accordance_skill_vacancy_score", 0)
@@ -612,9 +1051,11 @@ class VacancyService(interface.IVacancyService):
                     "candidate_phone": candidate_phone,
                 })
 
-                resume_file_io = io.BytesIO(resume_content)
-                upload_result = await self.storage.upload(resume_file_io, resume_file.filename)
-                candidate_resume_fid = upload_result.fid
+                # Резюме из фоновой задачи уже лежит в хранилище
+                if candidate_resume_fid is None:
+                    resume_file_io = io.BytesIO(resume_content)
+                    upload_result = await self.storage.upload(resume_file_io, resume_filename)
+                    candidate_resume_fid = upload_result.fid
 
                 interview_id = await self.interview_repo.create_interview(
                     vacancy_id=vacancy_id,
@@ -623,7 +1064,7 @@ class VacancyService(interface.IVacancyService):
                     candidate_phone=candidate_phone,
                     candidate_telegram_login=candidate_telegram_login,
                     candidate_resume_fid=candidate_resume_fid,
-                    candidate_resume_filename=resume_file.filename,
+                    candidate_resume_filename=resume_filename,
                     accordance_xp_vacancy_score=accordance_xp_vacancy_score,
                     accordance_skill_vacancy_score=accordance_skill_vacancy_score
                 )
@@ -637,7 +1078,7 @@ class VacancyService(interface.IVacancyService):
                     candidate_phone=candidate_phone,
                     candidate_telegram_login=candidate_telegram_login,
                     candidate_resume_fid=candidate_resume_fid,
-                    candidate_resume_filename=resume_file.filename,
+                    candidate_resume_filename=resume_filename,
                     accordance_xp_vacancy_score=accordance_xp_vacancy_score,
                     accordance_skill_vacancy_score=accordance_skill_vacancy_score,
                     red_flag_score=0,
@@ -656,7 +1097,7 @@ class VacancyService(interface.IVacancyService):
                     created_at=datetime.now()
                 )
 
-                return interview
+                return self._resume_screening(resume_filename, evaluation_data, interview)
             else:
                 self.logger.info("Кандидат не прошел анализ резюме", {
                     "vacancy_id": vacancy_id,
@@ -666,11 +1107,269 @@ class VacancyService(interface.IVacancyService):
                     "candidate_name": candidate_name,
                     "candidate_phone": candidate_phone,
                 })
-                return None
+                return self._resume_screening(resume_filename, evaluation_data, None)
 
         except Exception as err:
             raise err
 
+    async def _match_candidate_profile(self, resume_hash: str, resume_content: bytes, system_prompt: str) -> dict:
+        """Сопоставляет профиль кандидата с вакансией текстовым запросом, без повторного чтения PDF"""
+        profile = await self._get_candidate_profile(resume_hash, resume_content)
+
+        history = [
+            model.InterviewMessage(
+                id=0,
+                interview_id=0,
+                question_id=0,
+                audio_name="0",
+                audio_fid="",
+                role="user",
+                text=f"Оцени кандидата по его профилю:\n{profile.to_prompt_text()}",
+                created_at=datetime.now()
+            )
+        ]
+
+        matching_data = await self.llm_client.generate_json(
+            history=history,
+            system_prompt=system_prompt,
+            llm_model=self.resume_matching_llm_model,
+            temperature=1
+        )
+
+        # Контакты берем из профиля, оценки - из сопоставления с вакансией
+        return {
+            **matching_data,
+            "candidate_name": profile.candidate_name,
+            "candidate_email": profile.candidate_email,
+            "candidate_phone": profile.candidate_phone,
+            "candidate_telegram_login": profile.candidate_telegram_login,
+        }
+
+    async def _get_candidate_profile(self, resume_hash: str, resume_content: bytes) -> model.CandidateProfile:
+        """Профиль извлекается из PDF vision-запросом один раз на содержимое резюме"""
+        profiles = await self.resume_repo.get_candidate_profile(resume_hash)
+        if profiles:
+            self.logger.info("Используем сохраненный профиль кандидата", {"resume_hash": resume_hash})
+            return profiles[0]
+
+        history = [
+            model.InterviewMessage(
+                id=0,
+                interview_id=0,
+                question_id=0,
+                audio_name="0",
+                audio_fid="",
+                role="user",
+                text="Извлеки профиль кандидата из этого резюме",
+                created_at=datetime.now()
+            )
+        ]
+
+        profile_data = await self.llm_client.generate_json(
+            history=history,
+            system_prompt=self.vacancy_prompt_generator.get_candidate_profile_extraction_system_prompt(),
+            llm_model="gpt-5",
+            temperature=1,
+            pdf_file=resume_content
+        )
+
+        try:
+            experience_years = float(profile_data.get("experience_years", 0) or 0)
+        except (TypeError, ValueError):
+            experience_years = 0.0
+
+        profile = model.CandidateProfile(
+            id=0,
+            resume_hash=resume_hash,
+            candidate_name=profile_data.get("candidate_name", "Unknown"),
+            candidate_email=profile_data.get("candidate_email", "unknown@example.com"),
+            candidate_phone=profile_data.get("candidate_phone", "Unknown"),
+            candidate_telegram_login=profile_data.get("candidate_telegram_login", "Unknown"),
+            skills=[str(skill) for skill in profile_data.get("skills", [])],
+            experience_years=experience_years,
+            summary=profile_data.get("summary", ""),
+            profile=profile_data,
+            created_at=datetime.now()
+        )
+        profile.id = await self.resume_repo.create_candidate_profile(
+            resume_hash=profile.resume_hash,
+            candidate_name=profile.candidate_name,
+            candidate_email=profile.candidate_email,
+            candidate_phone=profile.candidate_phone,
+            candidate_telegram_login=profile.candidate_telegram_login,
+            skills=profile.skills,
+            experience_years=profile.experience_years,
+            summary=profile.summary,
+            profile=profile.profile
+        )
+
+        self.logger.info("Извлекли профиль кандидата", {
+            "resume_hash": resume_hash,
+            "skills_count": len(profile.skills),
+            "experience_years": profile.experience_years,
+        })
+        return profile
+
+    def _resume_screening(
+            self,
+            resume_filename: str,
+            evaluation_data: dict,
+            interview: model.Interview | None
+    ) -> model.ResumeScreening:
+        return model.ResumeScreening(
+            resume_filename=resume_filename,
+            passed=interview is not None,
+            candidate_name=evaluation_data.get("candidate_name", "Unknown"),
+            candidate_email=evaluation_data.get("candidate_email", "unknown@example.com"),
+            candidate_phone=evaluation_data.get("candidate_phone", "Unknown"),
+            candidate_telegram_login=evaluation_data.get("candidate_telegram_login", "Unknown"),
+            accordance_xp_vacancy_score=evaluation_data.get("accordance_xp_vacancy_score", 0),
+            accordance_skill_vacancy_score=evaluation_data.get("accordance_skill_vacancy_score", 0),
+            message_to_candidate=evaluation_data.get("message_to_candidate", ""),
+            message_to_hr=evaluation_data.get("message_to_hr", ""),
+            interview=interview
+        )
+
+    async def match_vacancies(
+            self,
+            candidate_resume_file: UploadFile,
+            top_k: int,
+            exclude_vacancy_id: int | None = None
+    ) -> list[model.VacancyMatch]:
+        with self.tracer.start_as_current_span(
+                "VacancyService.match_vacancies",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "top_k": top_k,
+                }
+        ) as span:
+            try:
+                if self.vacancy_matcher.is_stale(VACANCY_MATCHER_TTL):
+                    await self._refresh_vacancy_matcher()
+
+                resume_content = await self._read_resume_file(candidate_resume_file)
+                resume_text = await asyncio.to_thread(extract_resume_text, resume_content, self.logger)
+
+                # Для сканов без текстового слоя берем уже извлеченный профиль, если он есть
+                if not resume_text.strip():
+                    resume_hash = hashlib.sha256(resume_content).hexdigest()
+                    profiles = await self.resume_repo.get_candidate_profile(resume_hash)
+                    if not profiles:
+                        raise Exception("Resume has no text layer and no extracted candidate profile")
+                    resume_text = f"{' '.join(profiles[0].skills)} {profiles[0].summary}"
+
+                matches = self.vacancy_matcher.rank(resume_text, top_k, exclude_vacancy_id)
+
+                span.set_status(Status(StatusCode.OK))
+                return matches
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def _refresh_vacancy_matcher(self) -> None:
+        try:
+            vacancies = await self.vacancy_repo.get_all_vacancy()
+            self.vacancy_matcher.build(vacancies)
+        except Exception as err:
+            # Изменение вакансии уже сохранено, матрица догонит по TTL
+            self.logger.error("Не удалось пересобрать матрицу вакансий", {"error": str(err)})
+
+    async def screen_resume(
+            self,
+            vacancy_id: int,
+            resume_filename: str,
+            resume_content: bytes,
+            candidate_resume_fid: str | None = None,
+            invite_candidate: bool = False
+    ) -> model.ResumeScreening:
+        with self.tracer.start_as_current_span(
+                "VacancyService.screen_resume",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "vacancy_id": vacancy_id,
+                    "resume_filename": resume_filename,
+                }
+        ) as span:
+            try:
+                vacancy = (await self.vacancy_repo.get_vacancy_by_id(vacancy_id))[0]
+                resume_weights = (await self.vacancy_repo.get_resume_weights(vacancy_id))[0]
+
+                system_prompt = self.vacancy_prompt_generator.get_profile_matching_system_prompt(
+                    vacancy_description=vacancy.description,
+                    vacancy_red_flags=vacancy.red_flags,
+                    vacancy_name=vacancy.name,
+                    vacancy_tags=vacancy.tags
+                )
+
+                resume_hash = hashlib.sha256(resume_content).hexdigest()
+                claim = await self.resume_repo.claim_resume_hash(vacancy_id, resume_hash)
+                if claim is None:
+                    duplicate = await self._resume_duplicate(vacancy_id, resume_hash, resume_filename)
+                    span.set_status(Status(StatusCode.OK))
+                    return self._skipped_screening(
+                        resume_filename,
+                        duplicate_interview_id=duplicate.interview_id,
+                        duplicate=True
+                    )
+
+                # Фоновые задачи не упорядочивают файлы, поэтому префильтр здесь только отсеивает
+                prefilter_score = None
+                if self.resume_prefilter.mode == model.ResumePrefilterMode.REJECT:
+                    try:
+                        prefilter_result = await self.resume_prefilter.check(resume_content, vacancy)
+                    except Exception as err:
+                        await self._release_resume_hash(claim)
+                        raise err
+
+                    prefilter_score = prefilter_result.score
+                    if not prefilter_result.passed:
+                        screening = await self._reject_by_prefilter(
+                            vacancy_id,
+                            resume_hash,
+                            resume_filename,
+                            prefilter_result
+                        )
+                        span.set_status(Status(StatusCode.OK))
+                        return screening
+
+                screening = await self._process_claimed_resume(
+                    claim=claim,
+                    resume_filename=resume_filename,
+                    resume_content=resume_content,
+                    vacancy_id=vacancy_id,
+                    system_prompt=system_prompt,
+                    resume_weights=resume_weights,
+                    candidate_resume_fid=candidate_resume_fid
+                )
+                screening.prefilter_score = prefilter_score
+
+                if invite_candidate and screening.passed and screening.interview:
+                    try:
+                        await self.__enqueue_interview_invitation_to_telegram(
+                            candidate_telegram_login=screening.candidate_telegram_login,
+                            candidate_phone=screening.candidate_phone,
+                            vacancy_name=vacancy.name,
+                            interview_id=screening.interview.id,
+                            vacancy_id=vacancy_id,
+                            candidate_name=screening.candidate_name
+                        )
+                    except Exception as err:
+                        # Интервью уже создано, итог оценки из-за приглашения не теряем
+                        self.logger.error("Не удалось поставить приглашение в очередь", {
+                            "interview_id": screening.interview.id,
+                            "error": str(err),
+                        })
+
+                span.set_status(Status(StatusCode.OK))
+                return screening
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
     async def respond(
             self,
             vacancy_id: int,
@@ -688,7 +1387,7 @@ class VacancyService(interface.IVacancyService):
             try:
                 vacancy = (await self.vacancy_repo.get_vacancy_by_id(vacancy_id))[0]
 
-                system_prompt = self.vacancy_prompt_generator.get_resume_evaluation_system_prompt(
+                system_prompt = self.vacancy_prompt_generator.get_profile_matching_system_prompt(
                     vacancy_description=vacancy.description,
                     vacancy_red_flags=vacancy.red_flags,
                     vacancy_name=vacancy.name,
@@ -696,27 +1395,9 @@ class VacancyService(interface.IVacancyService):
                 )
 
                 resume_content = await candidate_resume_file.read()
+                resume_hash = hashlib.sha256(resume_content).hexdigest()
 
-                history = [
-                    model.InterviewMessage(
-                        id=0,
-                        interview_id=0,
-                        question_id=0,
-                        audio_name="",
-                        audio_fid="",
-                        role="user",
-                        text="Оцени это резюме любой ценой",
-                        created_at=datetime.now()
-                    )
-                ]
-
-                evaluation_data = await self.llm_client.generate_json(
-                    history=history,
-                    system_prompt=system_prompt,
-                    llm_model="gpt-5",
-                    temperature=1,
-                    pdf_file=resume_content
-                )
+                evaluation_data = await self._match_candidate_profile(resume_hash, resume_content, system_prompt)
 
                 accordance_xp_vacancy_score = evaluation_data.get("accordance_xp_vacancy_score", 0)
                 accordance_skill_vacancy_score = evaluation_data.get("accordance_skill_vacancy_score", 0)
@@ -766,7 +1447,7 @@ class VacancyService(interface.IVacancyService):
                     #     vacancy_name=vacancy.name,
                     #     interview_id=interview_id
                     # )
-                    await self.__send_interview_invitation_to_telegram(
+                    await self.__enqueue_interview_invitation_to_telegram(
                         candidate_telegram_login=candidate_telegram_login,
                         candidate_phone=candidate_phone,
                         vacancy_name=vacancy.name,
@@ -813,6 +1494,36 @@ class VacancyService(interface.IVacancyService):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    async def get_vacancies_page(
+            self,
+            limit: int,
+            cursor: str | None = None
+    ) -> tuple[list[model.VacancySummary], str | None]:
+        with self.tracer.start_as_current_span(
+                "VacancyService.get_vacancies_page",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "limit": limit,
+                }
+        ) as span:
+            try:
+                page_cursor = model.PageCursor.decode(cursor) if cursor else None
+                vacancies = await self.vacancy_repo.get_vacancies_page(limit, page_cursor)
+
+                # Неполная страница - последняя, дальше идти некуда
+                next_cursor = None
+                if len(vacancies) == limit:
+                    last = vacancies[-1]
+                    next_cursor = model.PageCursor(created_at=last.created_at, id=last.id).encode()
+
+                span.set_status(Status(StatusCode.OK))
+                return vacancies, next_cursor
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
     async def get_all_question(self, vacancy_id: int) -> list[model.VacancyQuestion]:
         with self.tracer.start_as_current_span(
                 "VacancyService.get_all_question",
@@ -972,7 +1683,7 @@ class VacancyService(interface.IVacancyService):
         except Exception as err:
             return False
 
-    async def __send_interview_invitation_to_telegram(
+    async def __enqueue_interview_invitation_to_telegram(
             self,
             candidate_telegram_login: str,
             candidate_phone: str,
@@ -980,9 +1691,9 @@ class VacancyService(interface.IVacancyService):
             vacancy_id: int,
             interview_id: int,
             candidate_name: str
-    ) -> bool:
+    ) -> None:
         with self.tracer.start_as_current_span(
-                "VacancyService.send_telegram_notification",
+                "VacancyService.enqueue_telegram_notification",
                 kind=SpanKind.INTERNAL,
                 attributes={
                     "candidate_telegram_login": candidate_telegram_login,
@@ -1012,48 +1723,51 @@ class VacancyService(interface.IVacancyService):
 
 Удачи! 🍀"""
 
-                try:
-                    if candidate_telegram_login == "Unknown":
-                        raise Exception("")
-
-                    await self.telegram_client.send_message_to_telegram(
-                        tg_user_data=candidate_telegram_login,
-                        text=message_text
-                    )
-                    telegram_sent = True
-
-                except Exception as err:
-                    span.record_exception(err)
-                    span.set_status(Status(StatusCode.ERROR, str(err)))
-                    try:
-                        if candidate_phone == "Unknown":
-                            raise Exception("")
-                        await self.telegram_client.send_message_to_telegram(
-                            tg_user_data=candidate_phone,
-                            text=message_text
-                        )
-                        telegram_sent = True
-                    except Exception as err:
-                        span.record_exception(err)
-                        span.set_status(Status(StatusCode.ERROR, str(err)))
-                        telegram_sent = False
+                # Отправкой, паузами и повторами занимается диспетчер, отклик не ждет Telegram
+                await self.telegram_dispatcher.enqueue_message(
+                    interview_id=interview_id,
+                    candidate_telegram_login=candidate_telegram_login,
+                    candidate_phone=candidate_phone,
+                    text=message_text
+                )
 
-                if telegram_sent:
-                    self.logger.info("Telegram уведомление отправлено успешно", {
-                        "candidate_telegram_login": candidate_telegram_login,
-                        "candidate_phone": candidate_phone
-                    })
-                    span.set_status(Status(StatusCode.OK))
-                    return True
-                else:
-                    self.logger.warning("Telegram уведомление не отправлено", {
-                        "candidate_telegram_login": candidate_telegram_login,
-                        "candidate_phone": candidate_phone
-                    })
-                    span.set_status(Status(StatusCode.ERROR))
-                    return False
+                span.set_status(Status(StatusCode.OK))
 
             except Exception as err:
                 span.record_exception(err)
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
+
+
+class ResumeMemoryBudget:
+    """Ограничивает суммарный объем резюме, одновременно находящихся в памяти"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self.peak = 0
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def reserve(self, size: int):
+        # Файл больше всего лимита все равно обрабатываем, но в одиночку
+        size = min(size, self.limit)
+
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_use + size <= self.limit)
+            self.in_use += size
+            self.peak = max(self.peak, self.in_use)
+
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_use -= size
+                self._condition.notify_all()
+
+
+@dataclass
+class DeferredResume:
+    """Резюме ниже порога префильтра, отложенное до конца пачки (режим deprioritize)"""
+    claim: model.ResumeScreeningClaim
+    prefilter_score: float
@@ -1,6 +1,7 @@
 import uvicorn
 
 from infrastructure.pg.pg import PG
+from infrastructure.pg.native import NativePG
 from infrastructure.weedfs.weedfs import AsyncWeed
 from infrastructure.telemetry.telemetry import Telemetry, AlertManager
 
@@ -13,16 +14,29 @@ from internal.controller.http.middlerware.middleware import HttpMiddleware
 from internal.controller.http.handler.vacancy.handler import VacancyController
 from internal.controller.http.handler.interview.handler import InterviewController
 from internal.controller.http.handler.telegram.handler import TelegramHTTPController
+from internal.controller.http.handler.resume_job.handler import ResumeJobController
 
 from internal.service.vacancy.service import VacancyService
 from internal.service.interview.service import InterviewService
+from internal.service.resume_job.service import ResumeJobService
+from internal.service.telegram_dispatcher.service import TelegramDispatcher
+from internal.service.migration.service import MigrationService
 from internal.service.interview.prompt import InterviewPromptGenerator
+from internal.service.interview.search import InterviewSearchIndex
 from internal.service.vacancy.prompt import VacancyPromptGenerator
+from internal.service.vacancy.prefilter import ResumePrefilter
+from internal.service.vacancy.matcher import VacancyMatcher
 
 from internal.repo.vacancy.repo import VacancyRepo
 from internal.repo.interview.repo import InterviewRepo
+from internal.repo.resume.repo import ResumeRepo
+from internal.repo.resume_job.repo import ResumeJobRepo
+from internal.repo.telegram_outbox.repo import TelegramOutboxRepo
+from internal.repo.telegram_entity.repo import TelegramEntityRepo
+from internal.repo.migration.repo import MigrationRepo
 
 from internal.app.http.app import NewHTTP
+from internal import model
 
 from internal.config.config import Config
 
@@ -52,7 +66,46 @@ tel = Telemetry(
 )
 
 # Инициализация клиентов
-db = PG(tel, cfg.db_user, cfg.db_pass, cfg.db_host, cfg.db_port, cfg.db_name)
+if cfg.db_driver == "asyncpg":
+    db = NativePG(
+        tel,
+        cfg.db_user,
+        cfg.db_pass,
+        cfg.db_host,
+        cfg.db_port,
+        cfg.db_name,
+        pool_size=cfg.db_pool_size,
+        max_overflow=cfg.db_max_overflow,
+        statement_cache_size=cfg.db_statement_cache_size,
+        replica_host=cfg.db_replica_host,
+        replica_port=cfg.db_replica_port,
+        max_replica_lag=cfg.db_max_replica_lag,
+        pool_recycle=cfg.db_pool_recycle,
+        pool_timeout=cfg.db_pool_timeout,
+        slow_query_threshold=cfg.db_slow_query_threshold,
+        slow_query_log_interval=cfg.db_slow_query_log_interval,
+        explain_slow_queries=cfg.db_explain_slow_queries
+    )
+else:
+    db = PG(
+        tel,
+        cfg.db_user,
+        cfg.db_pass,
+        cfg.db_host,
+        cfg.db_port,
+        cfg.db_name,
+        replica_host=cfg.db_replica_host,
+        replica_port=cfg.db_replica_port,
+        max_replica_lag=cfg.db_max_replica_lag,
+        pool_size=cfg.db_pool_size,
+        max_overflow=cfg.db_max_overflow,
+        pool_recycle=cfg.db_pool_recycle,
+        pool_timeout=cfg.db_pool_timeout,
+        pool_pre_ping=cfg.db_pool_pre_ping,
+        slow_query_threshold=cfg.db_slow_query_threshold,
+        slow_query_log_interval=cfg.db_slow_query_log_interval,
+        explain_slow_queries=cfg.db_explain_slow_queries
+    )
 storage = AsyncWeed(cfg.weed_master_host, cfg.weed_master_port)
 llm_client = GPTClient(tel, cfg.openai_api_key)
 email_client = EmailClient(
@@ -61,44 +114,95 @@ email_client = EmailClient(
     smtp_port=cfg.smtp_port,
     smtp_user=cfg.smtp_user,
     smtp_password=cfg.smtp_password,
-    use_tls=cfg.smtp_use_tls
+    use_tls=cfg.smtp_use_tls,
+    pool_size=cfg.smtp_pool_size
 )
-telegram_client = LTelegramClient(tel, cfg.tg_api_id, cfg.tg_api_hash, cfg.tg_session_string)
 
 # Инициализация репозиториев
 vacancy_repo = VacancyRepo(tel, db)
 interview_repo = InterviewRepo(tel, db)
+resume_repo = ResumeRepo(tel, db)
+resume_job_repo = ResumeJobRepo(tel, db)
+telegram_outbox_repo = TelegramOutboxRepo(tel, db)
+telegram_entity_repo = TelegramEntityRepo(tel, db)
+migration_repo = MigrationRepo(tel, db)
+
+# Telegram клиент хранит кэш получателей в базе, поэтому создаем его после репозиториев
+telegram_client = LTelegramClient(
+    tel,
+    cfg.tg_api_id,
+    cfg.tg_api_hash,
+    cfg.tg_session_string,
+    telegram_entity_repo
+)
 
 # Инициализация сервисов
 interview_prompt_generator = InterviewPromptGenerator(tel)
 vacancy_prompt_generator = VacancyPromptGenerator(tel)
+resume_prefilter = ResumePrefilter(
+    tel,
+    cfg.resume_prefilter_min_score,
+    model.ResumePrefilterMode(cfg.resume_prefilter_mode),
+)
+vacancy_matcher = VacancyMatcher(tel)
+telegram_dispatcher = TelegramDispatcher(
+    tel,
+    telegram_outbox_repo,
+    telegram_client,
+    cfg.tg_send_interval,
+    cfg.tg_outbox_batch_size,
+    cfg.tg_outbox_max_attempts,
+)
 vacancy_service = VacancyService(
     tel,
     vacancy_repo,
     interview_repo,
+    resume_repo,
     storage,
     vacancy_prompt_generator,
+    resume_prefilter,
+    vacancy_matcher,
     llm_client,
     email_client,
-    telegram_client
+    telegram_dispatcher,
+    cfg.resume_eval_concurrency,
+    cfg.resume_eval_memory_limit_mb * 1024 * 1024,
+    cfg.resume_matching_llm_model,
 )
 
+interview_search_index = InterviewSearchIndex(tel)
 interview_service = InterviewService(
     tel,
+    db,
     vacancy_repo,
     interview_repo,
     interview_prompt_generator,
     llm_client,
-    storage
+    storage,
+    interview_search_index,
 )
 
+resume_job_service = ResumeJobService(
+    tel,
+    db,
+    resume_job_repo,
+    vacancy_repo,
+    resume_repo,
+    vacancy_service,
+    storage,
+    cfg.resume_eval_concurrency,
+)
+
+migration_service = MigrationService(tel, migration_repo, model.all_migrations)
+
 # Инициализация контроллеров
-vacancy_controller = VacancyController(tel, vacancy_service)
+vacancy_controller = VacancyController(tel, vacancy_service, cfg.resume_eval_max_files)
 interview_controller = InterviewController(tel, interview_service)
-telegram_controller = TelegramHTTPController(tel, telegram_client)
+telegram_controller = TelegramHTTPController(tel, telegram_client, telegram_dispatcher)
+resume_job_controller = ResumeJobController(tel, resume_job_service, cfg.resume_job_max_files)
 
 # Инициализация middleware
-http_middleware = HttpMiddleware(tel, cfg.prefix)
+http_middleware = HttpMiddleware(tel, db, cfg.prefix)
 
 if __name__ == "__main__":
     app = NewHTTP(
@@ -106,7 +210,12 @@ if __name__ == "__main__":
         vacancy_controller,
         interview_controller,
         telegram_controller,
+        resume_job_controller,
         telegram_client,
+        telegram_dispatcher,
+        email_client,
+        resume_job_service,
+        migration_service,
         http_middleware,
         cfg.prefix,
     )
@@ -1,4 +1,7 @@
+import asyncio
+import re
 import smtplib
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -7,7 +10,20 @@ from typing import Optional, List
 
 from opentelemetry.trace import Status, StatusCode, SpanKind
 
-from internal import interface
+from internal import interface, model, common
+
+# Соединение, простоявшее дольше, перед использованием проверяем NOOP: сервер мог закрыть его по таймауту
+SMTP_CONNECTION_NOOP_AFTER = 30.0
+# Многие SMTP серверы ограничивают число писем за одну сессию, переоткрываем соединение заранее
+SMTP_CONNECTION_MAX_MESSAGES = 100
+
+
+class SMTPConnection:
+    def __init__(self):
+        self.server: smtplib.SMTP | None = None
+        self.messages_sent = 0
+        self.last_used_at = 0.0
+
 
 class EmailClient(interface.IEmailClient):
     def __init__(
@@ -17,15 +33,49 @@ class EmailClient(interface.IEmailClient):
             smtp_port: int,
             smtp_user: str,
             smtp_password: str,
-            use_tls: bool = True
+            use_tls: bool = True,
+            pool_size: int = 4
     ):
         self.tracer = tel.tracer()
         self.logger = tel.logger()
+        self.meter = tel.meter()
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
         self.smtp_user = smtp_user
         self.smtp_password = smtp_password
         self.use_tls = use_tls
+        self.pool_size = pool_size
+
+        # Соединения открываются лениво: в пуле лежат слоты, а не готовые сессии
+        self._pool: asyncio.Queue[SMTPConnection] = asyncio.Queue()
+        for _ in range(pool_size):
+            self._pool.put_nowait(SMTPConnection())
+
+        self.ok_email_counter = self.meter.create_counter(
+            name=common.OK_EMAIL_TOTAL_METRIC,
+            description="Total count of sent emails",
+            unit="1"
+        )
+        self.error_email_counter = self.meter.create_counter(
+            name=common.ERROR_EMAIL_TOTAL_METRIC,
+            description="Total count of failed emails",
+            unit="1"
+        )
+        self.batch_duration = self.meter.create_histogram(
+            name=common.EMAIL_BATCH_DURATION_METRIC,
+            description="Email batch sending duration in seconds",
+            unit="s"
+        )
+        self.batch_throughput = self.meter.create_histogram(
+            name=common.EMAIL_BATCH_THROUGHPUT_METRIC,
+            description="Emails sent per second within a batch",
+            unit="1/s"
+        )
+        self.connections_opened_counter = self.meter.create_counter(
+            name=common.SMTP_CONNECTIONS_OPENED_TOTAL_METRIC,
+            description="Total count of opened SMTP sessions",
+            unit="1"
+        )
 
     async def send_email(
             self,
@@ -45,13 +95,14 @@ class EmailClient(interface.IEmailClient):
                 }
         ) as span:
             try:
-                result = self.__send_email_sync(
-                    to_email,
-                    subject,
-                    body,
-                    is_html,
-                    attachments
-                )
+                results = await self.send_emails([model.EmailMessage(
+                    to_email=to_email,
+                    subject=subject,
+                    body=body,
+                    is_html=is_html,
+                    attachments=attachments
+                )])
+                result = results[0]
 
                 if result:
                     span.set_status(Status(StatusCode.OK))
@@ -65,43 +116,228 @@ class EmailClient(interface.IEmailClient):
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
-    def __send_email_sync(
-            self,
-            to_email: str,
-            subject: str,
-            body: str,
-            is_html: bool,
-            attachments: Optional[List[tuple]]
-    ) -> bool:
+    async def send_emails(self, emails: list[model.EmailMessage]) -> list[bool]:
+        with self.tracer.start_as_current_span(
+                "EmailClient.send_emails",
+                kind=SpanKind.CLIENT,
+                attributes={
+                    "emails_count": len(emails),
+                }
+        ) as span:
+            try:
+                if not emails:
+                    span.set_status(Status(StatusCode.OK))
+                    return []
+
+                started_at = time.monotonic()
+
+                # Делим пачку между соединениями пула, каждая часть уходит по своей сессии в отдельном потоке
+                chunks_count = min(self.pool_size, len(emails))
+                chunks = [list(range(i, len(emails), chunks_count)) for i in range(chunks_count)]
+                chunk_results = await asyncio.gather(*[
+                    self._send_chunk([emails[i] for i in chunk])
+                    for chunk in chunks
+                ])
+
+                results = [False] * len(emails)
+                for chunk, chunk_result in zip(chunks, chunk_results):
+                    for i, result in zip(chunk, chunk_result):
+                        results[i] = result
+
+                sent_count = sum(results)
+                duration = time.monotonic() - started_at
+                self.ok_email_counter.add(sent_count)
+                self.error_email_counter.add(len(emails) - sent_count)
+                self.batch_duration.record(duration)
+                if duration > 0:
+                    self.batch_throughput.record(sent_count / duration)
+
+                span.set_attribute("sent_count", sent_count)
+                if sent_count == len(emails):
+                    span.set_status(Status(StatusCode.OK))
+                else:
+                    span.set_status(Status(StatusCode.ERROR, f"Failed to send {len(emails) - sent_count} emails"))
+
+                return results
+
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
+
+    async def close(self) -> None:
+        connections = []
+        while not self._pool.empty():
+            connections.append(self._pool.get_nowait())
+
+        for connection in connections:
+            await asyncio.to_thread(self.__close_connection_sync, connection, True)
+            self._pool.put_nowait(connection)
+
+    async def _send_chunk(self, emails: list[model.EmailMessage]) -> list[bool]:
+        connection = await self._pool.get()
         try:
-            message = MIMEMultipart()
-            message["From"] = self.smtp_user
-            message["To"] = to_email
-            message["Subject"] = subject
+            # smtplib блокирующий, поэтому вся работа с сессией идет вне event loop
+            return await asyncio.to_thread(self.__send_chunk_sync, connection, emails)
+        finally:
+            self._pool.put_nowait(connection)
 
-            if is_html:
-                message.attach(MIMEText(body, "html"))
+    def __send_chunk_sync(self, connection: SMTPConnection, emails: list[model.EmailMessage]) -> list[bool]:
+        results = []
+        for email in emails:
+            results.append(self.__send_email_sync(connection, email))
+        return results
+
+    def __send_email_sync(self, connection: SMTPConnection, email: model.EmailMessage) -> bool:
+        try:
+            message = self.__build_message(email)
+        except Exception as err:
+            self.logger.error("Не удалось собрать письмо", {
+                "to_email": email.to_email,
+                "error": str(err),
+            })
+            return False
+
+        # Переиспользуемое соединение могло умереть между проверкой и отправкой, тогда пробуем еще раз по новому
+        for attempt in range(2):
+            reused = connection.server is not None
+            try:
+                self.__ensure_connection_sync(connection)
+                self.__send_message_sync(connection.server, message, email.to_email)
+
+                connection.messages_sent += 1
+                connection.last_used_at = time.monotonic()
+                return True
+
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as err:
+                # Сервер отверг именно это письмо, сессия при этом жива
+                self.logger.warning("SMTP сервер отклонил письмо", {
+                    "to_email": email.to_email,
+                    "error": str(err),
+                })
+                self.__reset_connection_sync(connection)
+                return False
+
+            except Exception as err:
+                self.__close_connection_sync(connection, False)
+                if attempt == 0 and reused:
+                    continue
+
+                self.logger.error("Ошибка отправки письма", {
+                    "to_email": email.to_email,
+                    "error": str(err),
+                })
+                return False
+
+        return False
+
+    def __send_message_sync(self, server: smtplib.SMTP, message: MIMEMultipart, to_email: str) -> None:
+        if not server.has_extn("pipelining"):
+            server.send_message(message, self.smtp_user, [to_email])
+            return
+
+        # RFC 2920: MAIL FROM, RCPT TO и DATA уходят одним пакетом, ответы читаем следом.
+        # Экономим два round-trip на каждое письмо по сравнению с send_message
+        server.send(f"MAIL FROM:<{self.smtp_user}>\r\nRCPT TO:<{to_email}>\r\nDATA\r\n")
+        mail_code, mail_reply = server.getreply()
+        rcpt_code, rcpt_reply = server.getreply()
+        data_code, data_reply = server.getreply()
+
+        accepted = mail_code == 250 and rcpt_code in (250, 251)
+        if data_code == 354 and not accepted:
+            # Пустое письмо закрываем точкой, чтобы сессия вернулась в исходное состояние
+            server.send(b".\r\n")
+            server.getreply()
+
+        if mail_code != 250:
+            raise smtplib.SMTPSenderRefused(mail_code, mail_reply, self.smtp_user)
+        if rcpt_code not in (250, 251):
+            raise smtplib.SMTPRecipientsRefused({to_email: (rcpt_code, rcpt_reply)})
+        if data_code != 354:
+            raise smtplib.SMTPDataError(data_code, data_reply)
+
+        data = message.as_bytes(policy=message.policy.clone(linesep="\r\n"))
+        data = re.sub(rb"(?m)^\.", b"..", data)
+        if not data.endswith(b"\r\n"):
+            data += b"\r\n"
+        server.send(data + b".\r\n")
+
+        code, reply = server.getreply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, reply)
+
+    def __ensure_connection_sync(self, connection: SMTPConnection) -> None:
+        if connection.server is not None and connection.messages_sent >= SMTP_CONNECTION_MAX_MESSAGES:
+            self.__close_connection_sync(connection, True)
+
+        if connection.server is not None and time.monotonic() - connection.last_used_at > SMTP_CONNECTION_NOOP_AFTER:
+            try:
+                code, _ = connection.server.noop()
+                if code != 250:
+                    raise smtplib.SMTPServerDisconnected(f"NOOP returned {code}")
+            except Exception:
+                self.__close_connection_sync(connection, False)
+
+        if connection.server is not None:
+            return
+
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port)
+        try:
+            server.ehlo()
+            if self.use_tls:
+                server.starttls()
+                server.ehlo()
+            server.login(self.smtp_user, self.smtp_password)
+        except Exception as err:
+            server.close()
+            raise err
+
+        self.connections_opened_counter.add(1)
+        connection.server = server
+        connection.messages_sent = 0
+        connection.last_used_at = time.monotonic()
+
+    def __reset_connection_sync(self, connection: SMTPConnection) -> None:
+        try:
+            connection.server.rset()
+        except Exception:
+            self.__close_connection_sync(connection, False)
+
+    def __close_connection_sync(self, connection: SMTPConnection, graceful: bool) -> None:
+        if connection.server is None:
+            return
+
+        try:
+            if graceful:
+                connection.server.quit()
             else:
-                message.attach(MIMEText(body, "plain"))
-
-            if attachments:
-                for filename, content in attachments:
-                    part = MIMEBase('application', 'octet-stream')
-                    part.set_payload(content)
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename= {filename}'
-                    )
-                    message.attach(part)
-
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(message)
-
-            return True
-
-        except Exception as e:
-            return False
\ No newline at end of file
+                connection.server.close()
+        except Exception:
+            connection.server.close()
+
+        connection.server = None
+        connection.messages_sent = 0
+
+    def __build_message(self, email: model.EmailMessage) -> MIMEMultipart:
+        message = MIMEMultipart()
+        message["From"] = self.smtp_user
+        message["To"] = email.to_email
+        message["Subject"] = email.subject
+
+        if email.is_html:
+            message.attach(MIMEText(email.body, "html"))
+        else:
+            message.attach(MIMEText(email.body, "plain"))
+
+        if email.attachments:
+            for filename, content in email.attachments:
+                part = MIMEBase('application', 'octet-stream')
+                part.set_payload(content)
+                encoders.encode_base64(part)
+                part.add_header(
+                    'Content-Disposition',
+                    f'attachment; filename= {filename}'
+                )
+                message.attach(part)
+
+        return message
@@ -1,6 +1,8 @@
+import asyncio
 import base64
 import io
 import re
+import tempfile
 from datetime import datetime
 from time import struct_time
 
@@ -14,6 +16,7 @@ import json
 
 from internal import interface
 from internal import model
+from internal import common
 
 
 class GPTClient(interface.ILLMClient):
@@ -57,7 +60,7 @@ class GPTClient(interface.ILLMClient):
                 if pdf_file is not None:
                     if llm_model in ["gpt-5", "gpt-4o", "gpt-4o-mini"]:
                         # Подход 1: Конвертируем PDF в изображения (для vision моделей)
-                        images = self._pdf_to_images(pdf_file)
+                        images = await asyncio.to_thread(self._pdf_to_images, pdf_file)
 
                         content = [
                             {"type": "text", "text": history[-1]["content"]}
@@ -122,7 +125,7 @@ class GPTClient(interface.ILLMClient):
                 if pdf_file is not None:
                     if llm_model in ["gpt-5", "gpt-4o", "gpt-4o-mini"]:
                         # Подход 1: Конвертируем PDF в изображения (для vision моделей)
-                        images = self._pdf_to_images(pdf_file)
+                        images = await asyncio.to_thread(self._pdf_to_images, pdf_file)
 
                         content = [
                             {"type": "text", "text": history[-1]["content"]}
@@ -291,16 +294,21 @@ class GPTClient(interface.ILLMClient):
                 kind=SpanKind.CLIENT,
         ) as span:
             try:
-                images = convert_from_bytes(pdf_bytes, dpi=200)
-
-                base64_images = []
-                for img in images:
-                    # Конвертируем PIL Image в base64
-                    buffer = io.BytesIO()
-                    img.save(buffer, format='PNG')
-                    img_data = buffer.getvalue()
-                    base64_image = base64.b64encode(img_data).decode('utf-8')
-                    base64_images.append(base64_image)
+                # Страницы рендерятся poppler'ом сразу в PNG во временную папку,
+                # поэтому в памяти не держим декодированные PIL-изображения всех страниц
+                with tempfile.TemporaryDirectory(prefix="resume_") as output_folder:
+                    image_paths = convert_from_bytes(
+                        pdf_bytes,
+                        dpi=common.RESUME_RENDER_DPI,
+                        fmt="png",
+                        output_folder=output_folder,
+                        paths_only=True
+                    )
+
+                    base64_images = []
+                    for image_path in image_paths:
+                        with open(image_path, "rb") as image_file:
+                            base64_images.append(base64.b64encode(image_file.read()).decode('utf-8'))
 
                 return base64_images
             except Exception as err:
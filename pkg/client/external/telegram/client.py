@@ -11,16 +11,24 @@ from opentelemetry.trace import Status, StatusCode, SpanKind
 from telethon import TelegramClient
 from telethon.sessions import StringSession
 from telethon.tl.functions.auth import ExportLoginTokenRequest
+from telethon.tl.functions.contacts import ImportContactsRequest
+from telethon.tl.types import InputPeerUser, InputPhoneContact
 from telethon.tl.types.auth import LoginTokenSuccess
 from telethon.errors import (
     AuthTokenExpiredError,
     AuthTokenAlreadyAcceptedError,
     AuthTokenInvalidError,
     AuthKeyUnregisteredError,
-    SessionPasswordNeededError
+    SessionPasswordNeededError,
+    PeerIdInvalidError,
+    UserIdInvalidError,
+    InputUserDeactivatedError
 )
 from internal import interface, model
 
+# Сколько телефонов отправляем в одном ImportContactsRequest
+IMPORT_CONTACTS_BATCH_SIZE = 100
+
 
 class LTelegramClient(interface.ITelegramClient):
     def __init__(
@@ -28,7 +36,8 @@ class LTelegramClient(interface.ITelegramClient):
             tel: interface.ITelemetry,
             api_id: int,
             api_hash: str,
-            session_string: str | None
+            session_string: str | None,
+            telegram_entity_repo: interface.ITelegramEntityRepo
     ):
         self.tracer = tel.tracer()
         self.logger = tel.logger()
@@ -36,12 +45,17 @@ class LTelegramClient(interface.ITelegramClient):
         self.api_id = api_id
         self.api_hash = api_hash
         self.session_string = session_string
+        self.telegram_entity_repo = telegram_entity_repo
 
         self.qr_session: model.QrSession = None
         self.userbot: TelegramClient = None
         self._auth_lock = asyncio.Lock()
         self.phone_formatter = RussianPhoneFormatter()
 
+        # username или телефон -> InputPeerUser, чтобы не резолвить получателя сетевым запросом на каждое сообщение
+        self._entity_cache: dict[str, InputPeerUser] = {}
+        self._entity_owner_id: int | None = None
+
     async def generate_qr_code(self) -> io.BytesIO:
         with self.tracer.start_as_current_span(
                 "LTelegramClient.generate_qr_code",
@@ -63,7 +77,8 @@ class LTelegramClient(interface.ITelegramClient):
                     device_model='Server',
                     system_version='Linux',
                     app_version='1.0',
-                    lang_code='ru'
+                    lang_code='ru',
+                    flood_sleep_threshold=0
                 )
                 await client.connect()
 
@@ -136,11 +151,13 @@ class LTelegramClient(interface.ITelegramClient):
 
                     # Проверяем что клиент авторизован
                     try:
-                        await self.userbot.get_me()
+                        me = await self.userbot.get_me()
                         self.logger.info("Клиент успешно авторизован")
                     except Exception as err:
                         raise err
 
+                    await self._load_entity_cache(me.id)
+
                     span.set_status(Status(StatusCode.OK))
                     return model.QRCodeStatus.CONFIRMED, self.session_string
                 else:
@@ -185,7 +202,9 @@ class LTelegramClient(interface.ITelegramClient):
                         device_model='Server',
                         system_version='Linux',
                         app_version='1.0',
-                        lang_code='ru'
+                        lang_code='ru',
+                        # FloodWait не пересиживаем под _auth_lock, а отдаем наверх диспетчеру
+                        flood_sleep_threshold=0
                     )
 
                     await client.connect()
@@ -198,6 +217,7 @@ class LTelegramClient(interface.ITelegramClient):
                             "username": me.username
                         })
                         self.userbot = client
+                        await self._load_entity_cache(me.id)
                     except AuthKeyUnregisteredError:
                         client.disconnect()
                         raise ValueError("Сессия недействительна, требуется повторная авторизация")
@@ -230,19 +250,140 @@ class LTelegramClient(interface.ITelegramClient):
                     if not self.userbot.is_connected():
                         await self.userbot.connect()
 
-                    if self.phone_formatter.is_valid_russian_number(tg_user_data):
-                        tg_user_data = self.phone_formatter.format_telethon(tg_user_data)
+                    key = self._entity_key(tg_user_data)
+                    peer = await self._resolve_input_peer(key)
+                    try:
+                        await self.userbot.send_message(peer, text)
+                    except (PeerIdInvalidError, UserIdInvalidError, InputUserDeactivatedError) as err:
+                        # Закэшированный получатель больше не валиден, в следующий раз резолвим заново
+                        await self._forget_entity(key)
+                        raise err
 
-                    await self.userbot.send_message(tg_user_data, text)
+                span.set_attribute("entity_cache_size", len(self._entity_cache))
+                span.set_status(Status(StatusCode.OK))
 
+            except Exception as err:
+                span.record_exception(err)
+                span.set_status(Status(StatusCode.ERROR, str(err)))
+                raise err
 
+    async def import_phone_contacts(self, phones: list[str]) -> int:
+        with self.tracer.start_as_current_span(
+                "LTelegramClient.import_phone_contacts",
+                kind=SpanKind.INTERNAL,
+                attributes={
+                    "phones_count": len(phones),
+                }
+        ) as span:
+            try:
+                async with self._auth_lock:
+                    if not self.userbot.is_connected():
+                        await self.userbot.connect()
+
+                    resolved_count = await self._import_phone_contacts(phones)
+
+                span.set_attribute("resolved_count", resolved_count)
                 span.set_status(Status(StatusCode.OK))
+                return resolved_count
 
             except Exception as err:
                 span.record_exception(err)
                 span.set_status(Status(StatusCode.ERROR, str(err)))
                 raise err
 
+    def _entity_key(self, tg_user_data: str) -> str:
+        if self.phone_formatter.is_valid_russian_number(tg_user_data):
+            return self.phone_formatter.format_telethon(tg_user_data)
+        return tg_user_data.strip().lstrip("@").lower()
+
+    async def _resolve_input_peer(self, key: str) -> InputPeerUser | str:
+        peer = self._entity_cache.get(key)
+        if peer is not None:
+            return peer
+
+        if key.startswith("+"):
+            # Telethon ищет телефон только среди уже добавленных контактов, поэтому импортируем его сами
+            await self._import_phone_contacts([key])
+            peer = self._entity_cache.get(key)
+            if peer is None:
+                raise ValueError(f"Номер {key} не зарегистрирован в Telegram")
+            return peer
+
+        input_entity = await self.userbot.get_input_entity(key)
+        if isinstance(input_entity, InputPeerUser):
+            self._entity_cache[key] = input_entity
+            await self._save_entities({key: input_entity})
+        return input_entity
+
+    async def _import_phone_contacts(self, phones: list[str]) -> int:
+        keys = []
+        for phone in phones:
+            if not phone or not self.phone_formatter.is_valid_russian_number(phone):
+                continue
+            key = self.phone_formatter.format_telethon(phone)
+            if key not in self._entity_cache and key not in keys:
+                keys.append(key)
+
+        resolved: dict[str, InputPeerUser] = {}
+        try:
+            for start in range(0, len(keys), IMPORT_CONTACTS_BATCH_SIZE):
+                batch = keys[start:start + IMPORT_CONTACTS_BATCH_SIZE]
+                result = await self.userbot(ImportContactsRequest([
+                    InputPhoneContact(client_id=client_id, phone=phone, first_name=phone, last_name="")
+                    for client_id, phone in enumerate(batch)
+                ]))
+
+                users = {user.id: user for user in result.users}
+                for imported in result.imported:
+                    user = users.get(imported.user_id)
+                    if user is None or user.access_hash is None:
+                        continue
+                    resolved[batch[imported.client_id]] = InputPeerUser(user.id, user.access_hash)
+        finally:
+            # Даже если упали на FloodWait посреди импорта, уже найденное не теряем
+            self._entity_cache.update(resolved)
+            await self._save_entities(resolved)
+
+        self.logger.info("Импортировали телефоны в контакты Telegram", {
+            "phones_count": len(keys),
+            "resolved_count": len(resolved),
+        })
+        return len(resolved)
+
+    async def _load_entity_cache(self, owner_id: int) -> None:
+        self._entity_cache = {}
+        self._entity_owner_id = owner_id
+        try:
+            entities = await self.telegram_entity_repo.get_entities_by_owner(owner_id)
+            self._entity_cache = {
+                entity.key: InputPeerUser(entity.user_id, entity.access_hash)
+                for entity in entities
+            }
+            self.logger.info("Загрузили кэш сущностей Telegram", {"entities_count": len(entities)})
+        except Exception as err:
+            self.logger.warning("Не удалось загрузить кэш сущностей Telegram", {"error": str(err)})
+
+    async def _save_entities(self, entities: dict[str, InputPeerUser]) -> None:
+        if not entities or self._entity_owner_id is None:
+            return
+        try:
+            await self.telegram_entity_repo.upsert_entities(self._entity_owner_id, {
+                key: (peer.user_id, peer.access_hash)
+                for key, peer in entities.items()
+            })
+        except Exception as err:
+            # Кэш в базе только экономит запросы к Telegram, отправку из-за него не роняем
+            self.logger.warning("Не удалось сохранить кэш сущностей Telegram", {"error": str(err)})
+
+    async def _forget_entity(self, key: str) -> None:
+        self._entity_cache.pop(key, None)
+        if self._entity_owner_id is None:
+            return
+        try:
+            await self.telegram_entity_repo.delete_entity(self._entity_owner_id, key)
+        except Exception as err:
+            self.logger.warning("Не удалось удалить сущность из кэша Telegram", {"error": str(err)})
+
     async def disconnect(self):
         """Метод для корректного отключения клиента"""
         try: